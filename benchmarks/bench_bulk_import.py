@@ -0,0 +1,153 @@
+"""
+マスタデータ一括インポートのベンチマーク
+生徒・講座を1件ずつ作成する従来の方法（create_student/create_course）と、
+一括インポート（bulk_import_students/bulk_import_courses）、
+CSVインポートと同じ差分の反映（diff_students/diff_courses + apply_diff）の時間を比較する。
+
+使い方（リポジトリ直下で実行）:
+    python -m benchmarks.bench_bulk_import
+    python -m benchmarks.bench_bulk_import --rows 50000 --per-row-sample 1000
+
+1件ずつの方法は全件だと時間がかかりすぎるため --per-row-sample 件だけ計測し、全件分を推定する。
+一括インポート・差分の反映中は別の接続から書き込みを繰り返し、他のPCの書き込みが待たされた
+最大時間（書き込みロックを保持していた時間の目安）も計測する。
+一時フォルダのデータベースを使うため、実際のデータには影響しない。
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def make_students(count: int, year: int = 2099):
+    """生徒データを作成（CSVから読み込んだ時と同じく年度は文字列）"""
+    return [
+        {
+            'year': str(year),
+            'class_number': f"F{i:06d}",
+            'student_number': f"{1000000 + i}",
+            'name': f"生徒{i}",
+            'name_kana': f"せいと{i}"
+        }
+        for i in range(count)
+    ]
+
+
+def make_courses(count: int, year: int = 2099):
+    """講座データを作成"""
+    return [
+        {
+            'course_name': f"講座{i}",
+            'teacher_name': f"教員{i % 300}",
+            'year': str(year),
+            'semester': "通年",
+            'subject_code': f"C{i:06d}",
+            'course_number': f"C{i:06d}"
+        }
+        for i in range(count)
+    ]
+
+
+class WriterProbe:
+    """別の接続から書き込みを繰り返し、1回の書き込みにかかった最大時間を記録する"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.max_wait_ms = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("CREATE TABLE IF NOT EXISTS bench_probe (value INTEGER)")
+        conn.commit()
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            conn.execute("INSERT INTO bench_probe (value) VALUES (1)")
+            conn.commit()
+            self.max_wait_ms = max(self.max_wait_ms, (time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+        conn.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="マスタデータ一括インポートのベンチマーク")
+    parser.add_argument("--rows", type=int, default=50000, help="インポートする件数")
+    parser.add_argument("--per-row-sample", type=int, default=1000,
+                        help="1件ずつの方法で計測する件数（全件分は推定）")
+    args = parser.parse_args()
+
+    # 設定の読み込み前にデータの保存先を一時フォルダにする
+    data_dir = tempfile.mkdtemp(prefix="bench_bulk_import_")
+    os.environ["CORRECTIONS_DATA_DIR"] = data_dir
+
+    from src.config import DB_PATH
+    from src.database.init_db import initialize_database
+    from src.database.db_manager import DatabaseManager
+    from src.controllers.log_controller import LogController
+    from src.controllers.master_controller import MasterController
+
+    initialize_database(DB_PATH)
+    db = DatabaseManager(DB_PATH)
+    controller = MasterController(db, LogController(db))
+
+    print(f"件数: {args.rows}  DB: {Path(DB_PATH)}")
+    print(f"{'対象':<8}{'方法':<16}{'件数':>8}{'時間(ms)':>12}{'件/秒':>12}")
+
+    for label, make, create, bulk_import, diff in (
+        ("生徒", make_students, controller.create_student, controller.bulk_import_students,
+         controller.diff_students),
+        ("講座", make_courses, controller.create_course, controller.bulk_import_courses,
+         controller.diff_courses),
+    ):
+        records = make(args.rows)
+
+        # 1件ずつ（従来の方法、見本の件数だけ。差分の対象にならないように別の年度で作成）
+        sample = make(args.per_row_sample, year=2098)
+        start = time.perf_counter()
+        for record in sample:
+            create(record)
+        per_row_ms = (time.perf_counter() - start) * 1000
+        estimated_ms = per_row_ms / max(len(sample), 1) * args.rows
+        print(f"{label:<8}{'1件ずつ':<16}{len(sample):>8}{per_row_ms:>12.0f}"
+              f"{len(sample) / per_row_ms * 1000:>12.0f}")
+        print(f"{label:<8}{'1件ずつ(推定)':<16}{args.rows:>8}{estimated_ms:>12.0f}")
+
+        # 一括インポート（差分を求めずに全件を書き込む）
+        with WriterProbe(DB_PATH) as probe:
+            start = time.perf_counter()
+            count, errors = bulk_import(records)
+            bulk_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<8}{'一括インポート':<16}{count:>8}{bulk_ms:>12.0f}{count / bulk_ms * 1000:>12.0f}"
+              f"  （推定比 {estimated_ms / bulk_ms:.0f}倍）")
+        print(f"  書き込み中に他の接続の書き込みが待たされた最大時間: {probe.max_wait_ms:.0f}ms")
+        if errors:
+            print(f"  検証エラー: {len(errors)}件")
+
+        # 差分を求めて反映（全件が追加になる初回の読み込み。一括インポートと重ならない年度で作成）
+        records = make(args.rows, year=2097)
+        with WriterProbe(DB_PATH) as probe:
+            start = time.perf_counter()
+            result = diff(records)
+            count = controller.apply_diff(result)
+            bulk_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<8}{'差分の反映':<16}{count:>8}{bulk_ms:>12.0f}{count / bulk_ms * 1000:>12.0f}"
+              f"  （推定比 {estimated_ms / bulk_ms:.0f}倍）")
+        print(f"  反映中に他の接続の書き込みが待たされた最大時間: {probe.max_wait_ms:.0f}ms")
+        if result['errors']:
+            print(f"  検証エラー: {len(result['errors'])}件")
+
+
+if __name__ == "__main__":
+    main()
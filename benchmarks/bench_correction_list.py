@@ -0,0 +1,109 @@
+"""
+訂正依頼一覧のベンチマーク
+1千・1万・10万件で再読み込み・検索・フィルタ変更の所要時間を計測する
+（検索は入力待ちの時間を除き、ワーカーの結果が一覧に反映されるまで）
+
+使い方（リポジトリ直下で実行、画面は表示しない）:
+    python -m benchmarks.bench_correction_list
+    python -m benchmarks.bench_correction_list --rows 1000 10000
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from src.ui.widgets.correction_list_widget import CorrectionListWidget
+
+
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめも"
+NAMES = "佐藤鈴木高橋田中伊藤渡辺山本中村小林加藤"
+
+
+def make_corrections(count: int, seed: int = 0) -> list:
+    """ベンチマーク用の訂正依頼を生成"""
+    rng = random.Random(seed)
+    corrections = []
+    for i in range(count):
+        is_attendance = rng.random() < 0.5
+        corrections.append({
+            'correction_id': i + 1,
+            'request_type': '出欠訂正' if is_attendance else '評価評定変更',
+            'student_name': "".join(rng.choice(NAMES) for _ in range(4)),
+            'name_kana': "".join(rng.choice(KANA) for _ in range(6)),
+            'course_name': f"講座{rng.randint(1, 500):03d}",
+            'target_date': f"2024-{rng.randint(4, 12):02d}-{rng.randint(1, 28):02d}" if is_attendance else None,
+            'semester': None if is_attendance else rng.choice(["前期", "後期", "通年"]),
+            'before_value': rng.choice(["欠席", "遅刻", None]),
+            'after_value': rng.choice(["出席", "早退", "4", "5"]),
+            'is_locked': rng.random() < 0.3,
+        })
+    return corrections
+
+
+def measure(app: QApplication, func) -> float:
+    """処理と再描画までの時間（ミリ秒）"""
+    start = time.perf_counter()
+    func()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def search(app: QApplication, widget: CorrectionListWidget, text: str):
+    """検索文字列を入力し、入力待ちを省いて結果が反映されるまで待つ"""
+    widget.search_edit.setText(text)
+    widget.start_search()
+    while widget.is_searching():
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def run(rows: int, app: QApplication) -> dict:
+    """1つの件数について計測"""
+    widget = CorrectionListWidget()
+    widget.resize(1200, 700)
+    widget.show()
+    app.processEvents()
+
+    corrections = make_corrections(rows)
+    results = {}
+
+    results['初回読み込み'] = measure(app, lambda: widget.load_corrections(corrections))
+    results['再読み込み'] = measure(app, lambda: widget.load_corrections(list(corrections)))
+    results['キー入力1回'] = measure(app, lambda: widget.search_edit.setText("佐"))
+    results['検索(1文字)'] = measure(app, lambda: search(app, widget, "佐"))
+    results['検索(絞り込み)'] = measure(app, lambda: search(app, widget, "佐藤"))
+    results['検索解除'] = measure(app, lambda: search(app, widget, ""))
+    results['種別フィルタ'] = measure(app, lambda: widget.type_combo.setCurrentText("出欠訂正"))
+    results['ロックフィルタ'] = measure(app, lambda: widget.lock_combo.setCurrentText("未ロック"))
+    results['フィルタ解除'] = measure(app, lambda: (
+        widget.type_combo.setCurrentText("全て"), widget.lock_combo.setCurrentText("全て")
+    ))
+
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="訂正依頼一覧のベンチマーク")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="計測する件数")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    all_results = {rows: run(rows, app) for rows in args.rows}
+
+    labels = list(next(iter(all_results.values())).keys())
+    print(f"{'操作':<12}" + "".join(f"{rows:>12,}件" for rows in args.rows))
+    for label in labels:
+        print(f"{label:<12}" + "".join(f"{all_results[rows][label]:>11.1f}ms" for rows in args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+並行エクスポートのベンチマーク
+操作ログを1つのトランザクションで書き出す方法（workers=1）と、IDの範囲ごとに
+複数のプロセスで読み込む方法（workers=2以上）の時間を比較する。
+
+使い方（リポジトリ直下で実行）:
+    python -m benchmarks.bench_parallel_export
+    python -m benchmarks.bench_parallel_export --rows 1000000 --workers 2,4,8
+
+並行エクスポートは行の並び順がIDの新しい順になるため、書き出した行を並べ替えて
+1つのプロセスの結果と同じ内容であることも確認する。
+プロセス数がCPUのコア数を超える場合は速くならない（コア数は最初に表示する）。
+一時フォルダのデータベースを使うため、実際のデータには影響しない。
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_xlsx import fill_logs
+
+
+def content_digest(file_path: str) -> str:
+    """ファイルの行を並べ替えたハッシュ値（並び順によらず内容が同じか比べる）"""
+    with open(file_path, 'rb') as f:
+        lines = sorted(f.read().splitlines())
+    return hashlib.sha256(b'\n'.join(lines)).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="並行エクスポートのベンチマーク")
+    parser.add_argument("--rows", type=int, default=500000, help="操作ログの件数")
+    parser.add_argument("--workers", default="2,4", help="プロセス数（カンマ区切りで複数指定可）")
+    args = parser.parse_args()
+
+    # 設定の読み込み前にデータの保存先を一時フォルダにする
+    data_dir = tempfile.mkdtemp(prefix="bench_parallel_export_")
+    os.environ["CORRECTIONS_DATA_DIR"] = data_dir
+
+    from src.config import DB_PATH
+    from src.database.init_db import initialize_database
+    from src.database.db_manager import DatabaseManager
+    from src.controllers import export_controller
+    from src.controllers.log_controller import LogController
+
+    initialize_database(DB_PATH)
+    db = DatabaseManager(DB_PATH)
+    controller = export_controller.ExportController(db, LogController(db))
+    # --rows が少ない場合も並行エクスポートを計測する
+    export_controller.EXPORT_PARALLEL_MIN_ROWS = 0
+
+    fill_logs(DB_PATH, args.rows)
+    print(f"件数: {args.rows}  CPUコア数: {os.cpu_count()}  DB: {Path(DB_PATH)}")
+    print(f"{'プロセス数':<10}{'時間(ms)':>12}{'件/秒':>12}{'速度比':>10}{'内容':>8}")
+
+    serial_ms = None
+    serial_digest = None
+    for workers in [1] + [int(value) for value in args.workers.split(',')]:
+        file_path = os.path.join(data_dir, f"logs_{workers}.csv")
+        start = time.perf_counter()
+        count = controller.export_file('logs', file_path, workers)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        digest = content_digest(file_path)
+        if serial_ms is None:
+            serial_ms, serial_digest = elapsed_ms, digest
+        same = "一致" if digest == serial_digest else "不一致"
+        print(f"{workers:<10}{elapsed_ms:>12.0f}{count / elapsed_ms * 1000:>12.0f}"
+              f"{serial_ms / elapsed_ms:>9.2f}倍{same:>8}")
+
+
+if __name__ == "__main__":
+    main()
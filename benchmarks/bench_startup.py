@@ -0,0 +1,111 @@
+"""
+起動時間のベンチマーク
+main.py と同じ順序で起動し、段階ごとの所要時間を予算（config.STARTUP_BUDGET_MS）と比較する。
+いずれかの段階の中央値が予算を超えた場合は終了コード1で終了する。
+
+使い方（リポジトリ直下で実行、画面は表示しない）:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 5 --rows 10000
+
+計測ごとに新しいプロセスで一時フォルダのデータベースを使う（モジュールの読み込み時間も含めるため）
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def measure_once():
+    """子プロセス側: main.py と同じ順序で起動して段階ごとの時間をJSONで出力"""
+    from src.utils.startup_profiler import startup_profiler
+
+    with startup_profiler.phase('import'):
+        from PySide6.QtWidgets import QApplication
+        from src.ui.main_window import MainWindow
+
+    with startup_profiler.phase('qapplication'):
+        app = QApplication([])
+
+    window = MainWindow()
+
+    deadline = time.perf_counter() + 60
+    while not startup_profiler.finished and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+
+    print("RESULT " + json.dumps(startup_profiler.durations()))
+    window.change_watcher.stop()
+    # 終了確認ダイアログを出さずに終了する
+    os._exit(0)
+
+
+def prepare_database(data_dir: str, rows: int):
+    """訂正依頼を rows 件登録したデータベースを作成"""
+    env = dict(os.environ, CORRECTIONS_DATA_DIR=data_dir)
+    code = (
+        "from src.config import DB_PATH\n"
+        "from src.database.init_db import initialize_database\n"
+        "db = initialize_database(DB_PATH)\n"
+        "with db.get_connection() as conn:\n"
+        "    conn.executemany(\"INSERT INTO correction_requests (request_type, student_id, course_id,"
+        " after_value, reason, requester_name, requester_pc) VALUES ('出欠訂正', '2024-F1221',"
+        " '2024-MATH-01', '出席', 'benchmark', 'bench', 'bench')\", [()] * %d)\n" % rows
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時間のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数")
+    parser.add_argument("--rows", type=int, default=1000, help="登録しておく訂正依頼の件数")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once()
+        return
+
+    from src.config import STARTUP_BUDGET_MS
+
+    results = []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as data_dir:
+            prepare_database(data_dir, args.rows)
+            env = dict(os.environ, CORRECTIONS_DATA_DIR=data_dir, QT_QPA_PLATFORM="offscreen")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--rows", str(args.rows)],
+                env=env, capture_output=True, text=True, encoding="utf-8", timeout=120
+            ).stdout
+        for line in output.splitlines():
+            if line.startswith("RESULT "):
+                results.append(json.loads(line[len("RESULT "):]))
+
+    if not results:
+        print("計測に失敗しました")
+        sys.exit(1)
+
+    failed = []
+    print(f"計測回数: {len(results)}（中央値）、訂正依頼 {args.rows:,}件")
+    print(f"{'段階':<18}{'時間':>10}{'予算':>10}")
+    for phase in results[0]:
+        values = sorted(r[phase] for r in results if phase in r)
+        median = values[len(values) // 2]
+        budget = STARTUP_BUDGET_MS.get(phase)
+        mark = ""
+        if budget is not None and median > budget:
+            failed.append(phase)
+            mark = "  ❌ 予算超過"
+        budget_text = "-" if budget is None else f"{budget}ms"
+        print(f"{phase:<18}{median:>8.1f}ms{budget_text:>10}{mark}")
+
+    if failed:
+        print(f"予算を超えた段階: {', '.join(failed)}")
+        sys.exit(1)
+    print("全ての段階が予算内です")
+
+
+if __name__ == "__main__":
+    main()
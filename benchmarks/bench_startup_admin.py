@@ -0,0 +1,113 @@
+"""
+システム部管理タブの遅延作成のベンチマーク
+起動時（MainWindowの作成）と、認証後に管理タブを作成する処理の時間・メモリを計測する。
+管理タブの作成にかかる分が、従来は全員の起動時にかかっていた分に相当する。
+
+使い方（リポジトリ直下で実行、画面は表示しない）:
+    python -m benchmarks.bench_startup_admin
+    python -m benchmarks.bench_startup_admin --repeat 5
+
+計測ごとに新しいプロセスで一時フォルダのデータベースを使う（モジュールの読み込み時間も含めるため）
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def rss_mb():
+    """プロセスの使用メモリ（MB、取得できない環境ではNone）"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        return None
+
+
+def measure_once():
+    """子プロセス側: 1回分を計測してJSONを出力"""
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    tracemalloc.start()
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    from src.ui.main_window import MainWindow
+    window = MainWindow()
+    app.processEvents()
+    startup_ms = (time.perf_counter() - start) * 1000
+    startup_py = tracemalloc.get_traced_memory()[0]
+    rss_startup = rss_mb()
+
+    start = time.perf_counter()
+    window.create_admin_tab()
+    app.processEvents()
+    admin_ms = (time.perf_counter() - start) * 1000
+    admin_py = tracemalloc.get_traced_memory()[0] - startup_py
+    rss_admin = rss_mb()
+
+    window.change_watcher.stop()
+    result = {
+        'startup_ms': startup_ms,
+        'admin_ms': admin_ms,
+        'admin_py_kb': admin_py / 1024,
+        'startup_rss_mb': None if rss_before is None else rss_startup - rss_before,
+        'admin_rss_mb': None if rss_startup is None else rss_admin - rss_startup,
+    }
+    print("RESULT " + json.dumps(result))
+    # 終了確認ダイアログを出さずに終了する
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="システム部管理タブの遅延作成のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once()
+        return
+
+    results = []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = dict(os.environ, CORRECTIONS_DATA_DIR=data_dir, QT_QPA_PLATFORM="offscreen")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_startup_admin", "--child"],
+                env=env, capture_output=True, text=True, encoding="utf-8", timeout=120
+            ).stdout
+        for line in output.splitlines():
+            if line.startswith("RESULT "):
+                results.append(json.loads(line[len("RESULT "):]))
+
+    if not results:
+        print("計測に失敗しました")
+        sys.exit(1)
+
+    def median(key):
+        values = sorted(r[key] for r in results if r[key] is not None)
+        return values[len(values) // 2] if values else None
+
+    def fmt(value, unit):
+        return "-" if value is None else f"{value:.1f}{unit}"
+
+    startup_ms, admin_ms = median('startup_ms'), median('admin_ms')
+    print(f"計測回数: {len(results)}（中央値）")
+    print(f"起動（管理タブなし）        {fmt(startup_ms, 'ms'):>10}  RSS +{fmt(median('startup_rss_mb'), 'MB')}")
+    print(f"管理タブの作成（認証後のみ）{fmt(admin_ms, 'ms'):>10}  RSS +{fmt(median('admin_rss_mb'), 'MB')}"
+          f"  Python +{fmt(median('admin_py_kb'), 'KB')}")
+    print(f"起動時に削減した割合        {admin_ms / (startup_ms + admin_ms) * 100:>9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+担当教員別エクスポートのベンチマーク
+担当教員が数百人の訂正依頼を、CSV・XLSXで担当教員ごとのファイルに書き出す時間を計測する。
+
+使い方（リポジトリ直下で実行）:
+    python -m benchmarks.bench_teacher_export
+    python -m benchmarks.bench_teacher_export --teachers 500 --rows 200000
+
+一時フォルダのデータベースを使うため、実際のデータには影響しない。
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+
+def fill_corrections(db_path: Path, teachers: int, count: int):
+    """担当教員が teachers 人の講座と、count 件の訂正依頼を作成（講座は教員ごとに3つ）"""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.executemany(
+        "INSERT INTO courses (course_id, course_name, teacher_name, year, semester, subject_code)"
+        " VALUES (?, ?, ?, 2099, '通年', ?)",
+        ((f"2099-B{i:05d}", f"講座{i}", f"教員{i % teachers:04d}", f"B{i:05d}") for i in range(teachers * 3))
+    )
+    conn.executemany(
+        "INSERT INTO correction_requests (request_type, student_id, course_id, target_date, semester,"
+        " periods, before_value, after_value, reason, requester_name, requester_pc)"
+        " VALUES ('出欠訂正', '2024-F1221', ?, '2025-04-01', '前期中間', '1,2', '欠席', '出席', ?, ?, 'PC-001')",
+        ((f"2099-B{i % (teachers * 3):05d}", f"理由{i}", f"依頼者{i % 50}") for i in range(count))
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="担当教員別エクスポートのベンチマーク")
+    parser.add_argument("--teachers", type=int, default=300, help="担当教員の人数")
+    parser.add_argument("--rows", type=int, default=100000, help="訂正依頼の件数")
+    args = parser.parse_args()
+
+    # 設定の読み込み前にデータの保存先を一時フォルダにする
+    data_dir = tempfile.mkdtemp(prefix="bench_teacher_export_")
+    os.environ["CORRECTIONS_DATA_DIR"] = data_dir
+
+    from src.config import DB_PATH
+    from src.database.init_db import initialize_database
+    from src.database.db_manager import DatabaseManager
+    from src.controllers.export_controller import ExportController
+    from src.controllers.log_controller import LogController
+
+    initialize_database(DB_PATH)
+    db = DatabaseManager(DB_PATH)
+    controller = ExportController(db, LogController(db))
+    fill_corrections(DB_PATH, args.teachers, args.rows)
+
+    print(f"担当教員: {args.teachers}人  訂正依頼: {args.rows}件  DB: {Path(DB_PATH)}")
+    print(f"{'形式':<6}{'ファイル数':>10}{'件数':>10}{'時間(ms)':>12}{'件/秒':>12}{'ファイル/秒':>14}")
+
+    for file_format in ('CSV', 'XLSX'):
+        out_dir = os.path.join(data_dir, file_format.lower())
+        os.makedirs(out_dir)
+        start = time.perf_counter()
+        result = controller.export_by_teacher(out_dir, xlsx=file_format == 'XLSX')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{file_format:<6}{result['files']:>10}{result['count']:>10}{elapsed_ms:>12.0f}"
+              f"{result['count'] / elapsed_ms * 1000:>12.0f}{result['files'] / elapsed_ms * 1000:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+CSV・XLSXのエクスポート/インポートのベンチマーク
+操作ログを CSV と XLSX に書き出し（ExportController.export_file）、書き出したファイルを
+インポートと同じ方法（iter_csv_rows / iter_xlsx_rows）で読み込んで、時間・速度・メモリの最大使用量を比較する。
+
+使い方（リポジトリ直下で実行）:
+    python -m benchmarks.bench_xlsx
+    python -m benchmarks.bench_xlsx --rows 20000,200000
+
+件数を変えてもメモリの最大使用量（tracemalloc で計測）がほぼ変わらないことで、
+ファイル全体をメモリに載せていないことを確認できる。
+一時フォルダのデータベースを使うため、実際のデータには影響しない。
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def fill_logs(db_path: Path, count: int):
+    """操作ログを count 件にする（先頭が0の講座コードなど、Excelで変換されやすい値を含める）"""
+    import sqlite3
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("DELETE FROM operation_logs")
+    conn.executemany(
+        "INSERT INTO operation_logs (username, pc_name, operation_type, target_table,"
+        " target_record_id, operation_detail, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"教員{i % 300}", f"PC-{i % 40:03d}", "更新", "correction_requests",
+             f"0142Z{i % 100:02d}", f"訂正依頼を更新: 2025-{i % 12 + 1:02d}-01 出席→欠席 ({i})",
+             f"2025-04-01 08:{i // 60 % 60:02d}:{i % 60:02d}")
+            for i in range(count)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(fn):
+    """
+    fn の実行時間(ms)・メモリの最大使用量(KB)・戻り値
+
+    tracemalloc は計測中の処理を大きく遅くするため、時間とメモリは別々に実行して計測する。
+    """
+    start = time.perf_counter()
+    result = fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    fn()
+    peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+    tracemalloc.stop()
+    return elapsed_ms, peak_kb, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV・XLSXのエクスポート/インポートのベンチマーク")
+    parser.add_argument("--rows", default="20000,200000", help="件数（カンマ区切りで複数指定可）")
+    args = parser.parse_args()
+
+    # 設定の読み込み前にデータの保存先を一時フォルダにする
+    data_dir = tempfile.mkdtemp(prefix="bench_xlsx_")
+    os.environ["CORRECTIONS_DATA_DIR"] = data_dir
+
+    from src.config import DB_PATH
+    from src.database.init_db import initialize_database
+    from src.database.db_manager import DatabaseManager
+    from src.controllers.export_controller import ExportController
+    from src.controllers.log_controller import LogController
+    from src.utils.csv_stream import iter_csv_rows
+    from src.utils.xlsx import iter_xlsx_rows
+
+    initialize_database(DB_PATH)
+    db = DatabaseManager(DB_PATH)
+    controller = ExportController(db, LogController(db))
+
+    print(f"DB: {Path(DB_PATH)}")
+    print(f"{'処理':<12}{'形式':<6}{'件数':>8}{'時間(ms)':>12}{'件/秒':>12}"
+          f"{'最大メモリ(KB)':>16}{'ファイル(KB)':>14}")
+
+    for count in (int(value) for value in args.rows.split(',')):
+        fill_logs(DB_PATH, count)
+        for file_format, reader in (('CSV', iter_csv_rows), ('XLSX', iter_xlsx_rows)):
+            file_path = os.path.join(data_dir, f"logs_{count}.{file_format.lower()}")
+
+            elapsed_ms, peak_kb, written = measure(lambda: controller.export_file('logs', file_path))
+            size_kb = os.path.getsize(file_path) // 1024
+            print(f"{'エクスポート':<12}{file_format:<6}{written:>8}{elapsed_ms:>12.0f}"
+                  f"{written / elapsed_ms * 1000:>12.0f}{peak_kb:>16}{size_kb:>14}")
+
+            elapsed_ms, peak_kb, read = measure(lambda: sum(1 for _ in reader(file_path)))
+            print(f"{'インポート':<12}{file_format:<6}{read:>8}{elapsed_ms:>12.0f}"
+                  f"{read / elapsed_ms * 1000:>12.0f}{peak_kb:>16}")
+            if read != written:
+                print(f"  件数が一致しません: 書き出し{written}件 読み込み{read}件")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,23 @@
 """
 訂正依頼システム - メインエントリーポイント
 """
+import multiprocessing
 import sys
 from pathlib import Path
 
 # srcディレクトリをパスに追加
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from src.utils.startup_profiler import startup_profiler
 
-from src.ui.main_window import MainWindow
-from src.config import APP_NAME
-from src.utils.logger import setup_logger
+# モジュールの読み込み時間も起動時間として計測する
+with startup_profiler.phase('import'):
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt
+    
+    from src.ui.main_window import MainWindow
+    from src.config import APP_NAME
+    from src.utils.logger import setup_logger
 
 # ロガーセットアップ
 logger = setup_logger('main', Path('data/app.log'))
@@ -22,8 +27,9 @@ def main():
     """メイン関数"""
     try:
         # アプリケーション作成
-        app = QApplication(sys.argv)
-        app.setApplicationName(APP_NAME)
+        with startup_profiler.phase('qapplication'):
+            app = QApplication(sys.argv)
+            app.setApplicationName(APP_NAME)
         
         # High DPI対応
         app.setAttribute(Qt.AA_EnableHighDpiScaling)
@@ -46,4 +52,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # exe化した場合にCSV検証用の子プロセスとして起動された時はここで処理を終える
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,425 @@
+"""
+コマンドライン版エントリーポイント
+画面（Qt）を使わずに、インポート・エクスポート・バックアップ・復元・メンテナンスを実行し、起動時間の記録を確認する。
+サーバーPCの夜間バッチなど、タスクスケジューラから実行する処理用。
+
+使い方（リポジトリ直下で実行）:
+    python -m src.cli export corrections data/corrections.csv
+    python -m src.cli export-by-teacher exports --xlsx
+    python -m src.cli import students students.xlsx --dry-run
+    python -m src.cli backup --keep 10
+    python -m src.cli --json backups
+    python -m src.cli startup-stats --pc PC-01
+
+結果は標準出力に表示する（--json の場合は1つのJSON）。ログは標準エラー出力に書く。
+終了コード:
+    0: 成功
+    1: 失敗（ファイル・データベースのエラーなど）
+    2: コマンドの指定が正しくない
+    3: インポートにエラーの行があったため反映しなかった（--allow-errors で反映する）
+    130: Ctrl+Cで中断した
+
+PySide6 は読み込まない。コントローラーもコマンドの実行時に読み込むため、--help などはすぐに終わる。
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_IMPORT_ERRORS = 3
+EXIT_INTERRUPTED = 130
+
+# エクスポートの種類（担当教員別は export-by-teacher で書き出す）
+EXPORT_KINDS = ['corrections', 'correction_list', 'students', 'courses', 'logs']
+IMPORT_KINDS = ['corrections', 'students', 'courses']
+# テキストで表示するインポートのエラーの行数（--json の場合は全件）
+IMPORT_ERRORS_SHOWN = 20
+
+
+class CommandError(Exception):
+    """コマンドを実行できない（メッセージを表示して終了コード1で終わる）"""
+
+
+def _open_database():
+    """画面の起動時と同じくデータベースを作成・更新して DatabaseManager を返す"""
+    from .config import DB_PATH
+    from .database.db_manager import DatabaseManager
+    from .database.init_db import initialize_database, upgrade_database
+
+    if not DB_PATH.exists():
+        initialize_database(DB_PATH)
+    else:
+        upgrade_database(DB_PATH)
+    return DatabaseManager(DB_PATH)
+
+
+def _controllers():
+    """(DatabaseManager, LogController)"""
+    from .controllers.log_controller import LogController
+
+    db = _open_database()
+    return db, LogController(db)
+
+
+def _workers(args) -> int:
+    """
+    import --workers の値
+
+    省略時は画面のインポートと同じく、IMPORT_PARALLEL_MIN_BYTES 以上のファイルだけ
+    CPUのコア数から決めた数のプロセスで検証する（小さいファイルはプロセスを起動しない）。
+    """
+    from .config import IMPORT_PARALLEL_MIN_BYTES
+    from .controllers.correction_import import default_workers
+
+    if args.workers:
+        return args.workers
+    return default_workers() if args.file.stat().st_size >= IMPORT_PARALLEL_MIN_BYTES else 1
+
+
+def _error_list(errors: list) -> list:
+    """インポートのエラーを [{'line': CSVの行番号, 'error': メッセージ}, ...] にする（1行目はタイトル行）"""
+    return [{'line': index + 2, 'error': error} for index, error in errors]
+
+
+def cmd_export(args) -> dict:
+    """データをCSV/XLSXに書き出す"""
+    from .controllers.export_controller import ExportController
+
+    db, log_controller = _controllers()
+    controller = ExportController(db, log_controller)
+    count = controller.export_file(args.kind, str(args.file), args.workers)
+    file_format = controller.file_format(str(args.file))
+    controller.log_export(args.kind, count, file_format)
+    return {
+        'count': count,
+        'file': str(args.file),
+        'format': file_format,
+        'message': f"{count}件のデータをエクスポートしました: {args.file}"
+    }
+
+
+def cmd_export_by_teacher(args) -> dict:
+    """訂正依頼を担当教員ごとのファイルに書き出す"""
+    from .controllers.export_controller import ExportController
+
+    if not args.dir.is_dir():
+        raise CommandError(f"フォルダが存在しません: {args.dir}")
+    db, log_controller = _controllers()
+    controller = ExportController(db, log_controller)
+    result = controller.export_by_teacher(str(args.dir), args.xlsx)
+    controller.log_export('corrections_by_teacher', result['count'], 'XLSX' if args.xlsx else 'CSV')
+    return {
+        'count': result['count'],
+        'files': result['files'],
+        'folder': str(result['folder']),
+        'message': (f"{result['count']}件のデータを{result['files']}人の担当教員のファイルに"
+                    f"エクスポートしました: {result['folder']}")
+    }
+
+
+def cmd_import(args) -> dict:
+    """
+    CSV/XLSXを読み込む
+
+    訂正依頼は全件を置き換え、生徒情報・講座情報は差分を反映する（画面のインポートと同じ）。
+    エラーの行がある場合は --allow-errors を指定した時だけ、エラーの行を除いて反映する。
+    """
+    from .utils.xlsx import iter_file_rows
+
+    if not args.file.is_file():
+        raise CommandError(f"ファイルが存在しません: {args.file}")
+    db, log_controller = _controllers()
+    rows = iter_file_rows(str(args.file))
+
+    if args.kind == 'corrections':
+        from .controllers.correction_controller import CorrectionController
+
+        controller = CorrectionController(db, log_controller)
+        prepared = controller.prepare_import(rows, _workers(args))
+        errors = prepared['errors']
+        result = {'count': prepared['count'], 'errors': _error_list(errors)}
+        if args.dry_run or (errors and not args.allow_errors):
+            controller.discard_import(prepared)
+            result['applied'] = False
+        else:
+            result['count'] = controller.apply_import(prepared)
+            result['applied'] = True
+        noun = f"{result['count']}件の訂正依頼"
+    else:
+        from .controllers.master_controller import (
+            MasterController, student_from_csv_row, course_from_csv_row
+        )
+
+        controller = MasterController(db, log_controller)
+        if args.kind == 'students':
+            diff = controller.diff_students(student_from_csv_row(row) for row in rows)
+        else:
+            diff = controller.diff_courses(course_from_csv_row(row) for row in rows)
+        errors = diff['errors']
+        result = {
+            'inserts': len(diff['inserts']),
+            'updates': len(diff['updates']),
+            'deletes': len(diff['deletes']),
+            'kept': len(diff['kept']),
+            'unchanged': diff['unchanged'],
+            'years': diff['years'],
+            'errors': _error_list(errors)
+        }
+        if args.dry_run or (errors and not args.allow_errors):
+            result['count'] = 0
+            result['applied'] = False
+        else:
+            result['count'] = controller.apply_diff(diff)
+            result['applied'] = True
+        noun = (f"{'・'.join(str(year) for year in diff['years'])}年度 "
+                f"追加{result['inserts']}件 変更{result['updates']}件 削除{result['deletes']}件"
+                f"（変更なし{result['unchanged']}件）")
+        if diff['kept']:
+            noun += f"\n訂正依頼が参照しているため削除しない行: {len(diff['kept'])}件"
+
+    if result['applied']:
+        message = f"インポートしました: {noun}"
+    elif args.dry_run:
+        message = f"確認のみ（反映していません）: {noun}"
+    else:
+        message = (f"{len(errors)}行のエラーがあるため反映しませんでした: {noun}\n"
+                   "エラーの行を除いて反映する場合は --allow-errors を指定してください")
+        result['exit_code'] = EXIT_IMPORT_ERRORS
+    if errors:
+        lines = [f"  {e['line']}行目: {e['error']}" for e in result['errors'][:IMPORT_ERRORS_SHOWN]]
+        if len(errors) > IMPORT_ERRORS_SHOWN:
+            lines.append(f"  …ほか{len(errors) - IMPORT_ERRORS_SHOWN}件")
+        message += f"\nエラーの行（{len(errors)}件）:\n" + "\n".join(lines)
+    result['message'] = message
+    return result
+
+
+def cmd_backup(args) -> dict:
+    """バックアップを作成し、古いバックアップを削除"""
+    from .utils.backup_manager import BackupManager
+
+    manager = BackupManager()
+    backup_path = manager.create_backup()
+    if not backup_path:
+        raise CommandError("バックアップの作成に失敗しました（詳細はログを確認してください）")
+    if args.keep:
+        manager.cleanup_old_backups(keep_count=args.keep)
+    return {
+        'file': str(backup_path),
+        'size': backup_path.stat().st_size,
+        'message': f"バックアップを作成しました: {backup_path}"
+    }
+
+
+def cmd_backups(args) -> dict:
+    """バックアップの一覧（新しい順）"""
+    from datetime import datetime
+    from .utils.backup_manager import BackupManager
+
+    backups = []
+    for path in BackupManager().get_backup_list():
+        stat = path.stat()
+        backups.append({
+            'name': path.name,
+            'file': str(path),
+            'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            'size': stat.st_size
+        })
+    lines = [f"{b['name']}  {b['modified']}  {b['size'] / (1024 * 1024):.2f} MB" for b in backups]
+    return {
+        'backups': backups,
+        'message': "\n".join(lines + [f"バックアップ数: {len(backups)}"])
+    }
+
+
+def cmd_restore(args) -> dict:
+    """
+    バックアップから復元（現在のデータベースは緊急バックアップとして保存される）
+
+    backup にはファイルのパスか、バックアップフォルダのファイル名（backups の name）を指定する。
+    """
+    from .config import BACKUP_DIR
+    from .utils.backup_manager import BackupManager
+
+    backup_path = args.backup
+    if not backup_path.exists() and (BACKUP_DIR / backup_path.name).exists():
+        backup_path = BACKUP_DIR / backup_path.name
+    if not backup_path.exists():
+        raise CommandError(f"バックアップが存在しません: {args.backup}")
+
+    if not BackupManager().restore_backup(backup_path):
+        raise CommandError("バックアップの読み込みに失敗しました（詳細はログを確認してください）")
+    _, log_controller = _controllers()
+    log_controller.log_operation(
+        operation_type='復元',
+        target_table='database',
+        detail=f'バックアップから復元: {backup_path.name}'
+    )
+    return {
+        'file': str(backup_path),
+        'message': f"バックアップを読み込みました: {backup_path.name}"
+    }
+
+
+def cmd_maintenance(args) -> dict:
+    """
+    データベースの整合性を確認し、統計情報を更新してWALをデータベースに書き戻す
+
+    --vacuum の場合は削除済みの領域も詰める（他のPCが使っていない時に実行する）。
+    整合性の確認でエラーがあった場合は、それ以外の処理は行わない。
+    """
+    db, log_controller = _controllers()
+    problems = [row[0] for row in db.execute_query("PRAGMA integrity_check")]
+    if problems != ['ok']:
+        return {
+            'integrity': problems,
+            'exit_code': EXIT_ERROR,
+            'message': "データベースの整合性にエラーがあります:\n" + "\n".join(f"  {p}" for p in problems)
+        }
+
+    size_before = Path(db.db_path).stat().st_size
+    with db.get_connection() as conn:
+        conn.execute("PRAGMA optimize")
+        if args.vacuum:
+            conn.execute("VACUUM")
+        busy = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+    size_after = Path(db.db_path).stat().st_size
+
+    detail = "データベースのメンテナンス（整合性確認・統計更新・WAL書き戻し" + ("・VACUUM）" if args.vacuum else "）")
+    log_controller.log_operation(operation_type='メンテナンス', target_table='database', detail=detail)
+    message = f"整合性: OK  サイズ: {size_before / (1024 * 1024):.2f} MB → {size_after / (1024 * 1024):.2f} MB"
+    if busy:
+        message += "\n他のPCが使用中のため、WALの一部を書き戻せませんでした"
+    return {
+        'integrity': problems,
+        'vacuum': args.vacuum,
+        'checkpoint_busy': bool(busy),
+        'size_before': size_before,
+        'size_after': size_after,
+        'message': message
+    }
+
+
+def cmd_startup_stats(args) -> dict:
+    """直近の起動の段階ごとの平均・最大時間（画面の起動時に startup_metrics に保存したもの）"""
+    from .config import STARTUP_BUDGET_MS
+    from .utils.startup_profiler import get_startup_summary
+
+    db, _ = _controllers()
+    phases = get_startup_summary(db, launches=args.launches, pc_name=args.pc)
+    for phase in phases:
+        phase['budget_ms'] = STARTUP_BUDGET_MS.get(phase['phase'])
+    if not phases:
+        return {'phases': [], 'message': "起動時間の記録がありません"}
+
+    lines = []
+    for phase in phases:
+        line = f"{phase['phase']:<20} 平均 {phase['avg_ms']:8.0f}ms  最大 {phase['max_ms']:8.0f}ms  ({phase['launches']}回)"
+        if phase['budget_ms'] is not None and phase['avg_ms'] > phase['budget_ms']:
+            line += f"  予算{phase['budget_ms']}msを超過"
+        lines.append(line)
+    target = f"PC: {args.pc}" if args.pc else "全PC"
+    return {
+        'phases': phases,
+        'message': "\n".join([f"直近{args.launches}回の起動（{target}）"] + lines)
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドラインの定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="訂正依頼システムのコマンドライン版（画面を使わずにバッチ処理を実行）"
+    )
+    parser.add_argument("--json", action="store_true", help="結果をJSONで標準出力に表示")
+    parser.add_argument("-v", "--verbose", action="store_true", help="INFOレベルのログも標準エラー出力に表示")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    export = commands.add_parser("export", help="データをCSV/XLSXに書き出す（拡張子 .xlsx の場合はXLSX）")
+    export.add_argument("kind", choices=EXPORT_KINDS, help="エクスポートの種類")
+    export.add_argument("file", type=Path, help="書き出すファイル")
+    export.add_argument(
+        "--workers", type=int, default=1,
+        help="読み込むプロセスの数（省略時は1。2以上の場合、20万件以上の訂正依頼・操作ログのCSVを"
+             "IDの範囲ごとに並行して読み込む。並び順はIDの新しい順になり、書き出し中の変更は範囲によって"
+             "反映される場合がある）"
+    )
+    export.set_defaults(handler=cmd_export)
+
+    by_teacher = commands.add_parser("export-by-teacher", help="訂正依頼を担当教員ごとのファイルに書き出す")
+    by_teacher.add_argument("dir", type=Path, help="フォルダを作成する場所")
+    by_teacher.add_argument("--xlsx", action="store_true", help="XLSXで書き出す（省略時はCSV）")
+    by_teacher.set_defaults(handler=cmd_export_by_teacher)
+
+    imports = commands.add_parser(
+        "import", help="CSV/XLSXを読み込む（訂正依頼は全件置き換え、生徒・講座は差分を反映）"
+    )
+    imports.add_argument("kind", choices=IMPORT_KINDS, help="インポートの種類")
+    imports.add_argument("file", type=Path, help="読み込むファイル")
+    imports.add_argument("--dry-run", action="store_true", help="検証・差分の確認だけ行い、反映しない")
+    imports.add_argument("--allow-errors", action="store_true", help="エラーの行がある場合も、エラーの行を除いて反映する")
+    imports.add_argument("--workers", type=int, default=0, help="訂正依頼を検証するプロセスの数（省略時は50MB以上のファイルだけCPUのコア数から決める）")
+    imports.set_defaults(handler=cmd_import)
+
+    backup = commands.add_parser("backup", help="バックアップを作成")
+    backup.add_argument("--keep", type=int, default=10, help="残すバックアップの数（0の場合は削除しない）")
+    backup.set_defaults(handler=cmd_backup)
+
+    backups = commands.add_parser("backups", help="バックアップの一覧を表示（新しい順）")
+    backups.set_defaults(handler=cmd_backups)
+
+    restore = commands.add_parser("restore", help="バックアップから復元（現在のデータは緊急バックアップに保存）")
+    restore.add_argument("backup", type=Path, help="バックアップのファイル、またはバックアップ一覧の名前")
+    restore.set_defaults(handler=cmd_restore)
+
+    maintenance = commands.add_parser("maintenance", help="整合性の確認・統計情報の更新・WALの書き戻し")
+    maintenance.add_argument("--vacuum", action="store_true", help="削除済みの領域も詰める（他のPCが使っていない時に実行）")
+    maintenance.set_defaults(handler=cmd_maintenance)
+
+    startup_stats = commands.add_parser("startup-stats", help="直近の起動の段階ごとの平均・最大時間を表示")
+    startup_stats.add_argument("--launches", type=int, default=20, help="集計する起動の回数")
+    startup_stats.add_argument("--pc", help="PC名で絞り込む（省略時は全PC）")
+    startup_stats.set_defaults(handler=cmd_startup_stats)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """コマンドを実行して終了コードを返す"""
+    args = build_parser().parse_args(argv)
+
+    # 標準出力は結果だけにする（--json の出力をそのまま読めるように）
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                           datefmt='%Y-%m-%d %H:%M:%S'))
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, handlers=[handler])
+
+    try:
+        result = args.handler(args)
+        exit_code = result.pop('exit_code', EXIT_OK)
+    except KeyboardInterrupt:
+        result, exit_code = {'message': "中断しました"}, EXIT_INTERRUPTED
+    except CommandError as e:
+        result, exit_code = {'message': str(e)}, EXIT_ERROR
+    except Exception as e:
+        logger.error(f"{args.command} に失敗: {e}", exc_info=args.verbose)
+        result, exit_code = {'message': f"{args.command} に失敗しました: {e}"}, EXIT_ERROR
+
+    if args.json:
+        result = {'command': args.command, 'ok': exit_code == EXIT_OK, 'exit_code': exit_code, **result}
+        print(json.dumps(result, ensure_ascii=False, default=str))
+    else:
+        print(result['message'], file=sys.stdout if exit_code == EXIT_OK else sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
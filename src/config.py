@@ -15,6 +15,10 @@ else:
     BASE_DIR = Path(__file__).parent.parent
     DATA_DIR = BASE_DIR / "data"
 
+# 環境変数でデータの保存先を変更できる（ベンチマーク・検証用）
+if os.environ.get("CORRECTIONS_DATA_DIR"):
+    DATA_DIR = Path(os.environ["CORRECTIONS_DATA_DIR"])
+
 DB_PATH = DATA_DIR / "corrections.db"
 BACKUP_DIR = DATA_DIR / "backups"
 RESOURCES_DIR = BASE_DIR / "src" / "resources"
@@ -27,6 +31,7 @@ BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 DEFAULT_ADMIN_PASSWORD = "admin123"
 DEFAULT_NOTICE_MESSAGE = "成績の訂正の場合は、教務に報告してからこちらの訂正依頼を申請してください。訂正依頼後は、成績入力シートなどのデータも忘れずに修正しておいてください。"
 DEFAULT_BACKUP_INTERVAL = 5  # 起動5回ごとにバックアップ
+BACKUP_PAGES_PER_STEP = 256  # バックアップで1度にコピーするページ数（進捗通知・中断の単位）
 
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 800
@@ -38,6 +43,37 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DB_TIMEOUT = 30.0
 DB_WAL_MODE = True
 
+CHANGE_POLL_INTERVAL_MS = 3000  # 他PCの変更を確認する間隔
+CHANGE_POLL_TIMEOUT = 5  # 他PCの変更の確認でロック・共有フォルダの応答を待つ最大秒数
+
+CORRECTION_CACHE_SIZE = 200  # 訂正依頼詳細のキャッシュ件数
+CORRECTION_PREFETCH_ADJACENT = 2  # 選択行の前後何件を先読みするか
+# 起動の段階ごとの時間の予算（ミリ秒、超えた場合はログに警告）
+STARTUP_BUDGET_MS = {
+    'import': 1500,
+    'qapplication': 500,
+    'init_database': 1000,
+    'init_controllers': 200,
+    'load_app_title': 500,
+    'show_window': 500,
+    'setup_ui': 1500,
+    'setup_statusbar': 100,
+    'check_backup': 1000,
+    'start_watcher': 500,
+    'initial_data': 3000,
+}
+
+SEARCH_DEBOUNCE_MS = 250  # 入力が止まってから検索を始めるまでの時間
+ADMIN_PAGE_SIZE = 200  # 管理画面の一覧で1度に読み込む件数
+ADMIN_MAX_ROWS = 10000  # 管理画面の一覧に保持する最大件数（これより先はスクロールしても読み込まない）
+STALL_THRESHOLD_MS = 1000  # 画面がこの時間応答しない場合に全スレッドのスタックを記録
+STALL_HEARTBEAT_MS = 100  # 画面の応答を確認する間隔
+IMPORT_CHUNK_SIZE = 1000  # 一括インポートで1度に書き込む件数（進捗通知・中断の単位）
+IMPORT_DIFF_LOG_LIMIT = 1000  # 差分インポートで変更ごとに操作ログを書く上限（超えた場合は件数のみ記録）
+IMPORT_PARALLEL_MIN_BYTES = 50 * 1024 * 1024  # 訂正依頼CSVをこの大きさ以上の時に複数のプロセスで検証
+EXPORT_CHUNK_SIZE = 2000  # エクスポートで1度に読み込む件数（進捗通知・中断の単位）
+EXPORT_PARALLEL_MIN_ROWS = 200000  # 並行エクスポート（プロセス数2以上を指定）で訂正依頼・操作ログのCSVを複数のプロセスで読み込む件数の下限
+
 REQUEST_TYPES = {
     "ATTENDANCE": "出欠訂正",
     "GRADE": "評価評定変更"
@@ -51,4 +87,5 @@ PERIOD_TYPES = [f"{i}限" for i in range(1, 13)]
 COLOR_ATTENDANCE = "#E8F5E9"
 COLOR_GRADE = "#FFF3E0"
 
-print(f"✅ Config loaded: DB_PATH={DB_PATH}")
+# 標準出力はコマンドライン版（src.cli）の結果に使うため、標準エラー出力に書く
+print(f"✅ Config loaded: DB_PATH={DB_PATH}", file=sys.stderr)
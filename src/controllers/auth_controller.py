@@ -2,6 +2,7 @@
 認証コントローラー
 システム部管理画面のパスワード認証を管理
 """
+from datetime import date
 from typing import Optional
 
 from ..database.db_manager import DatabaseManager
@@ -127,3 +128,24 @@ class AuthController:
             (key, value)
         )
         logger.info(f"設定を保存しました: {key}")
+    
+    def get_active_year(self) -> int:
+        """
+        現在の年度を取得
+        
+        設定（active_year）があればその値、なければ登録済み生徒の最新年度、
+        生徒が未登録なら今日の日付から4月始まりの年度を返す
+        
+        Returns:
+            年度
+        """
+        value = self.get_setting('active_year')
+        if value and value.strip().isdigit():
+            return int(value)
+        
+        rows = self.db.execute_query("SELECT MAX(year) as year FROM students")
+        if rows and rows[0]['year']:
+            return int(rows[0]['year'])
+        
+        today = date.today()
+        return today.year if today.month >= 4 else today.year - 1
@@ -1,16 +1,41 @@
 """
 訂正依頼コントローラー v1.5.0
 """
-from typing import Dict, Any, List, Optional
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable
 from datetime import datetime
 
+from ..config import CORRECTION_CACHE_SIZE
 from ..database.db_manager import DatabaseManager
-from ..controllers.log_controller import LogController
+from ..database.keyset_pager import KeysetPager
+from ..controllers.correction_import import VALIDATED_COLUMNS, validate_rows
+from ..controllers.log_controller import LogController, LOG_INSERT
+from ..utils.csv_stream import ImportCancelled
+from ..utils.lru_cache import LRUCache
 from ..utils.system_info import get_username, get_pc_name
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 訂正依頼に生徒名・講座名を結合して取得するSELECT
+CORRECTION_COLUMNS = """
+    cr.*, s.name as student_name, s.class_number, s.name_kana,
+    c.course_name, c.teacher_name
+"""
+CORRECTION_FROM = """
+    correction_requests cr
+    LEFT JOIN students s ON cr.student_id = s.student_id
+    LEFT JOIN courses c ON cr.course_id = c.course_id
+"""
+CORRECTION_SELECT = f"SELECT {CORRECTION_COLUMNS} FROM {CORRECTION_FROM}"
+
+# インポートで書き込む列
+IMPORT_COLUMNS = f"{VALIDATED_COLUMNS}, requester_pc"
+
 
 class CorrectionController:
     """訂正依頼を管理するコントローラー"""
@@ -18,58 +43,291 @@ class CorrectionController:
     def __init__(self, db: DatabaseManager, log_controller: LogController):
         self.db = db
         self.log_controller = log_controller
+        self.detail_cache = LRUCache(CORRECTION_CACHE_SIZE)
+        # invalidate_cache ごとに進める世代番号（読み込み中に無効化された結果をキャッシュに入れないため）
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
     
     def create_correction(self, correction_data: Dict[str, Any]) -> int:
         """訂正依頼を作成"""
+        return self.create_corrections([correction_data])[0]
+    
+    def create_corrections(self, corrections: List[Dict[str, Any]]) -> List[int]:
+        """
+        複数の訂正依頼と操作ログを1つのトランザクションで作成
+        
+        途中で失敗した場合は1件も登録しない。
+        
+        Args:
+            corrections: 訂正依頼データのリスト
+            
+        Returns:
+            作成した訂正依頼IDのリスト（corrections と同じ順）
+        """
         pc_name = get_pc_name()
+        correction_ids = []
+        log_params = []
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for correction_data in corrections:
+                cursor.execute(
+                    """
+                    INSERT INTO correction_requests
+                    (request_type, student_id, course_id, target_date, semester, periods,
+                     before_value, after_value, reason, requester_name, requester_pc)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        correction_data['request_type'],
+                        correction_data['student_id'],
+                        correction_data['course_id'],
+                        correction_data.get('target_date'),
+                        correction_data.get('semester'),
+                        correction_data.get('periods'),
+                        correction_data.get('before_value'),
+                        correction_data['after_value'],
+                        correction_data['reason'],
+                        correction_data['requester'],
+                        pc_name
+                    )
+                )
+                correction_id = cursor.lastrowid
+                correction_ids.append(correction_id)
+                log_params.append(self.log_controller.log_params(
+                    operation_type='作成',
+                    target_table='correction_requests',
+                    target_record_id=str(correction_id),
+                    after_data=correction_data,
+                    detail=f"訂正依頼を作成: {correction_data['request_type']} by {correction_data['requester']}"
+                ))
+            
+            cursor.executemany(LOG_INSERT, log_params)
+        
+        logger.info(f"訂正依頼を作成しました: {len(correction_ids)}件 ID={correction_ids}")
+        return correction_ids
+    
+    def prepare_import(
+        self,
+        rows: Iterable[Dict[str, Optional[str]]],
+        workers: int = 1,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        訂正依頼CSVの全行を検証し、正しい行を準備用のデータベースに書き込む（共有のデータは変更しない）
         
-        correction_id = self.db.execute_insert(
-            """
-            INSERT INTO correction_requests
-            (request_type, student_id, course_id, target_date, semester, periods,
-             before_value, after_value, reason, requester_name, requester_pc)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                correction_data['request_type'],
-                correction_data['student_id'],
-                correction_data['course_id'],
-                correction_data.get('target_date'),
-                correction_data.get('semester'),
-                correction_data.get('periods'),
-                correction_data.get('before_value'),
-                correction_data['after_value'],
-                correction_data['reason'],
-                correction_data['requester'],
-                pc_name
-            )
-        )
+        生徒ID・講座IDは最初に全件を読み込んで存在を確認する。
+        準備用のデータベースはこのPCの一時フォルダに作り、apply_import で反映するか
+        discard_import で破棄する。行は IMPORT_CHUNK_SIZE 件ずつ処理するため、
+        件数が多くてもメモリの使用量は変わらない（エラーの一覧を除く）。
+        
+        Args:
+            rows: 訂正依頼CSVの行（進捗は iter_csv_rows で通知する）
+            workers: 検証するプロセスの数（2以上でプロセスプールを使う）
+            should_cancel: Trueを返すと中断する関数（IMPORT_CHUNK_SIZE 件ごとに確認）
+            
+        Returns:
+            準備したインポート
+                - path: 準備用のデータベースのパス
+                - count: 正しい行の件数
+                - errors: [(データの位置(0始まり), エラーメッセージ), ...]
+            
+        Raises:
+            ImportCancelled: 中断された場合（準備用のデータベースは削除する）
+        """
+        student_ids = {row['student_id'] for row in self.db.execute_query("SELECT student_id FROM students")}
+        course_ids = {row['course_id'] for row in self.db.execute_query("SELECT course_id FROM courses")}
+        pc_name = get_pc_name()
         
-        self.log_controller.log_operation(
-            operation_type='作成',
-            target_table='correction_requests',
-            target_record_id=str(correction_id),
-            after_data=correction_data,
-            detail=f"訂正依頼を作成: {correction_data['request_type']} by {correction_data['requester']}"
+        fd, path = tempfile.mkstemp(prefix="import_corrections_", suffix=".db")
+        os.close(fd)
+        count = 0
+        errors = []
+        started = time.perf_counter()
+        try:
+            conn = sqlite3.connect(path)
+            try:
+                # 作業用のファイルのため、ジャーナル・同期書き込みは行わない
+                conn.execute("PRAGMA journal_mode=OFF")
+                conn.execute("PRAGMA synchronous=OFF")
+                conn.execute(f"CREATE TABLE corrections ({IMPORT_COLUMNS})")
+                insert = (f"INSERT INTO corrections ({IMPORT_COLUMNS}) "
+                          f"VALUES ({', '.join('?' * len(IMPORT_COLUMNS.split(',')))})")
+                for valid, chunk_errors in validate_rows(rows, student_ids, course_ids, workers):
+                    if should_cancel is not None and should_cancel():
+                        raise ImportCancelled("インポートが中断されました")
+                    conn.executemany(insert, [params + (pc_name,) for params in valid])
+                    count += len(valid)
+                    errors.extend(chunk_errors)
+                conn.commit()
+            finally:
+                conn.close()
+        except BaseException:
+            os.remove(path)
+            raise
+        
+        logger.info(
+            f"訂正依頼インポートを検証しました: {count}件（エラー{len(errors)}件、"
+            f"{workers}プロセス、{(time.perf_counter() - started) * 1000:.0f}ms）"
         )
+        return {'path': path, 'count': count, 'errors': errors}
+    
+    def apply_import(self, prepared: Dict[str, Any],
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     should_cancel: Optional[Callable[[], bool]] = None) -> int:
+        """
+        準備したインポートで全ての訂正依頼を置き換え（1つの短いトランザクション）
+        
+        準備用のデータベースは成功・失敗・中断にかかわらず削除する。
+        書き込みを始める前に中断を確認する（書き込み中は中断しない）。
+        
+        Args:
+            prepared: prepare_import の結果
+            progress: 進捗の通知先 (書き込んだ件数, 全体の件数)（置き換えが終わった時に通知）
+            should_cancel: 中断するか確認する関数
+            
+        Returns:
+            インポートした件数
+            
+        Raises:
+            ValueError: 正しい行が1件もなくエラーの行がある場合（何も変更しない）
+            ImportCancelled: 書き込みを始める前に中断された場合（何も変更しない）
+        """
+        try:
+            count = prepared['count']
+            if count == 0 and prepared['errors']:
+                # 全件がエラーの場合に既存のデータだけが消えるのを防ぐ
+                raise ValueError("正しいデータが1件もないため、置き換えを中止しました")
+            if should_cancel is not None and should_cancel():
+                raise ImportCancelled("インポートが中断されました")
+            
+            with self.db.get_connection() as conn:
+                conn.execute("ATTACH DATABASE ? AS staging", (prepared['path'],))
+                try:
+                    swap_started = time.perf_counter()
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute("DELETE FROM main.correction_requests")
+                    conn.execute(
+                        f"INSERT INTO main.correction_requests ({IMPORT_COLUMNS}) "
+                        f"SELECT {IMPORT_COLUMNS} FROM staging.corrections"
+                    )
+                    conn.executemany(LOG_INSERT, [
+                        self.log_controller.log_params(
+                            operation_type='削除',
+                            target_table='correction_requests',
+                            detail='全訂正依頼を削除（CSVインポート）'
+                        ),
+                        self.log_controller.log_params(
+                            operation_type='インポート',
+                            target_table='correction_requests',
+                            detail=f'{count}件の訂正依頼をインポート'
+                        )
+                    ])
+                    conn.commit()
+                    swap_ms = (time.perf_counter() - swap_started) * 1000
+                finally:
+                    conn.rollback()
+                    conn.execute("DETACH DATABASE staging")
+        finally:
+            self.discard_import(prepared)
+        
+        self.invalidate_cache()
+        if progress is not None:
+            progress(count, count)
+        logger.info(f"訂正依頼をインポートしました: {count}件（入れ替え{swap_ms:.0f}ms）")
+        return count
+    
+    def discard_import(self, prepared: Dict[str, Any]) -> None:
+        """準備したインポートを破棄（準備用のデータベースを削除）"""
+        try:
+            os.remove(prepared['path'])
+        except FileNotFoundError:
+            pass
+    
+    def import_corrections(
+        self,
+        rows: Iterable[Dict[str, Optional[str]]],
+        workers: int = 1,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        訂正依頼CSVの行を検証し、エラーの行を除いて全ての訂正依頼を置き換え
         
-        logger.info(f"訂正依頼を作成しました: ID={correction_id}")
-        return correction_id
+        Returns:
+            (インポートした件数, [(データの位置(0始まり), エラーメッセージ), ...])
+        """
+        prepared = self.prepare_import(rows, workers, should_cancel)
+        return self.apply_import(prepared), prepared['errors']
+    
+    def _cache_put(self, generation: int, correction: Dict[str, Any]) -> None:
+        """読み込みを始めた時から無効化されていなければキャッシュに入れる"""
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self.detail_cache.put(correction['correction_id'], correction)
     
     def get_correction(self, correction_id: int) -> Optional[Dict[str, Any]]:
-        """訂正依頼を取得"""
+        """訂正依頼を取得（常にDBから読み、キャッシュも更新する）"""
+        generation = self._cache_generation
         rows = self.db.execute_query(
-            """
-            SELECT cr.*, s.name as student_name, s.class_number, s.name_kana,
-                   c.course_name, c.teacher_name
-            FROM correction_requests cr
-            LEFT JOIN students s ON cr.student_id = s.student_id
-            LEFT JOIN courses c ON cr.course_id = c.course_id
-            WHERE cr.correction_id = ? AND cr.is_deleted = 0
-            """,
+            CORRECTION_SELECT + " WHERE cr.correction_id = ? AND cr.is_deleted = 0",
             (correction_id,)
         )
-        return self.db.row_to_dict(rows[0]) if rows else None
+        if not rows:
+            self.detail_cache.pop(correction_id)
+            return None
+        
+        correction = self.db.row_to_dict(rows[0])
+        self._cache_put(generation, dict(correction))
+        return correction
+    
+    def get_cached_correction(self, correction_id: int) -> Optional[Dict[str, Any]]:
+        """訂正依頼を取得（先読み済みならキャッシュから返す）"""
+        correction = self.detail_cache.get(correction_id)
+        if correction is not None:
+            return dict(correction)
+        return self.get_correction(correction_id)
+    
+    def prefetch_corrections(self, correction_ids: List[int]) -> int:
+        """
+        訂正依頼の詳細をまとめて先読みしてキャッシュに入れる（ワーカースレッドから呼んでよい）
+        
+        読み込み中に更新・ロックなどで invalidate_cache が呼ばれた場合は、
+        変更前の内容の可能性があるためキャッシュに入れない。
+        
+        Args:
+            correction_ids: 先読みする訂正依頼IDのリスト
+            
+        Returns:
+            新たにキャッシュした件数
+        """
+        missing = [cid for cid in correction_ids if cid not in self.detail_cache]
+        if not missing:
+            return 0
+        
+        generation = self._cache_generation
+        placeholders = ', '.join('?' for _ in missing)
+        rows = self.db.execute_query(
+            CORRECTION_SELECT +
+            f" WHERE cr.correction_id IN ({placeholders}) AND cr.is_deleted = 0",
+            tuple(missing)
+        )
+        for row in rows:
+            self._cache_put(generation, self.db.row_to_dict(row))
+        return len(rows)
+    
+    def invalidate_cache(self, correction_id: Optional[int] = None) -> None:
+        """
+        詳細キャッシュを無効化（実行中の先読みの結果もキャッシュに入れない）
+        
+        Args:
+            correction_id: 対象ID（Noneの場合は全件）
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            if correction_id is None:
+                self.detail_cache.clear()
+            else:
+                self.detail_cache.pop(correction_id)
     
     def get_corrections(
         self,
@@ -89,14 +347,7 @@ class CorrectionController:
             limit: 取得件数
             offset: オフセット
         """
-        query = """
-            SELECT cr.*, s.name as student_name, s.class_number, s.name_kana,
-                   c.course_name, c.teacher_name
-            FROM correction_requests cr
-            LEFT JOIN students s ON cr.student_id = s.student_id
-            LEFT JOIN courses c ON cr.course_id = c.course_id
-            WHERE cr.is_deleted = 0
-        """
+        query = CORRECTION_SELECT + " WHERE cr.is_deleted = 0"
         params = []
         
         if request_type:
@@ -118,6 +369,17 @@ class CorrectionController:
         rows = self.db.execute_query(query, tuple(params))
         return self.db.rows_to_dicts(rows)
     
+    def corrections_pager(self) -> KeysetPager:
+        """訂正依頼一覧を新しい順にページ単位で取得するページャー"""
+        return KeysetPager(
+            self.db,
+            columns=CORRECTION_COLUMNS,
+            from_clause=CORRECTION_FROM,
+            key="cr.correction_id",
+            order=[("IFNULL(cr.request_datetime, '')", True)],
+            where=["cr.is_deleted = 0"]
+        )
+    
     def update_correction(self, correction_id: int, update_data: Dict[str, Any]) -> bool:
         """訂正依頼を更新"""
         before_data = self.get_correction(correction_id)
@@ -152,6 +414,7 @@ class CorrectionController:
         """
         
         affected = self.db.execute_update(query, tuple(params))
+        self.invalidate_cache(correction_id)
         
         if affected > 0:
             self.log_controller.log_operation(
@@ -186,6 +449,7 @@ class CorrectionController:
             """,
             (correction_id,)
         )
+        self.invalidate_cache(correction_id)
         
         if affected > 0:
             # 削除されたデータの詳細をログに記録
@@ -214,6 +478,7 @@ class CorrectionController:
             """,
             (username, correction_id)
         )
+        self.invalidate_cache(correction_id)
         
         if affected > 0:
             self.log_controller.log_operation(
@@ -240,6 +505,7 @@ class CorrectionController:
             """,
             (correction_id,)
         )
+        self.invalidate_cache(correction_id)
         
         if affected > 0:
             self.log_controller.log_operation(
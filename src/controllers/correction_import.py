@@ -0,0 +1,197 @@
+"""
+訂正依頼CSVインポートの検証
+書き込む前に全行を検証し、行ごとのエラーを集める（件数が多い場合は複数のプロセスで並行して検証）
+
+プロセスプールの子プロセスでも読み込むため、Qtやデータベースには依存しない。
+"""
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..config import (
+    IMPORT_CHUNK_SIZE, REQUEST_TYPES, ATTENDANCE_TYPES, SEMESTER_TYPES, PERIOD_TYPES
+)
+
+# 検証後の値の順（書き込む列のうち requester_pc 以外）
+VALIDATED_COLUMNS = """request_type, student_id, course_id, target_date, semester, periods,
+    before_value, after_value, reason, requester_name"""
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# 子プロセスの検証に使う生徒ID・講座ID（プロセスの開始時に1度だけ受け取る）
+_student_ids: Set[str] = set()
+_course_ids: Set[str] = set()
+
+
+def validate_row(row: Dict[str, Optional[str]], student_ids: Set[str], course_ids: Set[str]) -> tuple:
+    """
+    訂正依頼CSVの1行を検証し、VALIDATED_COLUMNS の順の値に変換
+
+    Args:
+        row: CSVの1行（列名 → 値）
+        student_ids: 存在する生徒ID
+        course_ids: 存在する講座ID
+
+    Raises:
+        ValueError: 列がない・値が不正・生徒や講座が存在しない場合
+    """
+    def text(column: str) -> str:
+        value = row.get(column)
+        if value is None:
+            raise ValueError(f"「{column}」の列がありません")
+        return value.strip()
+
+    request_type = text('種別')
+    if request_type not in REQUEST_TYPES.values():
+        raise ValueError(f"種別が不正です: {request_type}")
+
+    student_id = text('生徒ID')
+    if not student_id:
+        raise ValueError("生徒IDが空です")
+    if student_id not in student_ids:
+        raise ValueError(f"生徒ID {student_id} は登録されていません")
+
+    course_id = text('講座ID')
+    if not course_id:
+        raise ValueError("講座IDが空です")
+    if course_id not in course_ids:
+        raise ValueError(f"講座ID {course_id} は登録されていません")
+
+    target_date = text('対象日付')
+    if target_date:
+        try:
+            if not DATE_PATTERN.match(target_date):
+                raise ValueError
+            datetime.strptime(target_date, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"対象日付はYYYY-MM-DDの形式で入力してください: {target_date}")
+
+    semester = text('学期')
+    if semester and semester not in SEMESTER_TYPES:
+        raise ValueError(f"学期が不正です: {semester}")
+
+    periods = text('校時')
+    if periods:
+        numbers = periods.split(',')
+        if any(not n.isdigit() or not 1 <= int(n) <= len(PERIOD_TYPES) for n in numbers):
+            raise ValueError(f"校時が不正です: {periods}")
+
+    before_value = text('訂正前')
+    after_value = text('訂正後')
+    if not after_value:
+        raise ValueError("訂正後が空です")
+    if request_type == REQUEST_TYPES['ATTENDANCE']:
+        for label, value in (('訂正前', before_value), ('訂正後', after_value)):
+            if value and value not in ATTENDANCE_TYPES:
+                raise ValueError(f"{label}の値が不正です: {value}")
+
+    reason = text('理由')
+    if not reason:
+        raise ValueError("理由が空です")
+    requester = text('依頼者')
+    if not requester:
+        raise ValueError("依頼者が空です")
+
+    return (
+        request_type, student_id, course_id, target_date or None, semester or None,
+        periods or None, before_value or None, after_value, reason, requester
+    )
+
+
+def validate_chunk(start: int, rows: List[Dict[str, Optional[str]]],
+                   student_ids: Set[str], course_ids: Set[str]) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+    """
+    連続した行を検証
+
+    Args:
+        start: 先頭の行のデータの位置（0始まり）
+
+    Returns:
+        (正しい行の値のリスト, [(データの位置, エラーメッセージ), ...])
+    """
+    valid = []
+    errors = []
+    for offset, row in enumerate(rows):
+        try:
+            valid.append(validate_row(row, student_ids, course_ids))
+        except ValueError as e:
+            errors.append((start + offset, str(e)))
+    return valid, errors
+
+
+def _init_worker(student_ids: Set[str], course_ids: Set[str]):
+    """子プロセスの初期化（生徒ID・講座IDを保持）"""
+    global _student_ids, _course_ids
+    _student_ids = student_ids
+    _course_ids = course_ids
+
+
+def _validate_chunk_in_worker(start: int, rows: List[Dict[str, Optional[str]]]):
+    """子プロセスで連続した行を検証"""
+    return validate_chunk(start, rows, _student_ids, _course_ids)
+
+
+def _chunks(rows: Iterable[Dict[str, Optional[str]]]) -> Iterator[Tuple[int, List[Dict[str, Optional[str]]]]]:
+    """行を IMPORT_CHUNK_SIZE 件ずつに分ける"""
+    chunk = []
+    start = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def validate_rows(
+    rows: Iterable[Dict[str, Optional[str]]],
+    student_ids: Set[str],
+    course_ids: Set[str],
+    workers: int = 1
+) -> Iterator[Tuple[List[tuple], List[Tuple[int, str]]]]:
+    """
+    行を IMPORT_CHUNK_SIZE 件ずつ検証し、元の順で結果を返す
+
+    workers が2以上の場合はプロセスプールで並行して検証する。
+    メモリの使用量を一定にするため、検証待ちの塊は workers の2倍までとする。
+
+    Args:
+        rows: CSVの行（iter_csv_rows の結果など）
+        workers: 検証するプロセスの数
+
+    Returns:
+        塊ごとの (正しい行の値のリスト, [(データの位置, エラーメッセージ), ...]) を返すイテレーター
+    """
+    if workers < 2:
+        for start, chunk in _chunks(rows):
+            yield validate_chunk(start, chunk, student_ids, course_ids)
+        return
+
+    # GUIのスレッドを持つプロセスをforkしないように、どのOSでもspawnで起動する
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(student_ids, course_ids)
+    )
+    try:
+        pending = deque()
+        for start, chunk in _chunks(rows):
+            pending.append(pool.submit(_validate_chunk_in_worker, start, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def default_workers() -> int:
+    """並行して検証するプロセスの数（GUIのために1コア残す）"""
+    return max(1, (os.cpu_count() or 1) - 1)
@@ -0,0 +1,471 @@
+"""
+エクスポートコントローラー
+訂正依頼・生徒情報・講座情報・操作ログをファイルに書き出す（件数の上限なし）
+"""
+import codecs
+import csv
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import EXPORT_CHUNK_SIZE, EXPORT_PARALLEL_MIN_ROWS
+from ..database.db_manager import DatabaseManager
+from ..controllers.correction_controller import CORRECTION_SELECT
+from ..controllers.log_controller import LogController
+from ..utils.logger import get_logger
+from ..utils.xlsx import XlsxWriter, is_xlsx
+
+logger = get_logger(__name__)
+
+
+class ExportCancelled(Exception):
+    """エクスポートが中断された"""
+
+
+# 並行エクスポートでプロセスごとに受け持つIDの範囲の数（処理の速さの差をならす）
+PARTITIONS_PER_WORKER = 4
+
+# 担当教員別エクスポートの一覧ファイル名と、担当教員が未設定の訂正依頼の表示名
+TEACHER_MANIFEST_NAME = "一覧.csv"
+NO_TEACHER = "担当教員なし"
+
+# Windowsのファイル名に使えない文字と予約されている名前
+_INVALID_FILE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+_RESERVED_FILE_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f"{p}{i}" for p in ('COM', 'LPT') for i in range(1, 10)}
+
+
+def _locked(row) -> str:
+    return '○' if row['is_locked'] else ''
+
+
+# 並行エクスポートの定義
+#   bounds: 対象の行のIDの最小値・最大値・件数, query: IDの範囲（? 以上 ? 以下）の行を新しい順に返すSELECT
+CORRECTIONS_PARTITION = {
+    'bounds': "SELECT MIN(correction_id), MAX(correction_id), COUNT(*)"
+              " FROM correction_requests WHERE is_deleted = 0",
+    'query': CORRECTION_SELECT + " WHERE cr.is_deleted = 0 AND cr.correction_id BETWEEN ? AND ?"
+             " ORDER BY cr.correction_id DESC",
+}
+
+# 訂正依頼の一覧の列（表示用の項目のみ）
+CORRECTION_LIST_COLUMNS = [
+    ('ID', 'correction_id'), ('種別', 'request_type'), ('生徒名', 'student_name'),
+    ('組番号', 'class_number'), ('講座名', 'course_name'), ('対象日付', 'target_date'),
+    ('学期', 'semester'), ('校時', 'periods'), ('訂正前', 'before_value'),
+    ('訂正後', 'after_value'), ('理由', 'reason'), ('依頼者', 'requester_name'),
+    ('ロック', _locked), ('ロック者', 'locked_by'), ('依頼日時', 'request_datetime'),
+]
+
+# エクスポートの種類ごとの定義
+#   label: 表示名, table: 操作ログの対象テーブル, query: 並び順を含むSELECT,
+#   columns: [(見出し, 列名または行を値に変換する関数), ...],
+#   partition: 並行エクスポートの定義（件数が多くなる種類のみ）
+EXPORTS: Dict[str, Dict[str, Any]] = {
+    # システム部管理の訂正依頼エクスポート（IDを含む全項目）
+    'corrections': {
+        'label': '訂正依頼',
+        'table': 'correction_requests',
+        'query': CORRECTION_SELECT + " WHERE cr.is_deleted = 0"
+                 " ORDER BY cr.request_datetime DESC, cr.correction_id DESC",
+        'columns': [
+            ('ID', 'correction_id'), ('種別', 'request_type'), ('生徒ID', 'student_id'),
+            ('生徒名', 'student_name'), ('組番号', 'class_number'), ('講座ID', 'course_id'),
+            ('講座名', 'course_name'), ('対象日付', 'target_date'), ('学期', 'semester'),
+            ('校時', 'periods'), ('訂正前', 'before_value'), ('訂正後', 'after_value'),
+            ('理由', 'reason'), ('依頼者', 'requester_name'), ('依頼者PC', 'requester_pc'),
+            ('ロック', _locked), ('ロック者', 'locked_by'), ('ロック日時', 'locked_datetime'),
+            ('依頼日時', 'request_datetime'),
+        ],
+        'partition': CORRECTIONS_PARTITION,
+    },
+    # 訂正入力タブの一覧エクスポート（表示用の項目のみ）
+    'correction_list': {
+        'label': '訂正依頼',
+        'table': 'correction_requests',
+        'query': CORRECTION_SELECT + " WHERE cr.is_deleted = 0"
+                 " ORDER BY cr.request_datetime DESC, cr.correction_id DESC",
+        'columns': CORRECTION_LIST_COLUMNS,
+        'partition': CORRECTIONS_PARTITION,
+    },
+    # 担当教員別の訂正依頼エクスポート（担当教員の順に並べ、教員ごとのファイルに分ける）
+    'corrections_by_teacher': {
+        'label': '担当教員別訂正依頼',
+        'table': 'correction_requests',
+        'query': CORRECTION_SELECT + " WHERE cr.is_deleted = 0"
+                 " ORDER BY c.teacher_name, cr.request_datetime DESC, cr.correction_id DESC",
+        'columns': [('担当教員', 'teacher_name')] + CORRECTION_LIST_COLUMNS,
+    },
+    # 生徒IDは年度と組番号から自動生成できるため除外（インポートと同じ形式）
+    'students': {
+        'label': '生徒情報',
+        'table': 'students',
+        'query': "SELECT * FROM students ORDER BY year DESC, class_number",
+        'columns': [
+            ('年度', 'year'), ('組番号', 'class_number'), ('出席番号', 'student_number'),
+            ('氏名', 'name'), ('ふりがな', 'name_kana'),
+        ],
+    },
+    # 講座IDは年度と科目コードから自動生成できるため除外（インポートと同じ形式）
+    'courses': {
+        'label': '講座情報',
+        'table': 'courses',
+        'query': "SELECT * FROM courses ORDER BY year DESC, course_id",
+        'columns': [
+            ('講座名', 'course_name'), ('担当教員', 'teacher_name'), ('年度', 'year'),
+            ('学期', 'semester'), ('科目コード', 'subject_code'),
+        ],
+    },
+    'logs': {
+        'label': '操作ログ',
+        'table': 'operation_logs',
+        'query': "SELECT * FROM operation_logs ORDER BY timestamp DESC, log_id DESC",
+        'columns': [
+            ('日時', 'timestamp'), ('ユーザー', 'username'), ('PC名', 'pc_name'),
+            ('操作種別', 'operation_type'), ('対象テーブル', 'target_table'),
+            ('対象レコードID', 'target_record_id'), ('詳細', 'operation_detail'),
+        ],
+        'partition': {
+            'bounds': "SELECT MIN(log_id), MAX(log_id), COUNT(*) FROM operation_logs",
+            'query': "SELECT * FROM operation_logs WHERE log_id BETWEEN ? AND ? ORDER BY log_id DESC",
+        },
+    },
+}
+
+
+@contextmanager
+def _open_writer(file_path: str, xlsx: bool, sheet_name: str):
+    """CSV（UTF-8 BOM付き）またはXLSXの書き込み先を開く（どちらも writerow/writerows で書く）"""
+    if xlsx:
+        with XlsxWriter(file_path, sheet_name) as writer:
+            yield writer
+    else:
+        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+            yield csv.writer(f)
+
+
+def _export_partition(db_path: str, kind: str, low: int, high: int, file_path: str) -> int:
+    """
+    IDの範囲の行をCSV（見出し・BOMなし）に書き出す（子プロセスで実行）
+
+    子プロセスごとに読み取り専用の接続を開く。
+
+    Returns:
+        書き出した件数
+    """
+    spec = EXPORTS[kind]
+    convert = ExportController.row_converter(kind)
+    count = 0
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            cursor = conn.execute(spec['partition']['query'], (low, high))
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                writer.writerows(convert(row) for row in rows)
+                count += len(rows)
+    finally:
+        conn.close()
+    return count
+
+
+def _partition_ranges(low: int, high: int, partitions: int) -> List[Tuple[int, int]]:
+    """IDの範囲を新しい順（IDの大きい順）に partitions 個に分ける"""
+    width = max((high - low + 1 + partitions - 1) // partitions, 1)
+    ranges = []
+    upper = high
+    while upper >= low:
+        ranges.append((max(upper - width + 1, low), upper))
+        upper -= width
+    return ranges
+
+
+def _teacher_file_name(teacher: str, extension: str, used: set) -> str:
+    """
+    担当教員のファイル名（使えない文字は _ に置き換え、同じ名前になる場合は番号を付ける）
+
+    Args:
+        used: 使用済みのファイル名（大文字・小文字を区別しない、追加して返す）
+    """
+    base = _INVALID_FILE_CHARS.sub('_', teacher).strip(' .')[:100] or '_'
+    if base.upper() in _RESERVED_FILE_NAMES:
+        base += '_'
+    name = f"{base}.{extension}"
+    number = 2
+    while name.lower() in used:
+        name = f"{base}_{number}.{extension}"
+        number += 1
+    used.add(name.lower())
+    return name
+
+
+class ExportController:
+    """エクスポートを管理するコントローラー（Qtに依存しない）"""
+
+    def __init__(self, db: DatabaseManager, log_controller: LogController):
+        self.db = db
+        self.log_controller = log_controller
+
+    @staticmethod
+    def headers(kind: str) -> List[str]:
+        """エクスポートの見出し"""
+        return [header for header, _ in EXPORTS[kind]['columns']]
+
+    @staticmethod
+    def row_converter(kind: str) -> Callable[[Any], list]:
+        """データベースの行をエクスポートの値のリストに変換する関数"""
+        getters = [
+            value if callable(value) else (lambda row, key=value: row[key])
+            for _, value in EXPORTS[kind]['columns']
+        ]
+        return lambda row: [getter(row) for getter in getters]
+
+    @staticmethod
+    def file_format(file_path: str) -> str:
+        """ファイルの形式（操作ログに記録する名前）"""
+        return 'XLSX' if is_xlsx(file_path) else 'CSV'
+
+    def export_file(
+        self,
+        kind: str,
+        file_path: str,
+        workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """
+        データをCSV（UTF-8 BOM付き）またはXLSX（拡張子が .xlsx の場合）に書き出す
+
+        1つの読み取りトランザクションで件数の取得と全行の読み込みを行うため、
+        書き出し中に他のPCが書き込んでも、開始時点の整合したデータになる。
+        行は EXPORT_CHUNK_SIZE 件ずつ読み込んでそのままファイルに書くため、
+        件数が多くてもメモリの使用量は変わらない。
+        書き出し中は .part ファイルに書き込み、完了後に名前を変更する（中断・失敗時は削除）。
+
+        workers が2以上で、並行エクスポートに対応した種類のCSVが EXPORT_PARALLEL_MIN_ROWS 件以上の場合は、
+        IDの範囲ごとに複数のプロセスで読み込む（_export_partitioned）。
+        並行エクスポートは1つのトランザクションで読まないため開始時点の整合したデータにならず、
+        並び順もIDの新しい順になる。画面からは使わず、コマンドライン版で指定した場合だけ使う。
+
+        Args:
+            kind: エクスポートの種類（EXPORTS のキー）
+            file_path: 書き出すファイルのパス
+            workers: 読み込むプロセスの数（1の場合は1つのトランザクションで読み込む）
+            progress: 進捗 (書き出した件数, 全件数) を受け取る関数
+            should_cancel: Trueを返すと中断する関数（EXPORT_CHUNK_SIZE 件ごとに確認）
+
+        Returns:
+            書き出した件数
+
+        Raises:
+            ExportCancelled: 中断された場合（ファイルは作成しない）
+        """
+        spec = EXPORTS[kind]
+        part_path = f"{file_path}.part"
+
+        try:
+            bounds = None
+            if workers >= 2 and 'partition' in spec and not is_xlsx(file_path):
+                bounds = self.db.execute_query(spec['partition']['bounds'])[0]
+            if bounds is not None and bounds[2] >= EXPORT_PARALLEL_MIN_ROWS:
+                count = self._export_partitioned(kind, part_path, bounds, workers, progress, should_cancel)
+            else:
+                count = self._export_serial(kind, part_path, is_xlsx(file_path), progress, should_cancel)
+            os.replace(part_path, file_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+        logger.info(f"{spec['label']}をエクスポートしました: {count}件 {file_path}")
+        return count
+
+    def _export_serial(self, kind: str, file_path: str, xlsx: bool,
+                       progress: Optional[Callable[[int, int], None]],
+                       should_cancel: Optional[Callable[[], bool]]) -> int:
+        """1つの読み取りトランザクションで全行を書き出す"""
+        spec = EXPORTS[kind]
+        convert = self.row_converter(kind)
+        count = 0
+
+        # 読み込み中は他のスレッドを待たせない（WALのため他のPCの書き込みも妨げない）
+        with self.db.get_unlocked_connection() as conn, \
+                _open_writer(file_path, xlsx, spec['label']) as writer:
+            conn.execute("BEGIN")
+            total = conn.execute(f"SELECT COUNT(*) FROM ({spec['query']})").fetchone()[0]
+            if progress is not None:
+                progress(0, total)
+
+            writer.writerow(self.headers(kind))
+            cursor = conn.execute(spec['query'])
+            while True:
+                if should_cancel is not None and should_cancel():
+                    raise ExportCancelled("エクスポートが中断されました")
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                writer.writerows(convert(row) for row in rows)
+                count += len(rows)
+                if progress is not None:
+                    progress(count, total)
+            conn.rollback()
+        return count
+
+    def _export_partitioned(self, kind: str, file_path: str, bounds, workers: int,
+                            progress: Optional[Callable[[int, int], None]],
+                            should_cancel: Optional[Callable[[], bool]]) -> int:
+        """
+        IDの範囲ごとに複数のプロセスで読み込み、IDの新しい順に1つのCSVにつなげる
+
+        範囲ごとの書き出しは出力先と同じフォルダの一時ファイルに行い、
+        前の範囲から順に出力ファイルに追記する（件数が多くてもメモリの使用量は変わらない）。
+        開始時点のIDの最大値までを対象とするため、書き出し中に追加された行は含まない。
+        ただし範囲ごとに別の接続で読むため、書き出し中に変更・削除された訂正依頼は
+        範囲によって開始時点と異なる場合がある（操作ログは追加のみのため開始時点と同じ）。
+        """
+        low, high, total = bounds
+        ranges = _partition_ranges(low, high, workers * PARTITIONS_PER_WORKER)
+        if progress is not None:
+            progress(0, total)
+
+        parts_dir = tempfile.mkdtemp(prefix="export_", dir=os.path.dirname(os.path.abspath(file_path)))
+        # GUIのスレッドを持つプロセスをforkしないように、どのOSでもspawnで起動する
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = [
+                pool.submit(_export_partition, str(self.db.db_path), kind, range_low, range_high,
+                            os.path.join(parts_dir, f"{index}.csv"))
+                for index, (range_low, range_high) in enumerate(ranges)
+            ]
+            count = 0
+            with open(file_path, 'wb') as out:
+                header = io.StringIO()
+                csv.writer(header).writerow(self.headers(kind))
+                out.write(codecs.BOM_UTF8 + header.getvalue().encode('utf-8'))
+                for index, future in enumerate(futures):
+                    while True:
+                        if should_cancel is not None and should_cancel():
+                            raise ExportCancelled("エクスポートが中断されました")
+                        try:
+                            count += future.result(timeout=0.1)
+                            break
+                        except TimeoutError:
+                            continue
+                    part = os.path.join(parts_dir, f"{index}.csv")
+                    with open(part, 'rb') as f:
+                        shutil.copyfileobj(f, out)
+                    os.remove(part)
+                    if progress is not None:
+                        progress(count, total)
+            return count
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    def export_by_teacher(
+        self,
+        dir_path: str,
+        xlsx: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        訂正依頼を担当教員ごとのファイルに書き出す
+
+        dir_path に「訂正依頼_担当教員別_日時」フォルダを作り、担当教員（講座の teacher_name）ごとの
+        ファイルと、担当教員・ファイル名・件数の一覧（TEACHER_MANIFEST_NAME）を書く。
+        訂正依頼を担当教員の順に1度だけ読み込み、担当教員が変わった時に前のファイルを閉じるため、
+        教員が数百人でも同時に開くファイルは1つだけで、メモリの使用量も変わらない。
+        書き出し中は .part フォルダに書き込み、完了後に名前を変更する（中断・失敗時は削除）。
+
+        Args:
+            dir_path: フォルダを作成する場所
+            xlsx: XLSXで書き出す場合True（Falseの場合はCSV）
+            progress: 進捗 (書き出した件数, 全件数) を受け取る関数
+            should_cancel: Trueを返すと中断する関数（EXPORT_CHUNK_SIZE 件ごとに確認）
+
+        Returns:
+            {'folder': 作成したフォルダ, 'files': 担当教員のファイル数, 'count': 書き出した件数}
+
+        Raises:
+            ExportCancelled: 中断された場合（フォルダは作成しない）
+        """
+        kind = 'corrections_by_teacher'
+        spec = EXPORTS[kind]
+        convert = self.row_converter(kind)
+        headers = self.headers(kind)
+        extension = 'xlsx' if xlsx else 'csv'
+        folder = os.path.join(dir_path, f"訂正依頼_担当教員別_{datetime.now():%Y%m%d_%H%M%S}")
+        part_folder = f"{folder}.part"
+        # [担当教員, ファイル名, 件数]
+        manifest: List[list] = []
+        used_names = {TEACHER_MANIFEST_NAME.lower()}
+        count = 0
+
+        os.makedirs(part_folder)
+        try:
+            with self.db.get_unlocked_connection() as conn, ExitStack() as current_file:
+                conn.execute("BEGIN")
+                total = conn.execute(f"SELECT COUNT(*) FROM ({spec['query']})").fetchone()[0]
+                if progress is not None:
+                    progress(0, total)
+
+                teacher = None
+                cursor = conn.execute(spec['query'])
+                while True:
+                    if should_cancel is not None and should_cancel():
+                        raise ExportCancelled("エクスポートが中断されました")
+                    rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        row_teacher = row['teacher_name'] or NO_TEACHER
+                        if row_teacher != teacher:
+                            teacher = row_teacher
+                            current_file.close()
+                            file_name = _teacher_file_name(teacher, extension, used_names)
+                            writer = current_file.enter_context(
+                                _open_writer(os.path.join(part_folder, file_name), xlsx, teacher)
+                            )
+                            writer.writerow(headers)
+                            manifest.append([teacher, file_name, 0])
+                        writer.writerow(convert(row))
+                        manifest[-1][2] += 1
+                    count += len(rows)
+                    if progress is not None:
+                        progress(count, total)
+                conn.rollback()
+
+            with open(os.path.join(part_folder, TEACHER_MANIFEST_NAME), 'w',
+                      newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(['担当教員', 'ファイル名', '件数'])
+                writer.writerows(manifest)
+            os.replace(part_folder, folder)
+        except BaseException:
+            shutil.rmtree(part_folder, ignore_errors=True)
+            raise
+
+        logger.info(f"{spec['label']}をエクスポートしました: {count}件 {len(manifest)}ファイル {folder}")
+        return {'folder': folder, 'files': len(manifest), 'count': count}
+
+    def log_export(self, kind: str, count: int, file_format: str = 'CSV') -> None:
+        """エクスポートを操作ログに記録"""
+        spec = EXPORTS[kind]
+        self.log_controller.log_operation(
+            operation_type='エクスポート',
+            target_table=spec['table'],
+            detail=f"{count}件の{spec['label']}を{file_format}エクスポート"
+        )
@@ -7,11 +7,19 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from ..database.db_manager import DatabaseManager
+from ..database.keyset_pager import KeysetPager
 from ..utils.system_info import get_username, get_pc_name
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+LOG_INSERT = """
+    INSERT INTO operation_logs
+    (username, pc_name, operation_type, target_table, target_record_id,
+     before_data, after_data, operation_detail)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class LogController:
     """操作ログを管理するコントローラー"""
@@ -25,6 +33,28 @@ class LogController:
         """
         self.db = db
     
+    def log_params(
+        self,
+        operation_type: str,
+        target_table: str,
+        target_record_id: Optional[int] = None,
+        before_data: Optional[Dict[str, Any]] = None,
+        after_data: Optional[Dict[str, Any]] = None,
+        detail: Optional[str] = None
+    ) -> tuple:
+        """
+        操作ログ1件分の LOG_INSERT のパラメータを作成
+        
+        他のテーブルの変更と同じトランザクションでログを書く場合に使用する。
+        引数は log_operation() と同じ。
+        """
+        # JSONシリアライズ
+        before_json = json.dumps(before_data, ensure_ascii=False) if before_data else None
+        after_json = json.dumps(after_data, ensure_ascii=False) if after_data else None
+        
+        return (get_username(), get_pc_name(), operation_type, target_table, target_record_id,
+                before_json, after_json, detail)
+    
     def log_operation(
         self,
         operation_type: str,
@@ -48,24 +78,12 @@ class LogController:
         Returns:
             挿入されたログID
         """
-        username = get_username()
-        pc_name = get_pc_name()
-        
-        # JSONシリアライズ
-        before_json = json.dumps(before_data, ensure_ascii=False) if before_data else None
-        after_json = json.dumps(after_data, ensure_ascii=False) if after_data else None
-        
-        log_id = self.db.execute_insert(
-            """
-            INSERT INTO operation_logs
-            (username, pc_name, operation_type, target_table, target_record_id,
-             before_data, after_data, operation_detail)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (username, pc_name, operation_type, target_table, target_record_id,
-             before_json, after_json, detail)
+        params = self.log_params(
+            operation_type, target_table, target_record_id, before_data, after_data, detail
         )
+        log_id = self.db.execute_insert(LOG_INSERT, params)
         
+        username, pc_name = params[0], params[1]
         logger.info(
             f"ログ記録: {operation_type} - {target_table} "
             f"(ID:{target_record_id}) by {username}@{pc_name}"
@@ -127,6 +145,16 @@ class LogController:
         rows = self.db.execute_query(query, tuple(params))
         return self.db.rows_to_dicts(rows)
     
+    def logs_pager(self) -> KeysetPager:
+        """ログを新しい順にページ単位で取得するページャー"""
+        return KeysetPager(
+            self.db,
+            columns="*",
+            from_clause="operation_logs",
+            key="log_id",
+            order=[("timestamp", True)]
+        )
+    
     def get_log_by_id(self, log_id: int) -> Optional[Dict[str, Any]]:
         """
         ログIDでログを取得
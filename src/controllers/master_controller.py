@@ -2,14 +2,116 @@
 マスタコントローラー v1.5.0
 生徒情報・講座情報のCRUD操作を管理
 """
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable
 
+from ..config import IMPORT_CHUNK_SIZE, IMPORT_DIFF_LOG_LIMIT
 from ..database.db_manager import DatabaseManager
-from ..controllers.log_controller import LogController
+from ..database.keyset_pager import KeysetPager
+from ..controllers.log_controller import LogController, LOG_INSERT
+from ..utils.csv_stream import ImportCancelled
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 書き込む列（先頭がID）
+STUDENT_COLUMNS = "student_id, year, class_number, student_number, name, name_kana"
+COURSE_COLUMNS = "course_id, course_name, teacher_name, year, semester, subject_code"
+
+STUDENT_INSERT = f"INSERT OR REPLACE INTO students ({STUDENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+COURSE_INSERT = f"INSERT OR REPLACE INTO courses ({COURSE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+# 差分インポートで IN (...) に1度に渡すIDの数（SQLiteの変数の上限より小さくする）
+DIFF_QUERY_CHUNK_SIZE = 500
+
+
+def student_from_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """生徒情報CSVの1行を生徒データに変換（値の検証は一括インポート時に行う）"""
+    return {
+        'year': row.get('年度'),
+        'class_number': row.get('組番号'),
+        'student_number': row.get('出席番号', ''),
+        'name': row.get('氏名'),
+        'name_kana': row.get('ふりがな', '')
+    }
+
+
+def course_from_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """講座情報CSVの1行を講座データに変換（値の検証は一括インポート時に行う）"""
+    # 講座IDは年度と科目コード（講座番号として使用）から自動生成
+    return {
+        'course_name': row.get('講座名'),
+        'teacher_name': row.get('担当教員', ''),
+        'year': row.get('年度'),
+        'semester': row.get('学期', ''),
+        'subject_code': row.get('科目コード', ''),
+        'course_number': row.get('科目コード', '')
+    }
+
+
+def _text(value: Any) -> str:
+    """前後の空白を除いた文字列（Noneは空文字）"""
+    return '' if value is None else str(value).strip()
+
+
+def _year(value: Any) -> int:
+    """年度を整数に変換（不正な値はValueError）"""
+    text = _text(value)
+    if not text:
+        raise ValueError("年度が空です")
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"年度が数値ではありません: {text}")
+
+
+def student_params(student_data: Dict[str, Any]) -> tuple:
+    """
+    生徒データを検証して STUDENT_INSERT のパラメータに変換
+    
+    Raises:
+        ValueError: 必須項目が空・年度が数値でない場合
+    """
+    year = _year(student_data.get('year'))
+    class_number = _text(student_data.get('class_number'))
+    name = _text(student_data.get('name'))
+    if not class_number:
+        raise ValueError("組番号が空です")
+    if not name:
+        raise ValueError("氏名が空です")
+    
+    # student_id が空の場合は自動生成
+    student_id = _text(student_data.get('student_id')) or f"{year}-{class_number}"
+    return (
+        student_id, year, class_number,
+        _text(student_data.get('student_number')), name,
+        _text(student_data.get('name_kana'))
+    )
+
+
+def course_params(course_data: Dict[str, Any]) -> tuple:
+    """
+    講座データを検証して COURSE_INSERT のパラメータに変換
+    
+    Raises:
+        ValueError: 必須項目が空・年度が数値でない場合
+    """
+    year = _year(course_data.get('year'))
+    course_name = _text(course_data.get('course_name'))
+    if not course_name:
+        raise ValueError("講座名が空です")
+    
+    # course_id が空の場合は自動生成
+    course_id = _text(course_data.get('course_id'))
+    if not course_id:
+        course_number = _text(course_data.get('course_number'))
+        if not course_number:
+            raise ValueError("講座番号（科目コード）が空です")
+        course_id = f"{year}-{course_number}"
+    return (
+        course_id, course_name, _text(course_data.get('teacher_name')), year,
+        _text(course_data.get('semester')), _text(course_data.get('subject_code'))
+    )
+
 
 class MasterController:
     """マスタデータを管理するコントローラー"""
@@ -43,6 +145,30 @@ class MasterController:
         rows = self.db.execute_query(query, tuple(params) if params else None)
         return self.db.rows_to_dicts(rows)
     
+    def students_pager(self, year: Optional[int] = None) -> KeysetPager:
+        """生徒一覧をページ単位で取得するページャー（並び順はget_studentsと同じ）"""
+        return KeysetPager(
+            self.db,
+            columns="*",
+            from_clause="students",
+            key="student_id",
+            order=[("year", True), ("class_number", False)],
+            where=["year = ?"] if year else None,
+            params=[year] if year else None
+        )
+    
+    def get_years(self) -> List[int]:
+        """生徒・講座が登録されている年度の一覧を取得（新しい順）"""
+        rows = self.db.execute_query(
+            """
+            SELECT year FROM students
+            UNION
+            SELECT year FROM courses
+            ORDER BY year DESC
+            """
+        )
+        return [row['year'] for row in rows]
+    
     def create_student(self, student_data: Dict[str, Any]) -> str:
         """
         生徒情報を作成
@@ -59,26 +185,9 @@ class MasterController:
         Returns:
             生徒ID
         """
-        # student_id が空の場合は自動生成
-        student_id = student_data.get('student_id', '').strip()
-        if not student_id:
-            student_id = f"{student_data['year']}-{student_data['class_number']}"
-        
-        self.db.execute_insert(
-            """
-            INSERT OR REPLACE INTO students 
-            (student_id, year, class_number, student_number, name, name_kana)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                student_id,
-                student_data['year'],
-                student_data['class_number'],
-                student_data['student_number'],
-                student_data['name'],
-                student_data.get('name_kana', '')
-            )
-        )
+        params = student_params(student_data)
+        student_id = params[0]
+        self.db.execute_insert(STUDENT_INSERT, params)
         
         self.log_controller.log_operation(
             operation_type='作成',
@@ -105,6 +214,18 @@ class MasterController:
         rows = self.db.execute_query(query, tuple(params) if params else None)
         return self.db.rows_to_dicts(rows)
     
+    def courses_pager(self, year: Optional[int] = None) -> KeysetPager:
+        """講座一覧をページ単位で取得するページャー（並び順はget_coursesと同じ）"""
+        return KeysetPager(
+            self.db,
+            columns="*",
+            from_clause="courses",
+            key="course_id",
+            order=[("year", True), ("course_id", False)],
+            where=["year = ?"] if year else None,
+            params=[year] if year else None
+        )
+    
     def create_course(self, course_data: Dict[str, Any]) -> str:
         """
         講座情報を作成
@@ -122,27 +243,9 @@ class MasterController:
         Returns:
             講座ID
         """
-        # course_id が空の場合は自動生成
-        course_id = course_data.get('course_id', '').strip()
-        if not course_id:
-            course_number = course_data.get('course_number', '')
-            course_id = f"{course_data['year']}-{course_number}"
-        
-        self.db.execute_insert(
-            """
-            INSERT OR REPLACE INTO courses 
-            (course_id, course_name, teacher_name, year, semester, subject_code)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                course_id,
-                course_data['course_name'],
-                course_data.get('teacher_name', ''),
-                course_data['year'],
-                course_data.get('semester', ''),
-                course_data.get('subject_code', '')
-            )
-        )
+        params = course_params(course_data)
+        course_id = params[0]
+        self.db.execute_insert(COURSE_INSERT, params)
         
         self.log_controller.log_operation(
             operation_type='作成',
@@ -154,3 +257,458 @@ class MasterController:
         
         logger.info(f"講座情報を作成しました: {course_id}")
         return course_id
+    
+    def validate_import(self, records: Iterable[Dict[str, Any]],
+                        to_params: Callable[[Dict[str, Any]], tuple]) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+        """
+        一括インポートするデータを検証
+        
+        Args:
+            records: 生徒データまたは講座データ
+            to_params: 1件をINSERTのパラメータに変換する関数（student_params/course_params）
+        
+        Returns:
+            (正しいデータのパラメータのリスト, [(データの位置(0始まり), エラーメッセージ), ...])
+            同じIDが複数ある場合は2件目以降をエラーとする
+        """
+        params_list = []
+        errors = []
+        seen = {}
+        for index, record in enumerate(records):
+            try:
+                params = to_params(record)
+            except ValueError as e:
+                errors.append((index, str(e)))
+                continue
+            
+            record_id = params[0]
+            if record_id in seen:
+                errors.append((index, f"ID {record_id} が{seen[record_id] + 1}件目と重複しています"))
+                continue
+            seen[record_id] = index
+            params_list.append(params)
+        return params_list, errors
+    
+    def _bulk_import(self, table: str, label: str, columns: str,
+                     params_list: List[tuple], had_errors: bool, replace: bool,
+                     progress: Optional[Callable[[int, int], None]],
+                     should_cancel: Optional[Callable[[], bool]]) -> int:
+        """
+        検証済みのデータを一時テーブルに読み込んでから、短いトランザクションで本来のテーブルに反映
+        
+        一時テーブルへの読み込みは差分の反映（apply_diff）と同じ _load_staging で行う。
+        その後 DatabaseManager のロックを取得して BEGIN IMMEDIATE で書き込みを開始し、
+        DELETE と INSERT ... SELECT で入れ替え、件数をまとめた操作ログ1件と共にコミットする。
+        
+        中断・失敗した場合は元のデータのまま残る。
+        """
+        total = len(params_list)
+        if replace and total == 0 and had_errors:
+            # 全件がエラーの場合に既存のデータだけが消えるのを防ぐ
+            raise ValueError("正しいデータが1件もないため、置き換えを中止しました")
+        
+        column_names = [c.strip() for c in columns.split(",")]
+        id_column = column_names[0]
+        staging = f"import_{table}"
+        
+        # 一時テーブルへの読み込み中は他のスレッドを待たせない（入れ替えの間だけロックを取得）
+        with self.db.get_unlocked_connection() as conn:
+            try:
+                self._load_staging(conn, staging, table, column_names, params_list,
+                                   0, total, progress, should_cancel)
+                conn.commit()
+                
+                if replace:
+                    # 置き換えで消える生徒・講座を参照している訂正依頼を確認
+                    orphans = conn.execute(
+                        f"""
+                        SELECT COUNT(*) FROM correction_requests
+                        WHERE is_deleted = 0
+                          AND {id_column} NOT IN (SELECT {id_column} FROM temp.{staging})
+                        """
+                    ).fetchone()[0]
+                    if orphans:
+                        logger.warning(
+                            f"{label}の置き換えにより{orphans}件の訂正依頼が存在しない{id_column}を参照します"
+                        )
+                
+                if should_cancel is not None and should_cancel():
+                    raise ImportCancelled("インポートが中断されました")
+                
+                detail = f"{total}件の{label}をインポート"
+                if replace:
+                    detail += "（既存のデータを置き換え）"
+                
+                with self.db.lock:
+                    swap_started = time.perf_counter()
+                    conn.execute("BEGIN IMMEDIATE")
+                    if replace:
+                        conn.execute(f"DELETE FROM main.{table}")
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO main.{table} ({columns}) SELECT {columns} FROM temp.{staging}"
+                    )
+                    conn.execute(LOG_INSERT, self.log_controller.log_params(
+                        operation_type='インポート',
+                        target_table=table,
+                        detail=detail
+                    ))
+                    conn.commit()
+                swap_ms = (time.perf_counter() - swap_started) * 1000
+            finally:
+                conn.rollback()
+                conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        
+        logger.info(f"{label}を一括インポートしました: {total}件（入れ替え{swap_ms:.0f}ms）")
+        return total
+    
+    def bulk_import_students(self, students: Iterable[Dict[str, Any]], replace: bool = False,
+                             progress: Optional[Callable[[int, int], None]] = None,
+                             should_cancel: Optional[Callable[[], bool]] = None) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        生徒情報を一括インポート（全件を検証・一時テーブルに読み込んでから短いトランザクションで反映）
+        
+        画面・コマンドラインのCSVインポートは差分の反映（diff_students + apply_diff）を使う。
+        こちらは差分を求めずに全件を書き込む場合（初期データの投入など）に使う。
+        
+        Args:
+            students: 生徒データ（create_student と同じ形式、年度は文字列でもよい）
+            replace: 既存の生徒情報を全て削除して置き換える場合True
+            progress: 進捗の通知先 (書き込んだ件数, 全体の件数)
+            should_cancel: 中断するか確認する関数
+        
+        Returns:
+            (書き込んだ件数, 検証エラーで除外したデータの [(位置, メッセージ), ...])
+        
+        Raises:
+            ImportCancelled: 中断された場合（何も変更しない）
+        """
+        params_list, errors = self.validate_import(students, student_params)
+        count = self._bulk_import(
+            'students', '生徒情報', STUDENT_COLUMNS, params_list, bool(errors), replace,
+            progress, should_cancel
+        )
+        return count, errors
+    
+    def bulk_import_courses(self, courses: Iterable[Dict[str, Any]], replace: bool = False,
+                            progress: Optional[Callable[[int, int], None]] = None,
+                            should_cancel: Optional[Callable[[], bool]] = None) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        講座情報を一括インポート（全件を検証・一時テーブルに読み込んでから短いトランザクションで反映）
+        
+        Args:
+            courses: 講座データ（create_course と同じ形式、年度は文字列でもよい）
+            replace: 既存の講座情報を全て削除して置き換える場合True
+            progress: 進捗の通知先 (書き込んだ件数, 全体の件数)
+            should_cancel: 中断するか確認する関数
+        
+        Returns:
+            (書き込んだ件数, 検証エラーで除外したデータの [(位置, メッセージ), ...])
+        
+        Raises:
+            ImportCancelled: 中断された場合（何も変更しない）
+        """
+        params_list, errors = self.validate_import(courses, course_params)
+        count = self._bulk_import(
+            'courses', '講座情報', COURSE_COLUMNS, params_list, bool(errors), replace,
+            progress, should_cancel
+        )
+        return count, errors
+    
+    def _diff(self, table: str, columns: str, records: Iterable[Dict[str, Any]],
+              to_params: Callable[[Dict[str, Any]], tuple]) -> Dict[str, Any]:
+        """
+        インポートするデータと現在のテーブルの差分を求める
+        
+        行はID（先頭の列）をキーに、正規化した列の値の組で比較する。
+        年度ごとに名簿を管理するため、比較・削除の対象はファイルに含まれる年度の行だけとする
+        （他の年度の行はファイルになくても削除しない）。
+        削除する行のうち、削除されていない訂正依頼が参照している行は削除せずに残す（kept）。
+        追加する行のIDが他の年度に登録されている場合は、他の年度の行を変更しないようにエラーとする。
+        """
+        params_list, errors = self.validate_import(records, to_params)
+        if errors and not params_list:
+            # 全件がエラーの場合に既存のデータが全て削除扱いになるのを防ぐ
+            raise ValueError("正しいデータが1件もないため、インポートを中止しました")
+        
+        column_names = [c.strip() for c in columns.split(",")]
+        id_column = column_names[0]
+        year_index = column_names.index('year')
+        years = sorted({params[year_index] for params in params_list})
+        year_placeholders = ", ".join("?" * len(years))
+        
+        current = {}
+        for row in self.db.execute_query(
+            f"SELECT {columns} FROM {table} WHERE year IN ({year_placeholders})", tuple(years)
+        ):
+            try:
+                params = to_params(dict(row))
+            except ValueError:
+                # 現在の検証に合わない古い行は、そのままの値で比較する（変更・削除として扱う）
+                params = tuple(row)
+            current[params[0]] = params
+        
+        inserts, updates = [], []
+        for params in params_list:
+            before = current.pop(params[0], None)
+            if before is None:
+                inserts.append(params)
+            elif before != params:
+                updates.append((before, params))
+        
+        # 追加する行のIDが他の年度に登録されている場合はエラー（他の年度の行は変更しない）
+        other_years = self._other_year_ids(table, id_column, [params[0] for params in inserts], years)
+        if other_years:
+            error_positions = {index for index, _ in errors}
+            positions = [i for i in range(len(params_list) + len(errors)) if i not in error_positions]
+            position_of = {params[0]: position for params, position in zip(params_list, positions)}
+            for params in inserts:
+                if params[0] in other_years:
+                    errors.append((
+                        position_of[params[0]],
+                        f"ID {params[0]} は{other_years[params[0]]}年度に登録されています"
+                    ))
+            errors.sort()
+            inserts = [params for params in inserts if params[0] not in other_years]
+        
+        # 削除されていない訂正依頼が参照している行は削除しない
+        referenced = self._referenced_counts(id_column, [params[0] for params in current.values()])
+        deletes = [params for params in current.values() if params[0] not in referenced]
+        kept = [(params, referenced[params[0]]) for params in current.values() if params[0] in referenced]
+        if kept:
+            logger.warning(
+                f"{table}の差分インポート: 訂正依頼が参照している{len(kept)}件はファイルにありませんが削除しません"
+            )
+        
+        return {
+            'table': table,
+            'columns': column_names,
+            'years': years,
+            'inserts': inserts,
+            'updates': updates,
+            'deletes': deletes,
+            'kept': kept,
+            'unchanged': len(params_list) - len(inserts) - len(updates) - len(other_years),
+            'errors': errors
+        }
+    
+    def _other_year_ids(self, table: str, id_column: str, ids: List[Any], years: List[int]) -> Dict[Any, int]:
+        """ID → そのIDが登録されている年度（years 以外の年度に登録されているIDのみ）"""
+        found = {}
+        for start in range(0, len(ids), DIFF_QUERY_CHUNK_SIZE):
+            chunk = ids[start:start + DIFF_QUERY_CHUNK_SIZE]
+            for row in self.db.execute_query(
+                f"SELECT {id_column}, year FROM {table} WHERE {id_column} IN ({', '.join('?' * len(chunk))})",
+                tuple(chunk)
+            ):
+                if row[1] not in years:
+                    found[row[0]] = row[1]
+        return found
+    
+    def _referenced_counts(self, id_column: str, ids: List[Any]) -> Dict[Any, int]:
+        """ID → そのIDを参照している削除されていない訂正依頼の件数（参照のないIDは含まない）"""
+        counts = {}
+        for start in range(0, len(ids), DIFF_QUERY_CHUNK_SIZE):
+            chunk = ids[start:start + DIFF_QUERY_CHUNK_SIZE]
+            for row in self.db.execute_query(
+                f"""
+                SELECT {id_column}, COUNT(*) FROM correction_requests
+                WHERE is_deleted = 0 AND {id_column} IN ({', '.join('?' * len(chunk))})
+                GROUP BY {id_column}
+                """,
+                tuple(chunk)
+            ):
+                counts[row[0]] = row[1]
+        return counts
+    
+    def diff_students(self, students: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        インポートする生徒情報と現在の生徒情報の差分を求める（データは変更しない）
+        
+        Args:
+            students: 生徒データ（create_student と同じ形式）
+        
+        Returns:
+            差分の辞書
+                - table: テーブル名
+                - columns: 列名のリスト（各行の値の順）
+                - years: ファイルに含まれる年度のリスト（比較・削除の対象）
+                - inserts: 追加する行のリスト
+                - updates: 変更する行の (変更前, 変更後) のリスト
+                - deletes: 削除する行のリスト（ファイルの年度のうち、ファイルにない行）
+                - kept: ファイルにないが訂正依頼が参照しているため残す行の (行, 訂正依頼の件数) のリスト
+                - unchanged: 変更のない件数
+                - errors: 検証エラー・他の年度に登録済みのIDで除外したデータの [(位置, メッセージ), ...]
+        """
+        return self._diff('students', STUDENT_COLUMNS, students, student_params)
+    
+    def diff_courses(self, courses: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        インポートする講座情報と現在の講座情報の差分を求める（データは変更しない）
+        
+        Args:
+            courses: 講座データ（create_course と同じ形式）
+        
+        Returns:
+            差分の辞書（diff_students と同じ形式）
+        """
+        return self._diff('courses', COURSE_COLUMNS, courses, course_params)
+    
+    def _load_staging(self, conn, staging: str, table: str, columns: List[str], rows: List[tuple],
+                      done: int, total: int,
+                      progress: Optional[Callable[[int, int], None]],
+                      should_cancel: Optional[Callable[[], bool]]) -> int:
+        """
+        行を一時テーブル（TEMP、この接続専用）に IMPORT_CHUNK_SIZE 件ずつ executemany する
+        （一括インポートと差分の反映で共通の読み込み処理）
+        
+        共有のデータベースには書き込まないため、他のPCの読み書きを妨げない。
+        その都度進捗を通知して中断を確認する。
+        
+        Returns:
+            読み込んだ件数（done を含む累計）
+        """
+        column_list = ", ".join(columns)
+        conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        conn.execute(f"CREATE TEMP TABLE {staging} AS SELECT {column_list} FROM main.{table} WHERE 0")
+        placeholders = ", ".join("?" * len(columns))
+        for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            if should_cancel is not None and should_cancel():
+                raise ImportCancelled("インポートが中断されました")
+            chunk = rows[start:start + IMPORT_CHUNK_SIZE]
+            conn.executemany(f"INSERT INTO temp.{staging} ({column_list}) VALUES ({placeholders})", chunk)
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+        return done
+    
+    def apply_diff(self, diff: Dict[str, Any],
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   should_cancel: Optional[Callable[[], bool]] = None) -> int:
+        """
+        差分を一時テーブルに読み込んでから、短いトランザクションで反映し、変更した行だけを操作ログに記録
+        
+        1. 追加・変更・削除する行をそれぞれ一時テーブルに読み込む（_load_staging）。
+           共有のデータベースには書き込まないため、他のPCの読み書きを妨げない。
+        2. DatabaseManager のロックを取得して BEGIN IMMEDIATE で書き込みを開始し、
+           一時テーブルから DELETE・UPDATE ... FROM・INSERT ... SELECT でまとめて反映し、
+           操作ログと共にコミットする。他のPCからは反映前か後のどちらかのデータだけが見える。
+        
+        変更が IMPORT_DIFF_LOG_LIMIT 件を超える場合（初回の読み込みなど）は、
+        変更ごとのログの代わりに件数をまとめた1件だけを記録する。
+        削除は反映する時点でも、削除されていない訂正依頼が参照していない行だけに限る
+        （操作ログ・戻り値の件数も実際に削除した行だけ）。
+        
+        Args:
+            diff: diff_students/diff_courses の結果
+            progress: 進捗の通知先 (一時テーブルに読み込んだ件数, 変更の件数)
+            should_cancel: 中断するか確認する関数
+        
+        Returns:
+            実際に変更した件数（反映時に削除しなかった行は含まない）
+        
+        Raises:
+            ImportCancelled: 中断された場合（何も変更しない）
+        """
+        table = diff['table']
+        columns = diff['columns']
+        id_column = columns[0]
+        label = '生徒情報' if table == 'students' else '講座情報'
+        inserts, updates, deletes = diff['inserts'], diff['updates'], diff['deletes']
+        total = len(inserts) + len(updates) + len(deletes)
+        if total == 0:
+            return 0
+        
+        # 変更ごとのログ（削除のログは実際に削除したIDの分だけを反映時に選ぶ）
+        change_logs, delete_logs = [], {}
+        if total <= IMPORT_DIFF_LOG_LIMIT:
+            def as_dict(params: tuple) -> Dict[str, Any]:
+                return dict(zip(columns, params))
+            
+            for params in inserts:
+                change_logs.append(self.log_controller.log_params(
+                    '作成', table, params[0], after_data=as_dict(params),
+                    detail=f"{label}を作成（差分インポート）"
+                ))
+            for before, after in updates:
+                change_logs.append(self.log_controller.log_params(
+                    '更新', table, after[0], before_data=as_dict(before), after_data=as_dict(after),
+                    detail=f"{label}を更新（差分インポート）"
+                ))
+            for params in deletes:
+                delete_logs[params[0]] = self.log_controller.log_params(
+                    '削除', table, params[0], before_data=as_dict(params),
+                    detail=f"{label}を削除（差分インポート）"
+                )
+        
+        column_list = ", ".join(columns)
+        assignments = ", ".join(f"{c} = staged.{c}" for c in columns[1:])
+        staging_inserts = f"import_{table}_inserts"
+        staging_updates = f"import_{table}_updates"
+        staging_deletes = f"import_{table}_deletes"
+        
+        # 一時テーブルへの読み込み中は他のスレッドを待たせない（反映の間だけロックを取得）
+        with self.db.get_unlocked_connection() as conn:
+            try:
+                done = self._load_staging(conn, staging_inserts, table, columns, inserts,
+                                          0, total, progress, should_cancel)
+                done = self._load_staging(conn, staging_updates, table, columns,
+                                          [after for _, after in updates],
+                                          done, total, progress, should_cancel)
+                self._load_staging(conn, staging_deletes, table, [id_column],
+                                   [(params[0],) for params in deletes],
+                                   done, total, progress, should_cancel)
+                conn.commit()
+                
+                if should_cancel is not None and should_cancel():
+                    raise ImportCancelled("インポートが中断されました")
+                
+                with self.db.lock:
+                    swap_started = time.perf_counter()
+                    conn.execute("BEGIN IMMEDIATE")
+                    # 差分を求めた後に訂正依頼が参照した行・他のPCが削除した行は削除の対象から外す
+                    conn.execute(
+                        f"""
+                        DELETE FROM temp.{staging_deletes}
+                        WHERE {id_column} NOT IN (SELECT {id_column} FROM main.{table})
+                           OR EXISTS (
+                              SELECT 1 FROM correction_requests
+                              WHERE is_deleted = 0
+                                AND correction_requests.{id_column} = {staging_deletes}.{id_column}
+                           )
+                        """
+                    )
+                    deleted_ids = [row[0] for row in conn.execute(f"SELECT {id_column} FROM temp.{staging_deletes}")]
+                    deleted = conn.execute(
+                        f"DELETE FROM main.{table} WHERE {id_column} IN (SELECT {id_column} FROM temp.{staging_deletes})"
+                    ).rowcount
+                    updated = conn.execute(
+                        f"""
+                        UPDATE main.{table} SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                        FROM temp.{staging_updates} AS staged
+                        WHERE {table}.{id_column} = staged.{id_column}
+                        """
+                    ).rowcount
+                    inserted = conn.execute(
+                        f"INSERT INTO main.{table} ({column_list}) "
+                        f"SELECT {column_list} FROM temp.{staging_inserts}"
+                    ).rowcount
+                    
+                    detail = f"{label}の差分インポート: 追加{inserted}件 変更{updated}件 削除{deleted}件"
+                    log_params = [self.log_controller.log_params(
+                        operation_type='インポート', target_table=table, detail=detail
+                    )]
+                    log_params.extend(change_logs)
+                    log_params.extend(delete_logs[record_id] for record_id in deleted_ids if record_id in delete_logs)
+                    conn.executemany(LOG_INSERT, log_params)
+                    conn.commit()
+                swap_ms = (time.perf_counter() - swap_started) * 1000
+            finally:
+                conn.rollback()
+                for staging in (staging_inserts, staging_updates, staging_deletes):
+                    conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        
+        skipped = len(deletes) - deleted
+        if skipped:
+            logger.warning(f"{label}の差分インポート: 反映時に訂正依頼が参照していた・既に削除されていた{skipped}件は削除しませんでした")
+        logger.info(f"{detail}（反映{swap_ms:.0f}ms）")
+        return inserted + updated + deleted
@@ -4,6 +4,7 @@ SQLiteデータベースへの接続とCRUD操作を管理
 """
 import sqlite3
 import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -27,6 +28,8 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self.lock = threading.Lock()
+        # 実行中のSQL（スレッドID → [状態, SQL, 開始時刻]、画面の停止時の調査用）
+        self._in_flight: Dict[int, list] = {}
         logger.info(f"DatabaseManager initialized: {db_path}")
     
     @contextmanager
@@ -35,7 +38,31 @@ class DatabaseManager:
         データベース接続を取得（コンテキストマネージャー）
         自動的にコミット・ロールバック・クローズを管理
         """
+        thread_id = threading.get_ident()
+        self._in_flight[thread_id] = ['ロック待ち', None, time.monotonic()]
         self.lock.acquire()
+        try:
+            with self._open_connection(thread_id) as conn:
+                yield conn
+        finally:
+            self.lock.release()
+    
+    @contextmanager
+    def get_unlocked_connection(self):
+        """
+        self.lock を取得せずにデータベース接続を取得（コンテキストマネージャー）
+        
+        一時テーブルへの読み込みなど、共有のデータベースに書き込まずに時間がかかる処理用。
+        この接続で共有のデータベースに書き込む間だけ self.lock を取得し、
+        他のスレッドを待たせる時間を短くする。
+        """
+        with self._open_connection(threading.get_ident()) as conn:
+            yield conn
+    
+    @contextmanager
+    def _open_connection(self, thread_id: int):
+        """接続を開き、終了時にコミット（例外時はロールバック）して閉じる"""
+        self._in_flight[thread_id] = ['接続中', None, time.monotonic()]
         conn = None
         try:
             conn = sqlite3.connect(
@@ -44,6 +71,10 @@ class DatabaseManager:
                 check_same_thread=False
             )
             conn.row_factory = sqlite3.Row  # 辞書形式で結果取得
+            # 実行する文を記録（直接 conn を使う処理の文も含む）
+            conn.set_trace_callback(
+                lambda sql: self._in_flight.__setitem__(thread_id, ['実行中', sql, time.monotonic()])
+            )
             
             # WALモード有効化（並行アクセス改善）
             if DB_WAL_MODE:
@@ -60,7 +91,20 @@ class DatabaseManager:
         finally:
             if conn:
                 conn.close()
-            self.lock.release()
+            self._in_flight.pop(thread_id, None)
+    
+    def in_flight_queries(self) -> List[Dict[str, Any]]:
+        """
+        現在データベースを使用中のスレッドと実行中のSQL（他のスレッドから呼んでよい）
+        
+        Returns:
+            [{'thread_id', 'state', 'sql', 'elapsed_ms'}, ...]
+        """
+        now = time.monotonic()
+        return [
+            {'thread_id': thread_id, 'state': state, 'sql': sql, 'elapsed_ms': (now - since) * 1000}
+            for thread_id, (state, sql, since) in list(self._in_flight.items())
+        ]
     
     def execute_query(self, query: str, params: tuple = None) -> List[sqlite3.Row]:
         """
@@ -41,6 +41,29 @@ def initialize_database(db_path: Path = DB_PATH, force: bool = False):
     return db
 
 
+def upgrade_database(db_path: Path = DB_PATH):
+    """
+    既存のデータベースに後から追加したテーブル・インデックスを作成
+    
+    スキーマは全て IF NOT EXISTS / INSERT OR IGNORE のため、
+    何度実行しても既存のデータは変わらない
+    
+    Args:
+        db_path: データベースファイルのパス
+    """
+    schema_path = Path(__file__).parent / "schema.sql"
+    
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema_sql = f.read()
+    
+    db = DatabaseManager(db_path)
+    
+    with db.get_connection() as conn:
+        conn.executescript(schema_sql)
+    
+    logger.info("データベーススキーマを確認しました")
+
+
 def _insert_initial_data(db: DatabaseManager):
     """初期データを投入"""
     admin_password_hash = hash_password(DEFAULT_ADMIN_PASSWORD)
@@ -0,0 +1,113 @@
+"""
+キーセットページャー
+OFFSETを使わず「前のページの最後の行より後」を条件にして1ページずつ取得する
+"""
+from typing import List, Dict, Any, Optional, Tuple
+
+from .db_manager import DatabaseManager
+
+
+class KeysetPager:
+    """
+    キーセット方式でSELECT結果をページ単位に取得するクラス
+
+    OFFSETは読み飛ばす行数に比例して遅くなるが、キーセット方式は
+    並び順のキー（最後に主キー）で位置を指定するため、何ページ目でも一定の速さで取得できる。
+    ページの間で接続を保持しないので、取得の合間に他の処理をブロックしない。
+
+    並び順の式はNULLにならないものを指定すること（NULLは比較で一致しないため、
+    NULLを含む列は IFNULL(列, '') のように指定する）。
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        columns: str,
+        from_clause: str,
+        key: str,
+        order: List[Tuple[str, bool]],
+        where: Optional[List[str]] = None,
+        params: Optional[List[Any]] = None
+    ):
+        """
+        初期化
+
+        Args:
+            db: DatabaseManagerインスタンス
+            columns: 取得する列（SELECT句）
+            from_clause: FROM句（JOINを含む）
+            key: 行を一意に特定する式（主キー）
+            order: 並び順の (式, 降順か) のリスト
+            where: 絞り込み条件のリスト（ANDで結合）
+            params: 絞り込み条件のパラメータ
+        """
+        self.db = db
+        self.columns = columns
+        self.from_clause = from_clause
+        self.key = key
+        self.default_order = list(order)
+        self.order = list(order)
+        self.where = list(where or [])
+        self.params = list(params or [])
+
+    def set_order(self, order: Optional[List[Tuple[str, bool]]] = None):
+        """
+        並び順を変更
+
+        Args:
+            order: 並び順の (式, 降順か) のリスト（Noneの場合は既定の並び順）
+        """
+        self.order = list(order) if order else list(self.default_order)
+
+    def _sort_keys(self) -> List[Tuple[str, bool]]:
+        """主キーを最後に加えた並び順（行の位置を一意に決めるため）"""
+        keys = list(self.order)
+        if not any(expr == self.key for expr, _ in keys):
+            descending = keys[0][1] if keys else False
+            keys.append((self.key, descending))
+        return keys
+
+    def fetch_page(self, after: Optional[Tuple] = None, limit: int = 200) -> Tuple[List[Dict[str, Any]], Optional[Tuple]]:
+        """
+        1ページ分を取得
+
+        Args:
+            after: 前のページの最後の位置（Noneの場合は先頭から）
+            limit: 取得件数
+
+        Returns:
+            (行のリスト, 次のページに渡す位置)
+        """
+        sort_keys = self._sort_keys()
+        where = list(self.where)
+        params = list(self.params)
+
+        if after is not None:
+            # (k1, k2, ...) を辞書順で比較する条件を展開（昇順・降順の混在に対応）
+            alternatives = []
+            for i, (expr, descending) in enumerate(sort_keys):
+                terms = [f"{e} = ?" for e, _ in sort_keys[:i]]
+                terms.append(f"{expr} {'<' if descending else '>'} ?")
+                alternatives.append("(" + " AND ".join(terms) + ")")
+                params.extend(after[:i + 1])
+            where.append("(" + " OR ".join(alternatives) + ")")
+
+        position_columns = ", ".join(
+            f"{expr} AS _page_key_{i}" for i, (expr, _) in enumerate(sort_keys)
+        )
+        query = f"SELECT {self.columns}, {position_columns} FROM {self.from_clause}"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY " + ", ".join(
+            f"{expr} {'DESC' if descending else 'ASC'}" for expr, descending in sort_keys
+        )
+        query += " LIMIT ?"
+        params.append(limit)
+
+        rows = self.db.rows_to_dicts(self.db.execute_query(query, tuple(params)))
+        if not rows:
+            return [], after
+
+        last = rows[-1]
+        position = tuple(last[f"_page_key_{i}"] for i in range(len(sort_keys)))
+        return rows, position
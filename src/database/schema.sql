@@ -85,6 +85,21 @@ CREATE INDEX IF NOT EXISTS idx_logs_username ON operation_logs(username);
 CREATE INDEX IF NOT EXISTS idx_logs_operation ON operation_logs(operation_type);
 CREATE INDEX IF NOT EXISTS idx_logs_target ON operation_logs(target_table, target_record_id);
 
+-- 起動時間テーブル（起動の段階ごとの所要時間）
+CREATE TABLE IF NOT EXISTS startup_metrics (
+    metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    launch_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    pc_name TEXT NOT NULL,
+    app_version TEXT,
+    phase TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_startup_launch ON startup_metrics(launch_id);
+CREATE INDEX IF NOT EXISTS idx_startup_pc ON startup_metrics(pc_name, recorded_at);
+
 -- システム設定テーブル
 CREATE TABLE IF NOT EXISTS system_settings (
     setting_key TEXT PRIMARY KEY,
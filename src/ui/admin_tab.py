@@ -1,24 +1,85 @@
 """
 システム部管理タブ v1.5.5
 """
-import csv
+import os
 from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
     QAbstractItemView, QMessageBox, QGroupBox, QFileDialog,
-    QTabWidget, QProgressDialog, QApplication
+    QTabWidget, QLabel, QDialog, QInputDialog
 )
 from PySide6.QtCore import Qt
 
+from .models.sql_table_model import SqlTableModel
+from .dialogs.import_diff_dialog import ImportDiffDialog
+from .dialogs.import_error_dialog import ImportErrorDialog
+from .dialogs.task_progress_dialog import TaskProgressDialog
+from .widgets.year_combo_box import YearComboBox
+from ..config import IMPORT_PARALLEL_MIN_BYTES, ADMIN_MAX_ROWS
 from ..controllers.correction_controller import CorrectionController
+from ..controllers.correction_import import default_workers
+from ..controllers.export_controller import ExportController
 from ..controllers.log_controller import LogController
-from ..controllers.master_controller import MasterController
+from ..controllers.master_controller import (
+    MasterController, student_from_csv_row, course_from_csv_row
+)
 from ..utils.backup_manager import BackupManager
+from ..utils.workers import TaskRunner
+from ..utils.xlsx import FILE_FILTER, iter_file_rows, with_selected_extension
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# インポート結果に表示するエラーの件数
+IMPORT_ERRORS_SHOWN = 20
+
+# 一覧の列定義（sortはSQLで並べ替える式、NULLを含む列はIFNULLで空文字に揃える）
+CORRECTION_COLUMNS = [
+    {'header': "ID", 'key': 'correction_id', 'sort': "cr.correction_id"},
+    {'header': "種別", 'key': 'request_type', 'sort': "cr.request_type"},
+    {'header': "生徒名", 'key': 'student_name', 'sort': "IFNULL(s.name, '')"},
+    {'header': "組番号", 'key': 'class_number', 'sort': "IFNULL(s.class_number, '')"},
+    {'header': "講座名", 'key': 'course_name', 'sort': "IFNULL(c.course_name, '')"},
+    {'header': "対象日付", 'key': 'target_date', 'sort': "IFNULL(cr.target_date, '')"},
+    {'header': "学期", 'key': 'semester', 'sort': "IFNULL(cr.semester, '')"},
+    {'header': "校時", 'key': 'periods'},
+    {'header': "訂正前", 'key': 'before_value'},
+    {'header': "訂正後", 'key': 'after_value'},
+    {'header': "理由", 'key': 'reason', 'format': lambda r: (r.get('reason') or '')[:50]},
+    {'header': "依頼者", 'key': 'requester_name', 'sort': "cr.requester_name"},
+    {'header': "ロック者", 'key': 'locked_by', 'sort': "IFNULL(cr.locked_by, '')",
+     'format': lambda r: (r.get('locked_by') or '') if r.get('is_locked') else ''},
+]
+
+STUDENT_COLUMNS = [
+    {'header': "ID", 'key': 'student_id', 'sort': "student_id"},
+    {'header': "年度", 'key': 'year', 'sort': "year"},
+    {'header': "組番号", 'key': 'class_number', 'sort': "class_number"},
+    {'header': "出席番号", 'key': 'student_number', 'sort': "student_number"},
+    {'header': "氏名", 'key': 'name', 'sort': "name"},
+    {'header': "ふりがな", 'key': 'name_kana', 'sort': "IFNULL(name_kana, '')"},
+]
+
+COURSE_COLUMNS = [
+    {'header': "講座ID", 'key': 'course_id', 'sort': "course_id"},
+    {'header': "講座名", 'key': 'course_name', 'sort': "course_name"},
+    {'header': "担当教員", 'key': 'teacher_name', 'sort': "IFNULL(teacher_name, '')"},
+    {'header': "年度", 'key': 'year', 'sort': "year"},
+    {'header': "学期", 'key': 'semester', 'sort': "IFNULL(semester, '')"},
+    {'header': "科目コード", 'key': 'subject_code', 'sort': "IFNULL(subject_code, '')"},
+]
+
+LOG_COLUMNS = [
+    {'header': "日時", 'key': 'timestamp', 'sort': "timestamp",
+     'format': lambda r: (r.get('timestamp') or '')[:19]},
+    {'header': "ユーザー", 'key': 'username', 'sort': "username"},
+    {'header': "PC名", 'key': 'pc_name', 'sort': "pc_name"},
+    {'header': "操作種別", 'key': 'operation_type', 'sort': "operation_type"},
+    {'header': "対象テーブル", 'key': 'target_table', 'sort': "target_table"},
+    {'header': "詳細", 'key': 'operation_detail'},
+]
+
 
 class AdminTab(QWidget):
     """システム部管理タブ"""
@@ -29,6 +90,7 @@ class AdminTab(QWidget):
         log_controller: LogController,
         master_controller: MasterController,
         backup_manager: BackupManager,
+        active_year: int = None,
         parent=None
     ):
         super().__init__(parent)
@@ -36,6 +98,16 @@ class AdminTab(QWidget):
         self.log_controller = log_controller
         self.master_controller = master_controller
         self.backup_manager = backup_manager
+        self.active_year = active_year
+        
+        # 一覧のページはバックグラウンドで読み込み、古い依頼の結果は捨てる
+        self.tasks = TaskRunner(self)
+        self.tasks.running_changed.connect(self.on_task_running_changed)
+        self.loading_labels = {}
+        self.limit_labels = {}
+        
+        self.export_controller = ExportController(correction_controller.db, log_controller)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -77,11 +149,15 @@ class AdminTab(QWidget):
         data_group = QGroupBox("データ管理")
         data_layout = QHBoxLayout()
         
-        export_btn = QPushButton("📤 CSVエクスポート")
+        export_btn = QPushButton("📤 CSV/Excelエクスポート")
         export_btn.clicked.connect(self.export_corrections_to_csv)
         data_layout.addWidget(export_btn)
         
-        import_btn = QPushButton("📥 CSVインポート")
+        teacher_export_btn = QPushButton("📂 担当教員別エクスポート")
+        teacher_export_btn.clicked.connect(self.export_corrections_by_teacher)
+        data_layout.addWidget(teacher_export_btn)
+        
+        import_btn = QPushButton("📥 CSV/Excelインポート")
         import_btn.clicked.connect(self.import_corrections_from_csv)
         data_layout.addWidget(import_btn)
         
@@ -109,22 +185,18 @@ class AdminTab(QWidget):
         button_layout.addWidget(unlock_btn)
         
         button_layout.addStretch()
+        button_layout.addWidget(self._create_limit_label('corrections'))
+        button_layout.addWidget(self._create_loading_label('corrections'))
         correction_layout.addLayout(button_layout)
         
-        # 訂正依頼リスト
-        self.correction_table = QTableWidget()
-        self.correction_table.setColumnCount(13)
-        self.correction_table.setHorizontalHeaderLabels([
-            "ID", "種別", "生徒名", "組番号", "講座名", "対象日付", 
-            "学期", "校時", "訂正前", "訂正後", "理由", "依頼者", "ロック者"
-        ])
-        self.correction_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.correction_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        
-        header = self.correction_table.horizontalHeader()
-        header.setStretchLastSection(True)
-        for i in range(13):
-            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+        # 訂正依頼リスト（スクロールに合わせて読み込み）
+        self.correction_model = SqlTableModel(
+            CORRECTION_COLUMNS, 'correction_id', task_runner=self.tasks, task_key='corrections', parent=self
+        )
+        self.correction_model.load_failed.connect(
+            lambda message: self._on_load_failed("訂正依頼リストの更新", message)
+        )
+        self.correction_table = self._create_sql_table(self.correction_model)
         
         correction_layout.addWidget(self.correction_table)
         correction_group.setLayout(correction_layout)
@@ -142,11 +214,11 @@ class AdminTab(QWidget):
         data_group = QGroupBox("データ管理")
         data_layout = QHBoxLayout()
         
-        export_btn = QPushButton("📤 CSVエクスポート")
+        export_btn = QPushButton("📤 CSV/Excelエクスポート")
         export_btn.clicked.connect(self.export_students_to_csv)
         data_layout.addWidget(export_btn)
         
-        import_btn = QPushButton("📥 CSVインポート（差替え）")
+        import_btn = QPushButton("📥 CSV/Excelインポート（差分）")
         import_btn.clicked.connect(self.import_students_from_csv)
         data_layout.addWidget(import_btn)
         
@@ -154,21 +226,28 @@ class AdminTab(QWidget):
         refresh_btn.clicked.connect(self.refresh_student_list)
         data_layout.addWidget(refresh_btn)
         
+        # 年度フィルタ（他の年度は選択した時に読み込む）
+        data_layout.addWidget(QLabel("年度:"))
+        self.student_year_combo = YearComboBox(
+            self.active_year, self.master_controller.get_years, allow_all=True
+        )
+        self.student_year_combo.year_selected.connect(self.refresh_student_list)
+        data_layout.addWidget(self.student_year_combo)
+        
         data_layout.addStretch()
+        data_layout.addWidget(self._create_limit_label('students'))
+        data_layout.addWidget(self._create_loading_label('students'))
         data_group.setLayout(data_layout)
         layout.addWidget(data_group)
         
-        # 生徒情報リスト
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(6)
-        self.student_table.setHorizontalHeaderLabels([
-            "ID", "年度", "組番号", "出席番号", "氏名", "ふりがな"
-        ])
-        self.student_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.student_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        
-        header = self.student_table.horizontalHeader()
-        header.setStretchLastSection(True)
+        # 生徒情報リスト（スクロールに合わせて読み込み）
+        self.student_model = SqlTableModel(
+            STUDENT_COLUMNS, 'student_id', task_runner=self.tasks, task_key='students', parent=self
+        )
+        self.student_model.load_failed.connect(
+            lambda message: self._on_load_failed("生徒情報リストの更新", message)
+        )
+        self.student_table = self._create_sql_table(self.student_model)
         
         layout.addWidget(self.student_table)
         widget.setLayout(layout)
@@ -183,11 +262,11 @@ class AdminTab(QWidget):
         data_group = QGroupBox("データ管理")
         data_layout = QHBoxLayout()
         
-        export_btn = QPushButton("📤 CSVエクスポート")
+        export_btn = QPushButton("📤 CSV/Excelエクスポート")
         export_btn.clicked.connect(self.export_courses_to_csv)
         data_layout.addWidget(export_btn)
         
-        import_btn = QPushButton("📥 CSVインポート（差替え）")
+        import_btn = QPushButton("📥 CSV/Excelインポート（差分）")
         import_btn.clicked.connect(self.import_courses_from_csv)
         data_layout.addWidget(import_btn)
         
@@ -195,21 +274,28 @@ class AdminTab(QWidget):
         refresh_btn.clicked.connect(self.refresh_course_list)
         data_layout.addWidget(refresh_btn)
         
+        # 年度フィルタ（他の年度は選択した時に読み込む）
+        data_layout.addWidget(QLabel("年度:"))
+        self.course_year_combo = YearComboBox(
+            self.active_year, self.master_controller.get_years, allow_all=True
+        )
+        self.course_year_combo.year_selected.connect(self.refresh_course_list)
+        data_layout.addWidget(self.course_year_combo)
+        
         data_layout.addStretch()
+        data_layout.addWidget(self._create_limit_label('courses'))
+        data_layout.addWidget(self._create_loading_label('courses'))
         data_group.setLayout(data_layout)
         layout.addWidget(data_group)
         
-        # 講座情報リスト
-        self.course_table = QTableWidget()
-        self.course_table.setColumnCount(6)
-        self.course_table.setHorizontalHeaderLabels([
-            "講座ID", "講座名", "担当教員", "年度", "学期", "科目コード"
-        ])
-        self.course_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.course_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        
-        header = self.course_table.horizontalHeader()
-        header.setStretchLastSection(True)
+        # 講座情報リスト（スクロールに合わせて読み込み）
+        self.course_model = SqlTableModel(
+            COURSE_COLUMNS, 'course_id', task_runner=self.tasks, task_key='courses', parent=self
+        )
+        self.course_model.load_failed.connect(
+            lambda message: self._on_load_failed("講座情報リストの更新", message)
+        )
+        self.course_table = self._create_sql_table(self.course_model)
         
         layout.addWidget(self.course_table)
         widget.setLayout(layout)
@@ -224,7 +310,7 @@ class AdminTab(QWidget):
         data_group = QGroupBox("データ管理")
         data_layout = QHBoxLayout()
         
-        export_btn = QPushButton("📤 CSVエクスポート")
+        export_btn = QPushButton("📤 CSV/Excelエクスポート")
         export_btn.clicked.connect(self.export_logs_to_csv)
         data_layout.addWidget(export_btn)
         
@@ -233,149 +319,120 @@ class AdminTab(QWidget):
         data_layout.addWidget(refresh_btn)
         
         data_layout.addStretch()
+        data_layout.addWidget(self._create_limit_label('logs'))
+        data_layout.addWidget(self._create_loading_label('logs'))
         data_group.setLayout(data_layout)
         layout.addWidget(data_group)
         
-        # ログテーブル
-        self.log_table = QTableWidget()
-        self.log_table.setColumnCount(6)
-        self.log_table.setHorizontalHeaderLabels([
-            "日時", "ユーザー", "PC名", "操作種別", "対象テーブル", "詳細"
-        ])
-        self.log_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.log_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        
-        header = self.log_table.horizontalHeader()
-        header.setStretchLastSection(True)
+        # ログテーブル（スクロールに合わせて読み込み）
+        self.log_model = SqlTableModel(
+            LOG_COLUMNS, 'log_id', task_runner=self.tasks, task_key='logs', parent=self
+        )
+        self.log_model.load_failed.connect(
+            lambda message: self._on_load_failed("ログの更新", message)
+        )
+        self.log_table = self._create_sql_table(self.log_model)
         
         layout.addWidget(self.log_table)
         widget.setLayout(layout)
         return widget
     
+    def _create_sql_table(self, model: SqlTableModel) -> QTableView:
+        """
+        SqlTableModel用のテーブルビューを作成
+        
+        見出しクリックでSQLによる並べ替え。未選択時は各一覧の既定の並び順。
+        列幅は内容を測らず（全行の読み込みを避けるため）見出しの幅で初期化する。
+        """
+        table = QTableView()
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        
+        header = table.horizontalHeader()
+        header.setStretchLastSection(True)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        
+        label = self.limit_labels.get(model.task_key)
+        if label:
+            model.limit_reached.connect(lambda max_rows: label.setVisible(True))
+            model.modelReset.connect(lambda: label.setVisible(False))
+        return table
+    
+    def _create_loading_label(self, key: str) -> QLabel:
+        """読み込み中の表示（TaskRunnerのキーごと）"""
+        label = QLabel("⏳ 読み込み中...")
+        label.setVisible(False)
+        self.loading_labels[key] = label
+        return label
+    
+    def _create_limit_label(self, key: str) -> QLabel:
+        """一覧が保持する件数の上限に達した時の表示（TaskRunnerのキーごと）"""
+        label = QLabel(f"先頭{ADMIN_MAX_ROWS:,}件まで表示しています（続きはエクスポートで確認してください）")
+        label.setVisible(False)
+        self.limit_labels[key] = label
+        return label
+    
+    def on_task_running_changed(self, key: str, running: bool):
+        """読み込み中の表示を切り替え"""
+        if key in self.loading_labels:
+            self.loading_labels[key].setVisible(running)
+    
+    def _on_load_failed(self, action: str, message: str):
+        """バックグラウンドでの読み込みに失敗した"""
+        logger.error(f"{action}に失敗: {message}")
+        QMessageBox.critical(self, "エラー", 
+            f"{action}に失敗しました:\n{message}")
+    
+    def _selected_id(self, table: QTableView, model: SqlTableModel):
+        """選択行のID（未選択はNone）"""
+        rows = table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return model.id_at(rows[0].row())
+    
     def load_data(self):
-        """データをロード"""
+        """データをロード（各一覧はバックグラウンドで読み込み）"""
         self.refresh_correction_list()
         self.refresh_student_list()
         self.refresh_course_list()
         self.refresh_logs()
     
     def refresh_correction_list(self):
-        """訂正依頼リストを更新"""
-        try:
-            corrections = self.correction_controller.get_corrections(limit=1000)
-            
-            self.correction_table.setRowCount(0)
-            
-            for correction in corrections:
-                row = self.correction_table.rowCount()
-                self.correction_table.insertRow(row)
-                
-                self.correction_table.setItem(row, 0, 
-                    QTableWidgetItem(str(correction['correction_id'])))
-                self.correction_table.setItem(row, 1, 
-                    QTableWidgetItem(correction['request_type']))
-                self.correction_table.setItem(row, 2, 
-                    QTableWidgetItem(correction.get('student_name', '')))
-                self.correction_table.setItem(row, 3, 
-                    QTableWidgetItem(correction.get('class_number', '')))
-                self.correction_table.setItem(row, 4, 
-                    QTableWidgetItem(correction.get('course_name', '')))
-                self.correction_table.setItem(row, 5, 
-                    QTableWidgetItem(correction.get('target_date', '')))
-                self.correction_table.setItem(row, 6, 
-                    QTableWidgetItem(correction.get('semester', '')))
-                self.correction_table.setItem(row, 7, 
-                    QTableWidgetItem(correction.get('periods', '')))
-                self.correction_table.setItem(row, 8, 
-                    QTableWidgetItem(correction.get('before_value', '')))
-                self.correction_table.setItem(row, 9, 
-                    QTableWidgetItem(correction.get('after_value', '')))
-                self.correction_table.setItem(row, 10, 
-                    QTableWidgetItem(correction.get('reason', '')[:50]))
-                self.correction_table.setItem(row, 11, 
-                    QTableWidgetItem(correction.get('requester_name', '')))
-                self.correction_table.setItem(row, 12, 
-                    QTableWidgetItem(correction.get('locked_by', '') if correction.get('is_locked') else ''))
-            
-            logger.info(f"{len(corrections)}件の訂正依頼をロードしました")
-            
-        except Exception as e:
-            logger.error(f"訂正依頼リストの更新に失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"訂正依頼リストの更新に失敗しました:\n{e}")
+        """訂正依頼リストを更新（先頭のページをバックグラウンドで読み込み）"""
+        if self.correction_model.pager is None:
+            self.correction_model.set_pager(self.correction_controller.corrections_pager())
+        else:
+            self.correction_model.refresh()
+    
+    def set_active_year(self, year: int):
+        """現在の年度を変更して一覧を更新"""
+        self.active_year = year
+        self.student_year_combo.set_active_year(year)
+        self.course_year_combo.set_active_year(year)
     
     def refresh_student_list(self):
-        """生徒情報リストを更新"""
-        try:
-            students = self.master_controller.get_students()
-            
-            self.student_table.setRowCount(0)
-            
-            for student in students:
-                row = self.student_table.rowCount()
-                self.student_table.insertRow(row)
-                
-                self.student_table.setItem(row, 0, 
-                    QTableWidgetItem(str(student['student_id'])))
-                self.student_table.setItem(row, 1, 
-                    QTableWidgetItem(str(student['year'])))
-                self.student_table.setItem(row, 2, 
-                    QTableWidgetItem(student['class_number']))
-                self.student_table.setItem(row, 3, 
-                    QTableWidgetItem(student.get('student_number', '')))
-                self.student_table.setItem(row, 4, 
-                    QTableWidgetItem(student['name']))
-                self.student_table.setItem(row, 5, 
-                    QTableWidgetItem(student.get('name_kana', '')))
-            
-            logger.info(f"{len(students)}件の生徒情報をロードしました")
-            
-        except Exception as e:
-            logger.error(f"生徒情報リストの更新に失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"生徒情報リストの更新に失敗しました:\n{e}")
+        """生徒情報リストを更新（選択中の年度のみ、先頭のページをバックグラウンドで読み込み）"""
+        self.student_model.set_pager(self.master_controller.students_pager(
+            year=self.student_year_combo.current_year()
+        ))
     
     def refresh_course_list(self):
-        """講座情報リストを更新"""
-        try:
-            courses = self.master_controller.get_courses()
-            
-            self.course_table.setRowCount(0)
-            
-            for course in courses:
-                row = self.course_table.rowCount()
-                self.course_table.insertRow(row)
-                
-                self.course_table.setItem(row, 0, 
-                    QTableWidgetItem(course['course_id']))
-                self.course_table.setItem(row, 1, 
-                    QTableWidgetItem(course['course_name']))
-                self.course_table.setItem(row, 2, 
-                    QTableWidgetItem(course.get('teacher_name', '')))
-                self.course_table.setItem(row, 3, 
-                    QTableWidgetItem(str(course['year'])))
-                self.course_table.setItem(row, 4, 
-                    QTableWidgetItem(course.get('semester', '')))
-                self.course_table.setItem(row, 5, 
-                    QTableWidgetItem(course.get('subject_code', '')))
-            
-            logger.info(f"{len(courses)}件の講座情報をロードしました")
-            
-        except Exception as e:
-            logger.error(f"講座情報リストの更新に失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"講座情報リストの更新に失敗しました:\n{e}")
+        """講座情報リストを更新（選択中の年度のみ、先頭のページをバックグラウンドで読み込み）"""
+        self.course_model.set_pager(self.master_controller.courses_pager(
+            year=self.course_year_combo.current_year()
+        ))
     
     def lock_selected(self):
         """選択された訂正依頼をロック"""
-        selected_items = self.correction_table.selectedItems()
-        if not selected_items:
+        correction_id = self._selected_id(self.correction_table, self.correction_model)
+        if correction_id is None:
             QMessageBox.warning(self, "警告", "ロックする項目を選択してください")
             return
         
-        row = selected_items[0].row()
-        correction_id = int(self.correction_table.item(row, 0).text())
-        
         reply = QMessageBox.question(
             self, "確認", 
             f"訂正依頼 ID:{correction_id} をロックしますか？",
@@ -405,14 +462,11 @@ class AdminTab(QWidget):
     
     def unlock_selected(self):
         """選択された訂正依頼のロックを解除"""
-        selected_items = self.correction_table.selectedItems()
-        if not selected_items:
+        correction_id = self._selected_id(self.correction_table, self.correction_model)
+        if correction_id is None:
             QMessageBox.warning(self, "警告", "ロック解除する項目を選択してください")
             return
         
-        row = selected_items[0].row()
-        correction_id = int(self.correction_table.item(row, 0).text())
-        
         reply = QMessageBox.question(
             self, "確認", 
             f"訂正依頼 ID:{correction_id} のロックを解除しますか？",
@@ -442,62 +496,36 @@ class AdminTab(QWidget):
     
     def export_corrections_to_csv(self):
         """訂正依頼CSVエクスポート"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "CSVエクスポート", "", "CSV Files (*.csv)"
+        self._start_export('corrections', "CSVエクスポート")
+    
+    def export_corrections_by_teacher(self):
+        """訂正依頼を担当教員ごとのファイルにエクスポート（一覧のファイルも作成）"""
+        dir_path = QFileDialog.getExistingDirectory(self, "担当教員別エクスポートの保存先")
+        
+        if not dir_path:
+            return
+        
+        file_format, ok = QInputDialog.getItem(
+            self, "担当教員別エクスポート", "ファイルの形式:", ["CSV", "Excel（.xlsx）"], 0, False
         )
         
-        if not file_path:
+        if not ok:
             return
+        xlsx = file_format != "CSV"
         
-        try:
-            corrections = self.correction_controller.get_corrections(limit=10000)
-            
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                writer.writerow([
-                    'ID', '種別', '生徒ID', '生徒名', '組番号', 
-                    '講座ID', '講座名', '対象日付', '学期', '校時',
-                    '訂正前', '訂正後', '理由', '依頼者', '依頼者PC',
-                    'ロック', 'ロック者', 'ロック日時', '依頼日時'
-                ])
-                
-                for c in corrections:
-                    writer.writerow([
-                        c['correction_id'],
-                        c['request_type'],
-                        c['student_id'],
-                        c.get('student_name', ''),
-                        c.get('class_number', ''),
-                        c['course_id'],
-                        c.get('course_name', ''),
-                        c.get('target_date', ''),
-                        c.get('semester', ''),
-                        c.get('periods', ''),
-                        c.get('before_value', ''),
-                        c.get('after_value', ''),
-                        c.get('reason', ''),
-                        c.get('requester_name', ''),
-                        c.get('requester_pc', ''),
-                        '○' if c['is_locked'] else '',
-                        c.get('locked_by', ''),
-                        c.get('locked_datetime', ''),
-                        c.get('request_datetime', '')
-                    ])
-            
+        def on_result(result: dict):
             QMessageBox.information(self, "完了", 
-                f"{len(corrections)}件のデータをエクスポートしました\n{file_path}")
-            logger.info(f"CSVエクスポート完了: {file_path}")
-            self.log_controller.log_operation(
-                operation_type='エクスポート',
-                target_table='correction_requests',
-                detail=f'{len(corrections)}件の訂正依頼をCSVエクスポート'
-            )
-            
-        except Exception as e:
-            logger.error(f"CSVエクスポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"CSVエクスポートに失敗しました:\n{e}")
+                f"{result['count']}件のデータを{result['files']}人の担当教員のファイルにエクスポートしました\n"
+                f"{result['folder']}")
+            logger.info(f"担当教員別エクスポート完了: {result['folder']}")
+            try:
+                self.export_controller.log_export(
+                    'corrections_by_teacher', result['count'], 'XLSX' if xlsx else 'CSV')
+            except Exception as e:
+                logger.error(f"エクスポートの操作ログの記録に失敗: {e}")
+        
+        dialog = TaskProgressDialog("担当教員別エクスポート", "ファイルは作成されていません", self)
+        dialog.start(self.export_controller.export_by_teacher, dir_path, xlsx, on_result=on_result)
     
     def import_corrections_from_csv(self):
         """訂正依頼CSVインポート（差替え）"""
@@ -513,440 +541,212 @@ class AdminTab(QWidget):
             return
         
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "CSVインポート", "", "CSV Files (*.csv)"
+            self, "CSVインポート", "", FILE_FILTER
         )
         
         if not file_path:
             return
         
-        try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            if len(rows) == 0:
+        # 全行を検証してから、エラーがあれば反映する前に一覧を表示する
+        self._start_import("CSVインポート", self._prepare_corrections_import, file_path,
+                           on_result=self.on_corrections_prepared)
+    
+    def _prepare_corrections_import(self, file_path: str, progress=None, rows_read=None, should_cancel=None):
+        """訂正依頼CSVを1行ずつ読み込んで検証（ワーカースレッド、大きなファイルは複数のプロセスで検証）"""
+        workers = default_workers() if os.path.getsize(file_path) >= IMPORT_PARALLEL_MIN_BYTES else 1
+        rows = iter_file_rows(file_path, progress, rows_read, should_cancel)
+        return self.correction_controller.prepare_import(rows, workers, should_cancel)
+    
+    def on_corrections_prepared(self, prepared: dict):
+        """訂正依頼CSVの検証が完了した時（エラーの行があれば確認してから反映）"""
+        count, errors = prepared['count'], prepared['errors']
+        if errors:
+            for index, error in errors:
+                logger.warning(f"インポートから除外: {index + 2}行目: {error}")
+            dialog = ImportErrorDialog("CSVインポートのエラー", count, errors, self)
+            if dialog.exec() != QDialog.Accepted:
+                self.correction_controller.discard_import(prepared)
+                logger.info(f"CSVインポートを取りやめました（エラー{len(errors)}件）")
+                return
+        
+        def on_result(count: int):
+            if count == 0:
                 QMessageBox.information(self, "完了", 
                     "データ件数: 0件\n（タイトル行のみのため、データは削除されました）")
-                self.correction_controller.db.execute_update(
-                    "DELETE FROM correction_requests"
-                )
-                self.log_controller.log_operation(
-                    operation_type='削除',
-                    target_table='correction_requests',
-                    detail='全訂正依頼を削除（CSVインポート）'
-                )
-                self.refresh_correction_list()
-                return
-            
-            # プログレスダイアログを表示
-            progress = QProgressDialog("訂正依頼を書き込み中...", "キャンセル", 0, len(rows), self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setWindowTitle("インポート中")
-            progress.setMinimumDuration(0)
-            progress.setValue(0)
-            
-            self.correction_controller.db.execute_update(
-                "DELETE FROM correction_requests"
-            )
-            self.log_controller.log_operation(
-                operation_type='削除',
-                target_table='correction_requests',
-                detail='全訂正依頼を削除（CSVインポート）'
-            )
-            
-            success_count = 0
-            for i, row in enumerate(rows):
-                if progress.wasCanceled():
-                    break
-                
-                try:
-                    correction_data = {
-                        'request_type': row['種別'],
-                        'student_id': int(row['生徒ID']),
-                        'course_id': row['講座ID'],
-                        'target_date': row['対象日付'] or None,
-                        'semester': row['学期'] or None,
-                        'periods': row['校時'] or None,
-                        'before_value': row['訂正前'] or None,
-                        'after_value': row['訂正後'],
-                        'reason': row['理由'],
-                        'requester': row['依頼者']
-                    }
-                    
-                    self.correction_controller.create_correction(correction_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"行のインポートに失敗: {e}")
-                    continue
-                
-                progress.setValue(i + 1)
-                QApplication.processEvents()
-            
-            progress.close()
-            
-            QMessageBox.information(self, "完了", 
-                f"{success_count}件のデータをインポートしました")
-            logger.info(f"CSVインポート完了: {success_count}件")
-            
-            self.log_controller.log_operation(
-                operation_type='インポート',
-                target_table='correction_requests',
-                detail=f'{success_count}件の訂正依頼をインポート'
-            )
+            else:
+                message = f"{count}件のデータをインポートしました"
+                if errors:
+                    message += f"（エラーの{len(errors)}行を除外）"
+                QMessageBox.information(self, "完了", message)
+            logger.info(f"CSVインポート完了: {count}件（エラー{len(errors)}件）")
             
             self.refresh_correction_list()
-            
-        except Exception as e:
-            logger.error(f"CSVインポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"CSVインポートに失敗しました:\n{e}")
+        
+        # 置き換えは他のPCの書き込みを待つ場合があるため、画面を止めない（失敗・中断時は何も変更しない）
+        progress = TaskProgressDialog("CSVインポート", "データは変更されていません", self)
+        progress.start(self.correction_controller.apply_import, prepared, on_result=on_result)
     
     def export_students_to_csv(self):
         """生徒情報CSVエクスポート"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "生徒情報CSVエクスポート", "", "CSV Files (*.csv)"
-        )
-        
-        if not file_path:
-            return
-        
-        try:
-            students = self.master_controller.get_students()
-            
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                writer.writerow(['年度', '組番号', '出席番号', '氏名', 'ふりがな'])
-                
-                for s in students:
-                    writer.writerow([
-                        s['year'],
-                        s['class_number'],
-                        s.get('student_number', ''),
-                        s['name'],
-                        s.get('name_kana', '')
-                    ])
-            
-            QMessageBox.information(self, "完了", 
-                f"{len(students)}件のデータをエクスポートしました\n{file_path}")
-            logger.info(f"生徒情報CSVエクスポート完了: {file_path}")
-            self.log_controller.log_operation(
-                operation_type='エクスポート',
-                target_table='students',
-                detail=f'{len(students)}件の生徒情報をCSVエクスポート'
-            )
-            
-        except Exception as e:
-            logger.error(f"生徒情報CSVエクスポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"生徒情報CSVエクスポートに失敗しました:\n{e}")
+        self._start_export('students', "生徒情報CSVエクスポート")
     
     def import_students_from_csv(self):
-        """生徒情報CSVインポート（差替え）"""
-        reply = QMessageBox.warning(
-            self, "警告", 
-            "CSVインポートは既存のデータを全て削除して置き換えます。\n"
-            "この操作は取り消せません。続行しますか？",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if reply != QMessageBox.Yes:
-            return
-        
+        """生徒情報CSVインポート（差分を確認してから反映）"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "生徒情報CSVインポート", "", "CSV Files (*.csv)"
+            self, "生徒情報CSVインポート", "", FILE_FILTER
         )
         
         if not file_path:
             return
         
-        try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            if len(rows) == 0:
-                QMessageBox.information(self, "完了", 
-                    "データ件数: 0件\n（タイトル行のみのため、データは削除されました）")
-                self.master_controller.db.execute_update("DELETE FROM students")
-                self.log_controller.log_operation(
-                    operation_type='削除',
-                    target_table='students',
-                    detail='全生徒情報を削除（CSVインポート）'
-                )
-                self.refresh_student_list()
-                return
-            
-            # プログレスダイアログを表示
-            progress = QProgressDialog("生徒情報を書き込み中...", "キャンセル", 0, len(rows), self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setWindowTitle("インポート中")
-            progress.setMinimumDuration(0)
-            progress.setValue(0)
-            
-            self.master_controller.db.execute_update("DELETE FROM students")
-            self.log_controller.log_operation(
-                operation_type='削除',
-                target_table='students',
-                detail='全生徒情報を削除（CSVインポート）'
-            )
-            
-            success_count = 0
-            for i, row in enumerate(rows):
-                if progress.wasCanceled():
-                    break
-                
-                try:
-                    student_data = {
-                        'year': int(row['年度']),
-                        'class_number': row['組番号'],
-                        'student_number': row.get('出席番号', ''),
-                        'name': row['氏名'],
-                        'name_kana': row.get('ふりがな', '')
-                    }
-                    
-                    self.master_controller.create_student(student_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"行のインポートに失敗: {e}")
-                    continue
-                
-                progress.setValue(i + 1)
-                QApplication.processEvents()
-            
-            progress.close()
-            
-            QMessageBox.information(self, "完了", 
-                f"{success_count}件のデータをインポートしました")
-            logger.info(f"生徒情報CSVインポート完了: {success_count}件")
-            
-            self.log_controller.log_operation(
-                operation_type='インポート',
-                target_table='students',
-                detail=f'{success_count}件の生徒情報をインポート'
-            )
-            
-            self.refresh_student_list()
-            
-        except Exception as e:
-            logger.error(f"生徒情報CSVインポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"生徒情報CSVインポートに失敗しました:\n{e}")
+        def on_result(diff):
+            self._confirm_and_apply_diff("生徒情報CSVインポート", diff, STUDENT_COLUMNS, self.refresh_student_list)
+        
+        # 現在のデータとの差分を求め、確認してから変更分だけを反映する
+        self._start_import(
+            "生徒情報CSVインポート", self._read_master_diff,
+            file_path, student_from_csv_row, self.master_controller.diff_students,
+            on_result=on_result
+        )
     
     def export_courses_to_csv(self):
         """講座情報CSVエクスポート"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "講座情報CSVエクスポート", "", "CSV Files (*.csv)"
-        )
-        
-        if not file_path:
-            return
-        
-        try:
-            courses = self.master_controller.get_courses()
-            
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                # 講座IDは除外してエクスポート（年度と科目コードから自動生成できるため）
-                writer.writerow(['講座名', '担当教員', '年度', '学期', '科目コード'])
-                
-                for c in courses:
-                    # 講座IDは除外してエクスポート
-                    writer.writerow([
-                        c['course_name'],
-                        c.get('teacher_name', ''),
-                        c['year'],
-                        c.get('semester', ''),
-                        c.get('subject_code', '')
-                    ])
-            
-            QMessageBox.information(self, "完了", 
-                f"{len(courses)}件のデータをエクスポートしました\n{file_path}")
-            logger.info(f"講座情報CSVエクスポート完了: {file_path}")
-            self.log_controller.log_operation(
-                operation_type='エクスポート',
-                target_table='courses',
-                detail=f'{len(courses)}件の講座情報をCSVエクスポート'
-            )
-            
-        except Exception as e:
-            logger.error(f"講座情報CSVエクスポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"講座情報CSVエクスポートに失敗しました:\n{e}")
+        self._start_export('courses', "講座情報CSVエクスポート")
     
     def import_courses_from_csv(self):
-        """講座情報CSVインポート（差替え）"""
-        reply = QMessageBox.warning(
-            self, "警告", 
-            "CSVインポートは既存のデータを全て削除して置き換えます。\n"
-            "この操作は取り消せません。続行しますか？",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
+        """講座情報CSVインポート（差分を確認してから反映）"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "講座情報CSVインポート", "", FILE_FILTER
         )
         
-        if reply != QMessageBox.Yes:
+        if not file_path:
             return
         
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "講座情報CSVインポート", "", "CSV Files (*.csv)"
+        def on_result(diff):
+            self._confirm_and_apply_diff("講座情報CSVインポート", diff, COURSE_COLUMNS, self.refresh_course_list)
+        
+        # 現在のデータとの差分を求め、確認してから変更分だけを反映する
+        self._start_import(
+            "講座情報CSVインポート", self._read_master_diff,
+            file_path, course_from_csv_row, self.master_controller.diff_courses,
+            on_result=on_result
+        )
+    
+    def _read_master_diff(self, file_path: str, from_csv_row, diff,
+                          progress=None, rows_read=None, should_cancel=None):
+        """生徒情報・講座情報CSVを1行ずつ読み込み、現在のデータとの差分を求める（ワーカースレッド）"""
+        rows = iter_file_rows(file_path, progress, rows_read, should_cancel)
+        return diff(from_csv_row(row) for row in rows)
+    
+    def _start_import(self, title: str, fn, *args, on_result):
+        """
+        CSVインポートをバックグラウンドで実行し、進捗（読み込んだバイト数と行数）を表示
+        
+        Args:
+            title: 処理名（ダイアログ・メッセージに表示）
+            fn: ワーカースレッドで実行する関数（progress, rows_read, should_cancel を受け取る）
+            on_result: 結果を受け取る関数（GUIスレッドで呼ばれる）
+        """
+        dialog = TaskProgressDialog(title, "データは変更されていません", self)
+        dialog.start(fn, *args, on_result=on_result, count_rows=True)
+    
+    def _start_export(self, kind: str, title: str):
+        """
+        エクスポートするファイルを選び、バックグラウンドで書き出す（件数の上限なし）
+        
+        Args:
+            kind: エクスポートの種類（ExportController の EXPORTS のキー）
+            title: 処理名（ダイアログ・メッセージに表示）
+        """
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, title, "", FILE_FILTER
         )
         
         if not file_path:
             return
+        file_path = with_selected_extension(file_path, selected_filter)
         
-        try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            if len(rows) == 0:
-                QMessageBox.information(self, "完了", 
-                    "データ件数: 0件\n（タイトル行のみのため、データは削除されました）")
-                self.master_controller.db.execute_update("DELETE FROM courses")
-                self.log_controller.log_operation(
-                    operation_type='削除',
-                    target_table='courses',
-                    detail='全講座情報を削除（CSVインポート）'
-                )
-                self.refresh_course_list()
-                return
-            
-            # プログレスダイアログを表示
-            progress = QProgressDialog("講座情報を書き込み中...", "キャンセル", 0, len(rows), self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setWindowTitle("インポート中")
-            progress.setMinimumDuration(0)
-            progress.setValue(0)
-            
-            self.master_controller.db.execute_update("DELETE FROM courses")
-            self.log_controller.log_operation(
-                operation_type='削除',
-                target_table='courses',
-                detail='全講座情報を削除（CSVインポート）'
-            )
-            
-            success_count = 0
-            for i, row in enumerate(rows):
-                if progress.wasCanceled():
-                    break
-                
-                try:
-                    # 講座IDはB列（講座名）とC列（年度）から自動生成
-                    # 実際はF列（科目コード）が講座番号として使用される
-                    course_data = {
-                        'course_name': row['講座名'],
-                        'teacher_name': row.get('担当教員', ''),
-                        'year': int(row['年度']),
-                        'semester': row.get('学期', ''),
-                        'subject_code': row.get('科目コード', ''),
-                        'course_number': row.get('科目コード', '')  # 科目コードを講座番号として使用
-                    }
-                    
-                    self.master_controller.create_course(course_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"行のインポートに失敗: {e}")
-                    continue
-                
-                progress.setValue(i + 1)
-                QApplication.processEvents()
-            
-            progress.close()
-            
+        def on_result(count: int):
             QMessageBox.information(self, "完了", 
-                f"{success_count}件のデータをインポートしました")
-            logger.info(f"講座情報CSVインポート完了: {success_count}件")
-            
-            self.log_controller.log_operation(
-                operation_type='インポート',
-                target_table='courses',
-                detail=f'{success_count}件の講座情報をインポート'
-            )
-            
-            self.refresh_course_list()
-            
-        except Exception as e:
-            logger.error(f"講座情報CSVインポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"講座情報CSVインポートに失敗しました:\n{e}")
+                f"{count}件のデータをエクスポートしました\n{file_path}")
+            logger.info(f"{title}完了: {file_path}")
+            try:
+                self.export_controller.log_export(
+                    kind, count, self.export_controller.file_format(file_path))
+            except Exception as e:
+                logger.error(f"エクスポートの操作ログの記録に失敗: {e}")
+        
+        dialog = TaskProgressDialog(title, "ファイルは作成されていません", self)
+        # 開始時点の整合したデータを書き出すため、1つのトランザクションで読み込む
+        dialog.start(self.export_controller.export_file, kind, file_path, on_result=on_result)
     
-    def export_logs_to_csv(self):
-        """操作ログCSVエクスポート"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "操作ログCSVエクスポート", "", "CSV Files (*.csv)"
-        )
+    def _confirm_and_apply_diff(self, title: str, diff: dict, columns: list, on_applied):
+        """
+        インポートの差分を確認ダイアログで表示し、承認されたらバックグラウンドで反映
+        
+        Args:
+            title: ダイアログのタイトル
+            diff: MasterController.diff_students/diff_courses の結果
+            columns: 一覧の列定義（差分の列名の表示に使う）
+            on_applied: 反映が完了した時に呼ぶ関数（GUIスレッドで呼ばれる）
+        """
+        changes = len(diff['inserts']) + len(diff['updates']) + len(diff['deletes'])
+        if changes == 0:
+            message = f"変更はありません（{diff['unchanged']}件は現在のデータと同じです）"
+            if diff['kept']:
+                message += f"\nファイルにない{len(diff['kept'])}件は訂正依頼が参照しているため削除しません"
+            if diff['errors']:
+                self._show_import_result(0, diff['errors'])
+            else:
+                QMessageBox.information(self, "完了", message)
+            return
         
-        if not file_path:
+        labels = {c['key']: c['header'] for c in columns}
+        dialog = ImportDiffDialog(title, diff, labels, self)
+        if dialog.exec() != QDialog.Accepted:
             return
         
-        try:
-            logs = self.log_controller.get_logs(limit=10000)
-            
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                writer.writerow(['日時', 'ユーザー', 'PC名', '操作種別', '対象テーブル', '対象レコードID', '詳細'])
-                
-                for log in logs:
-                    writer.writerow([
-                        log['timestamp'],
-                        log['username'],
-                        log['pc_name'],
-                        log['operation_type'],
-                        log['target_table'],
-                        log.get('target_record_id', ''),
-                        log.get('operation_detail', '')
-                    ])
-            
-            QMessageBox.information(self, "完了", 
-                f"{len(logs)}件のデータをエクスポートしました\n{file_path}")
-            logger.info(f"操作ログCSVエクスポート完了: {file_path}")
-            self.log_controller.log_operation(
-                operation_type='エクスポート',
-                target_table='operation_logs',
-                detail=f'{len(logs)}件の操作ログをCSVエクスポート'
-            )
-            
-        except Exception as e:
-            logger.error(f"操作ログCSVエクスポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"操作ログCSVエクスポートに失敗しました:\n{e}")
+        def on_result(count: int):
+            logger.info(f"{title}完了: {count}件を変更（差分: 追加{len(diff['inserts'])}件 "
+                        f"変更{len(diff['updates'])}件 削除{len(diff['deletes'])}件 エラー{len(diff['errors'])}件）")
+            on_applied()
+            self._show_import_result(count, diff['errors'])
+        
+        # 初回の読み込みなど変更が多い場合も画面を止めない（失敗・中断時はエラーを表示し、何も変更しない）
+        progress = TaskProgressDialog(title, "データは変更されていません", self)
+        progress.start(self.master_controller.apply_diff, diff, on_result=on_result)
+    
+    def _show_import_result(self, count: int, errors: list):
+        """
+        インポート結果を表示
+        
+        Args:
+            count: インポートした件数
+            errors: 検証エラーで除外した行の [(データの位置(0始まり), メッセージ), ...]
+        """
+        message = f"{count}件のデータをインポートしました"
+        if errors:
+            # CSVの行番号（1行目はタイトル行）で表示する
+            lines = [f"{index + 2}行目: {error}" for index, error in errors[:IMPORT_ERRORS_SHOWN]]
+            if len(errors) > IMPORT_ERRORS_SHOWN:
+                lines.append(f"…ほか{len(errors) - IMPORT_ERRORS_SHOWN}件")
+            message += f"\n\n次の{len(errors)}行はエラーのため除外しました:\n" + "\n".join(lines)
+            for index, error in errors:
+                logger.warning(f"インポートから除外: {index + 2}行目: {error}")
+            QMessageBox.warning(self, "完了", message)
+        else:
+            QMessageBox.information(self, "完了", message)
+    
+    def export_logs_to_csv(self):
+        """操作ログCSVエクスポート"""
+        self._start_export('logs', "操作ログCSVエクスポート")
     
     def refresh_logs(self):
-        """操作ログを更新"""
-        try:
-            logs = self.log_controller.get_logs(limit=100)
-            
-            self.log_table.setRowCount(0)
-            
-            for log in logs:
-                row = self.log_table.rowCount()
-                self.log_table.insertRow(row)
-                
-                self.log_table.setItem(row, 0, 
-                    QTableWidgetItem(log['timestamp'][:19]))
-                self.log_table.setItem(row, 1, 
-                    QTableWidgetItem(log['username']))
-                self.log_table.setItem(row, 2, 
-                    QTableWidgetItem(log['pc_name']))
-                self.log_table.setItem(row, 3, 
-                    QTableWidgetItem(log['operation_type']))
-                self.log_table.setItem(row, 4, 
-                    QTableWidgetItem(log['target_table']))
-                self.log_table.setItem(row, 5, 
-                    QTableWidgetItem(log.get('operation_detail', '')))
-            
-            logger.info(f"{len(logs)}件のログをロードしました")
-            
-        except Exception as e:
-            logger.error(f"ログの更新に失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"ログの更新に失敗しました:\n{e}")
+        """操作ログを更新（先頭のページをバックグラウンドで読み込み）"""
+        if self.log_model.pager is None:
+            self.log_model.set_pager(self.log_controller.logs_pager())
+        else:
+            self.log_model.refresh()
     
     def _create_backup_tab(self):
         """バックアップ管理タブを作成"""
@@ -2,17 +2,24 @@
 訂正入力タブ v1.5.0
 左65%にリスト、右35%に入力フォーム
 """
-import csv
 from PySide6.QtWidgets import (
-    QWidget, QHBoxLayout, QSplitter, QMessageBox, QFileDialog
+    QWidget, QHBoxLayout, QSplitter, QMessageBox, QFileDialog, QLabel
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal, QElapsedTimer
 
 from .widgets.correction_list_widget import CorrectionListWidget
 from .widgets.correction_input_widget import CorrectionInputWidget
-from .dialogs.confirmation_dialog import ConfirmationDialog
+from .widgets.year_combo_box import YearComboBox
+from .models.master_list_model import StudentListModel, CourseListModel
+from .dialogs.batch_review_dialog import BatchReviewDialog
+from .dialogs.task_progress_dialog import TaskProgressDialog
 from .dialogs.view_dialog import ViewDialog
 from ..controllers.correction_controller import CorrectionController
+from ..controllers.master_controller import MasterController
+from ..controllers.export_controller import ExportController
+from ..utils.change_watcher import ChangeWatcher
+from ..utils.workers import run_in_background, TaskRunner
+from ..utils.xlsx import FILE_FILTER, with_selected_extension
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,12 +28,39 @@ logger = get_logger(__name__)
 class CorrectionTab(QWidget):
     """訂正入力タブ"""
     
-    def __init__(self, correction_controller: CorrectionController, parent=None):
+    # 最初の一覧の読み込みが完了した（読み込み開始からの経過ミリ秒）
+    initial_data_loaded = Signal(float)
+    
+    def __init__(self, correction_controller: CorrectionController,
+                 master_controller: MasterController,
+                 change_watcher: ChangeWatcher = None, active_year: int = None, parent=None):
         super().__init__(parent)
         self.controller = correction_controller
+        self.master_controller = master_controller
+        self.change_watcher = change_watcher
+        self.active_year = active_year
+        self.view_dialog = None
+        self.master_cache = {}  # 年度 → (生徒リスト, 講座リスト)
+        self.export_controller = ExportController(correction_controller.db, correction_controller.log_controller)
+        
+        # 生徒・講座の選択肢は全フォーム・ダイアログで共有する
+        self.student_model = StudentListModel(self)
+        self.course_model = CourseListModel(self)
+        self.loaded_version = None
+        
+        # DBの読み込みはバックグラウンドで行い、古い依頼の結果は捨てる
+        self.tasks = TaskRunner(self)
+        self.tasks.running_changed.connect(self.on_task_running_changed)
+        self.initial_timer = QElapsedTimer()
+        self.initial_timer.start()
+        self.initial_loaded = False
+        
         self.setup_ui()
         self.load_data()
         
+        if self.change_watcher:
+            self.change_watcher.changed.connect(self.refresh_list)
+        
     def setup_ui(self):
         """UIをセットアップ"""
         layout = QHBoxLayout()
@@ -38,10 +72,17 @@ class CorrectionTab(QWidget):
         self.list_widget.view_requested.connect(self.on_view_correction)
         self.list_widget.delete_requested.connect(self.on_delete_correction)
         self.list_widget.export_requested.connect(self.on_export_corrections)
+        self.list_widget.prefetch_requested.connect(self.on_prefetch_requested)
         
-        self.input_widget = CorrectionInputWidget()
+        self.input_widget = CorrectionInputWidget(self.student_model, self.course_model)
         self.input_widget.submit_requested.connect(self.on_submit_corrections)
         
+        # 年度選択（他の年度はプルダウンを開いた時に読み込む）
+        self.year_combo = YearComboBox(self.active_year, self.master_controller.get_years)
+        self.year_combo.year_selected.connect(self.on_year_selected)
+        self.input_widget.button_layout.insertWidget(0, QLabel("年度:"))
+        self.input_widget.button_layout.insertWidget(1, self.year_combo)
+        
         splitter.addWidget(self.list_widget)
         splitter.addWidget(self.input_widget)
         
@@ -52,108 +93,166 @@ class CorrectionTab(QWidget):
         self.setLayout(layout)
     
     def load_data(self):
-        """データをロード"""
-        try:
-            students = self.controller.get_students()
-            courses = self.controller.get_courses()
-            
-            self.input_widget.set_students(students)
-            self.input_widget.set_courses(courses)
-            
-            self.refresh_list()
-            
-            logger.info("データをロードしました")
-            
-        except Exception as e:
-            logger.error(f"データのロードに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"データのロードに失敗しました:\n{e}")
+        """データをロード（バックグラウンドで読み込み、完了時に画面へ反映）"""
+        self.load_master_data(self.active_year)
+        self.refresh_list()
+    
+    def on_task_running_changed(self, key: str, running: bool):
+        """読み込み中の表示を切り替え"""
+        if key == 'corrections':
+            self.list_widget.set_loading(running)
+        elif key == 'master':
+            # 選択肢の読み込み中は年度を切り替えられないようにする
+            self.year_combo.setEnabled(not running)
+    
+    def _fetch_master_data(self, year: int) -> tuple:
+        """指定年度の生徒・講座を取得（ワーカースレッド）"""
+        return (
+            self.controller.get_students(year=year),
+            self.controller.get_courses(year=year)
+        )
+    
+    def load_master_data(self, year: int):
+        """指定年度の生徒・講座を選択肢に設定（読み込み済みの年度はキャッシュを使う）"""
+        if year in self.master_cache:
+            self.tasks.discard('master')
+            self._apply_master_data(year, self.master_cache[year])
+            return
+        
+        self.tasks.submit(
+            'master', self._fetch_master_data, year,
+            on_result=lambda result: self._apply_master_data(year, result),
+            on_error=lambda message: self._on_load_failed("年度データのロード", message)
+        )
+    
+    def _apply_master_data(self, year: int, result: tuple):
+        """取得した生徒・講座を選択肢に設定"""
+        self.master_cache[year] = result
+        students, courses = result
+        self.input_widget.set_students(students)
+        self.input_widget.set_courses(courses)
+        logger.info(f"{year}年度の生徒{len(students)}件・講座{len(courses)}件を設定しました")
+    
+    def _on_load_failed(self, action: str, message: str):
+        """バックグラウンドでの読み込みに失敗した"""
+        logger.error(f"{action}に失敗: {message}")
+        QMessageBox.critical(self, "エラー", 
+            f"{action}に失敗しました:\n{message}")
+    
+    def on_year_selected(self, year: int):
+        """年度が選択された時"""
+        self.load_master_data(year)
+    
+    def set_active_year(self, year: int):
+        """現在の年度を変更"""
+        self.active_year = year
+        self.master_cache.clear()
+        
+        self.year_combo.blockSignals(True)
+        self.year_combo.set_active_year(year)
+        self.year_combo.blockSignals(False)
+        
+        self.load_master_data(year)
     
     def refresh_list(self):
-        """訂正依頼リストを更新"""
-        try:
-            corrections = self.controller.get_corrections(limit=1000)
-            self.list_widget.load_corrections(corrections)
-            logger.info(f"{len(corrections)}件の訂正依頼をロードしました")
-            
-        except Exception as e:
-            logger.error(f"訂正依頼リストの更新に失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"訂正依頼リストの更新に失敗しました:\n{e}")
+        """訂正依頼リストを更新（前回の読み込みから変更がなければ何もしない）"""
+        # 最後に確認したdata_versionで判断する（画面から問い合わせると共有フォルダの応答を待つため）
+        version = self.change_watcher.last_version if self.change_watcher else None
+        if version is not None and version == self.loaded_version:
+            # 最後の確認の後の変更は、すぐに確認し直して検出した時（changed）に読み込む
+            self.change_watcher.poll()
+            logger.info("訂正依頼に変更がないため更新をスキップしました")
+            return
+        
+        # 他PCの変更を含むため、先読みした詳細は破棄する
+        self.controller.invalidate_cache()
+        
+        self.tasks.submit(
+            'corrections', self.controller.get_corrections, limit=1000,
+            on_result=lambda corrections: self._apply_corrections(corrections, version),
+            on_error=lambda message: self._on_load_failed("訂正依頼リストの更新", message)
+        )
     
-    def on_submit_corrections(self, corrections: list):
-        """訂正依頼を送信"""
-        success_count = 0
+    def _apply_corrections(self, corrections: list, version):
+        """取得した訂正依頼を一覧に反映"""
+        self.list_widget.load_corrections(corrections)
+        if version is None and self.change_watcher:
+            # 起動直後は変更の監視の最初の確認の値を基準にする
+            version = self.change_watcher.last_version
+        self.loaded_version = version
+        logger.info(f"{len(corrections)}件の訂正依頼をロードしました")
         
-        for i, correction_data in enumerate(corrections):
+        if not self.initial_loaded:
+            self.initial_loaded = True
+            self.initial_data_loaded.emit(float(self.initial_timer.elapsed()))
+    
+    def on_submit_corrections(self, corrections: list):
+        """訂正依頼を送信（まとめて確認し、1つのトランザクションで登録）"""
+        for correction_data in corrections:
             # 生徒情報と講座情報を追加
             student_id = correction_data.get('student_id')
             course_id = correction_data.get('course_id')
             
-            if student_id:
-                students = self.controller.get_students()
-                for student in students:
-                    if student['student_id'] == student_id:
-                        correction_data['student_name'] = student['name']
-                        correction_data['class_number'] = student['class_number']
-                        break
+            student = self.student_model.record_for_id(student_id)
+            if student:
+                correction_data['student_name'] = student['name']
+                correction_data['class_number'] = student['class_number']
             
-            if course_id:
-                courses = self.controller.get_courses()
-                for course in courses:
-                    if course['course_id'] == course_id:
-                        correction_data['course_name'] = course['course_name']
-                        correction_data['teacher_name'] = course.get('teacher_name', '')
-                        break
-            
-            dialog = ConfirmationDialog(correction_data, self)
-            result = dialog.exec()
-            
-            if result == ConfirmationDialog.Accepted:
-                try:
-                    correction_id = self.controller.create_correction(correction_data)
-                    success_count += 1
-                    logger.info(f"訂正依頼を登録しました: ID={correction_id}")
-                    
-                except Exception as e:
-                    logger.error(f"訂正依頼の登録に失敗: {e}")
-                    QMessageBox.critical(self, "エラー", 
-                        f"訂正依頼の登録に失敗しました:\n{e}")
-                    break
-            else:
-                remaining = len(corrections) - i
-                if remaining > 1:
-                    reply = QMessageBox.question(
-                        self, "確認", 
-                        f"残り{remaining}件の訂正をキャンセルしますか？",
-                        QMessageBox.Yes | QMessageBox.No
-                    )
-                    if reply == QMessageBox.Yes:
-                        break
-                else:
-                    break
+            course = self.course_model.record_for_id(course_id)
+            if course:
+                correction_data['course_name'] = course['course_name']
+                correction_data['teacher_name'] = course.get('teacher_name', '')
         
-        if success_count > 0:
-            QMessageBox.information(
-                self, "完了", 
-                f"{success_count}件の訂正依頼を登録しました"
-            )
-            
-            self.refresh_list()
-            self.input_widget.clear_all()
+        dialog = BatchReviewDialog(corrections, self)
+        if dialog.exec() != BatchReviewDialog.Accepted:
+            return
+        
+        selected = dialog.selected_corrections()
+        if not selected:
+            return
+        
+        try:
+            correction_ids = self.controller.create_corrections(selected)
+        except Exception as e:
+            logger.error(f"訂正依頼の登録に失敗: {e}")
+            QMessageBox.critical(self, "エラー", 
+                f"訂正依頼の登録に失敗しました（1件も登録されていません）:\n{e}")
+            return
+        
+        QMessageBox.information(
+            self, "完了", 
+            f"{len(correction_ids)}件の訂正依頼を登録しました"
+        )
+        
+        self.refresh_list()
+        self.input_widget.clear_all()
+    
+    def on_prefetch_requested(self, correction_ids: list):
+        """選択行付近の訂正依頼詳細をバックグラウンドで先読み"""
+        run_in_background(self.controller.prefetch_corrections, correction_ids)
     
     def on_view_correction(self, correction_id: int):
         """訂正依頼を表示/編集"""
         try:
-            correction = self.controller.get_correction(correction_id)
+            # 一覧を読み込んだ後の変更を変更の監視が確認していれば、先読みした詳細は使わない
+            # （最後に確認したdata_versionを使い、表示の時には共有フォルダに問い合わせない）
+            if self.change_watcher:
+                version = self.change_watcher.last_version
+                if self.loaded_version is None:
+                    # 起動直後に一覧の読み込みが変更の監視の最初の確認より先に終わった場合
+                    self.loaded_version = version
+                elif version != self.loaded_version:
+                    self.controller.invalidate_cache()
+            correction = self.controller.get_cached_correction(correction_id)
             if not correction:
                 QMessageBox.warning(self, "エラー", "訂正依頼が見つかりません")
                 return
             
-            students = self.controller.get_students(year=2024)
-            courses = self.controller.get_courses(year=2024)
-            
-            dialog = ViewDialog(correction, students, courses, self)
+            # ダイアログは一度だけ作成し、表示する訂正依頼を差し替えて再利用する
+            if self.view_dialog is None:
+                self.view_dialog = ViewDialog(self.student_model, self.course_model, self)
+            dialog = self.view_dialog
+            dialog.bind(correction)
             result = dialog.exec()
             
             if result == ViewDialog.Accepted and not correction['is_locked']:
@@ -206,50 +305,19 @@ class CorrectionTab(QWidget):
                 f"訂正依頼の削除に失敗しました:\n{e}")
     
     def on_export_corrections(self):
-        """訂正依頼をCSVエクスポート"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "訂正依頼CSVエクスポート", "", "CSV Files (*.csv)"
+        """訂正依頼をCSV・XLSXにエクスポート（バックグラウンドで全件を書き出す）"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "訂正依頼CSVエクスポート", "", FILE_FILTER
         )
         
         if not file_path:
             return
+        file_path = with_selected_extension(file_path, selected_filter)
         
-        try:
-            corrections = self.controller.get_corrections(limit=10000)
-            
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                writer.writerow([
-                    'ID', '種別', '生徒名', '組番号', '講座名', '対象日付', 
-                    '学期', '校時', '訂正前', '訂正後', '理由', '依頼者', 
-                    'ロック', 'ロック者', '依頼日時'
-                ])
-                
-                for c in corrections:
-                    writer.writerow([
-                        c['correction_id'],
-                        c['request_type'],
-                        c.get('student_name', ''),
-                        c.get('class_number', ''),
-                        c.get('course_name', ''),
-                        c.get('target_date', ''),
-                        c.get('semester', ''),
-                        c.get('periods', ''),
-                        c.get('before_value', ''),
-                        c.get('after_value', ''),
-                        c.get('reason', ''),
-                        c.get('requester_name', ''),
-                        '○' if c['is_locked'] else '',
-                        c.get('locked_by', ''),
-                        c.get('request_datetime', '')
-                    ])
-            
+        def on_result(count: int):
             QMessageBox.information(self, "完了", 
-                f"{len(corrections)}件のデータをエクスポートしました\n{file_path}")
+                f"{count}件のデータをエクスポートしました\n{file_path}")
             logger.info(f"訂正依頼CSVエクスポート完了: {file_path}")
-            
-        except Exception as e:
-            logger.error(f"訂正依頼CSVエクスポートに失敗: {e}")
-            QMessageBox.critical(self, "エラー", 
-                f"訂正依頼CSVエクスポートに失敗しました:\n{e}")
+        
+        dialog = TaskProgressDialog("訂正依頼CSVエクスポート", "ファイルは作成されていません", self)
+        dialog.start(self.export_controller.export_file, 'correction_list', file_path, on_result=on_result)
@@ -0,0 +1,119 @@
+"""
+一括確認ダイアログ
+登録する訂正依頼をまとめて確認し、行ごとに登録する・しないを選ぶ
+"""
+from typing import List, Dict, Any
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QHeaderView, QAbstractItemView
+)
+
+from ..models.batch_review_model import BatchReviewModel
+
+# 各列の初期幅（内容を測らない）
+COLUMN_WIDTHS = [50, 100, 150, 160, 160, 80, 140, 0]
+
+
+class BatchReviewDialog(QDialog):
+    """訂正依頼の一括確認ダイアログ"""
+
+    def __init__(self, corrections: List[Dict[str, Any]], parent=None):
+        super().__init__(parent)
+        self.model = BatchReviewModel(corrections, self)
+        self.setWindowTitle("訂正依頼の確認")
+        self.setMinimumWidth(1000)
+        self.setMinimumHeight(500)
+        self.setup_ui(corrections)
+
+    def setup_ui(self, corrections: List[Dict[str, Any]]):
+        """UIをセットアップ"""
+        layout = QVBoxLayout()
+
+        # 依頼者（全件同じ場合のみ表示）
+        requesters = {c.get('requester') for c in corrections}
+        title = "以下の訂正依頼を登録します"
+        if len(requesters) == 1:
+            title += f"（依頼者: {requesters.pop()}）"
+        title_label = QLabel(title)
+        title_label.setStyleSheet("font-size: 16px; font-weight: bold; padding: 10px;")
+        layout.addWidget(title_label)
+
+        # 一覧
+        table = QTableView()
+        table.setModel(self.model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = table.horizontalHeader()
+        for column, width in enumerate(COLUMN_WIDTHS):
+            if width:
+                header.setSectionResizeMode(column, QHeaderView.Interactive)
+                table.setColumnWidth(column, width)
+        header.setSectionResizeMode(len(COLUMN_WIDTHS) - 1, QHeaderView.Stretch)
+        layout.addWidget(table)
+
+        # ボタン
+        button_layout = QHBoxLayout()
+
+        select_all_btn = QPushButton("☑️ 全て選択")
+        select_all_btn.clicked.connect(lambda: self.model.set_all_included(True))
+        button_layout.addWidget(select_all_btn)
+
+        deselect_all_btn = QPushButton("⬜ 全て解除")
+        deselect_all_btn.clicked.connect(lambda: self.model.set_all_included(False))
+        button_layout.addWidget(deselect_all_btn)
+
+        button_layout.addStretch()
+
+        self.register_btn = QPushButton()
+        self.register_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+            QPushButton:disabled {
+                background-color: #9E9E9E;
+            }
+        """)
+        self.register_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.register_btn)
+
+        cancel_btn = QPushButton("キャンセル")
+        cancel_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #da190b;
+            }
+        """)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self.model.included_changed.connect(self.on_included_changed)
+        self.on_included_changed(self.model.included_count())
+
+    def on_included_changed(self, count: int):
+        """登録する件数が変わった時"""
+        self.register_btn.setText(f"登録（{count}件）")
+        self.register_btn.setEnabled(count > 0)
+
+    def selected_corrections(self) -> List[Dict[str, Any]]:
+        """登録する訂正依頼"""
+        return self.model.included_corrections()
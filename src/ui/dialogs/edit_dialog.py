@@ -7,20 +7,21 @@ from PySide6.QtWidgets import (
     QDateEdit, QRadioButton, QButtonGroup, QGroupBox
 )
 from PySide6.QtCore import Qt, QDate
-from typing import Dict, Any, List
+from typing import Dict, Any
 
+from ..models.master_list_model import StudentListModel, CourseListModel
 from ...config import ATTENDANCE_TYPES, GRADE_TYPES, SEMESTER_TYPES, PERIOD_TYPES
 
 
 class EditDialog(QDialog):
     """訂正依頼編集ダイアログ"""
     
-    def __init__(self, correction: Dict[str, Any], students: List[Dict], 
-                 courses: List[Dict], parent=None):
+    def __init__(self, correction: Dict[str, Any], student_model: StudentListModel,
+                 course_model: CourseListModel, parent=None):
         super().__init__(parent)
         self.correction = correction
-        self.students = students
-        self.courses = courses
+        self.student_model = student_model
+        self.course_model = course_model
         self.setWindowTitle("訂正依頼編集")
         self.setMinimumWidth(500)
         self.setup_ui()
@@ -40,15 +41,12 @@ class EditDialog(QDialog):
         
         # 生徒選択
         self.student_combo = QComboBox()
-        for student in self.students:
-            display_text = f"{student['class_number']} {student['name']}"
-            self.student_combo.addItem(display_text, student['student_id'])
+        self.student_combo.setModel(self.student_model)
         form.addRow("生徒:", self.student_combo)
         
         # 講座選択
         self.course_combo = QComboBox()
-        for course in self.courses:
-            self.course_combo.addItem(course['course_name'], course['course_id'])
+        self.course_combo.setModel(self.course_model)
         form.addRow("講座:", self.course_combo)
         
         # 出欠訂正の場合
@@ -119,16 +117,12 @@ class EditDialog(QDialog):
     def load_data(self):
         """既存データをロード"""
         # 生徒選択
-        for i in range(self.student_combo.count()):
-            if self.student_combo.itemData(i) == self.correction['student_id']:
-                self.student_combo.setCurrentIndex(i)
-                break
+        self.student_combo.setCurrentIndex(
+            self.student_model.row_for_id(self.correction['student_id']))
         
         # 講座選択
-        for i in range(self.course_combo.count()):
-            if self.course_combo.itemData(i) == self.correction['course_id']:
-                self.course_combo.setCurrentIndex(i)
-                break
+        self.course_combo.setCurrentIndex(
+            self.course_model.row_for_id(self.correction['course_id']))
         
         # 出欠訂正の場合
         if self.correction['request_type'] == '出欠訂正':
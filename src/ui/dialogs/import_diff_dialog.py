@@ -0,0 +1,116 @@
+"""
+インポート差分の確認ダイアログ
+差分インポートで反映される変更を確認してから反映する
+"""
+from typing import Dict, Any
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QHeaderView, QAbstractItemView
+)
+
+from ..models.import_diff_model import ImportDiffModel
+
+
+class ImportDiffDialog(QDialog):
+    """インポート差分の確認ダイアログ"""
+
+    def __init__(self, title: str, diff: Dict[str, Any], labels: Dict[str, str], parent=None):
+        """
+        初期化
+
+        Args:
+            title: ウィンドウタイトル
+            diff: MasterController.diff_students/diff_courses の結果
+            labels: 列名 → 表示名
+        """
+        super().__init__(parent)
+        self.diff = diff
+        self.model = ImportDiffModel(diff, labels, self)
+        self.setWindowTitle(title)
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(500)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """UIをセットアップ"""
+        layout = QVBoxLayout()
+
+        diff = self.diff
+        summary = QLabel(
+            f"対象年度: {'・'.join(str(year) for year in diff['years'])}　"
+            f"追加: {len(diff['inserts'])}件　変更: {len(diff['updates'])}件　"
+            f"削除: {len(diff['deletes'])}件　変更なし: {diff['unchanged']}件"
+            + (f"　削除しない: {len(diff['kept'])}件" if diff['kept'] else "")
+            + (f"　エラー: {len(diff['errors'])}件" if diff['errors'] else "")
+        )
+        summary.setStyleSheet("font-size: 14px; font-weight: bold; padding: 10px;")
+        layout.addWidget(summary)
+
+        if diff['deletes']:
+            warning = QLabel("⚠️ 対象年度のうちファイルにない行は削除されます。内容を確認してください。")
+            warning.setStyleSheet("color: #d32f2f; padding: 0 10px;")
+            layout.addWidget(warning)
+
+        if diff['kept']:
+            kept = QLabel("ℹ️ ファイルにない行のうち、訂正依頼が参照している行は削除しません。")
+            kept.setStyleSheet("color: #1565C0; padding: 0 10px;")
+            layout.addWidget(kept)
+
+        table = QTableView()
+        table.setModel(self.model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.Interactive)
+        table.setColumnWidth(0, 70)
+        table.setColumnWidth(1, 150)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        layout.addWidget(table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        changes = len(diff['inserts']) + len(diff['updates']) + len(diff['deletes'])
+        apply_btn = QPushButton(f"反映する（{changes}件）")
+        apply_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+            QPushButton:disabled {
+                background-color: #9E9E9E;
+            }
+        """)
+        apply_btn.setEnabled(changes > 0)
+        apply_btn.clicked.connect(self.accept)
+        button_layout.addWidget(apply_btn)
+
+        cancel_btn = QPushButton("キャンセル")
+        cancel_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #da190b;
+            }
+        """)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
@@ -0,0 +1,134 @@
+"""
+インポートエラーの確認ダイアログ
+インポート前の検証でエラーになった行を表示し、エラーの行を除いてインポートするか選ぶ
+"""
+import csv
+from typing import List, Tuple
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton,
+    QLabel, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox
+)
+
+from ..models.import_error_model import ImportErrorModel
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ImportErrorDialog(QDialog):
+    """インポートエラーの確認ダイアログ"""
+
+    def __init__(self, title: str, count: int, errors: List[Tuple[int, str]], parent=None):
+        """
+        初期化
+
+        Args:
+            title: ウィンドウタイトル
+            count: インポートできる行の件数
+            errors: [(データの位置(0始まり), エラーメッセージ), ...]
+        """
+        super().__init__(parent)
+        self.count = count
+        self.errors = errors
+        self.model = ImportErrorModel(errors, self)
+        self.setWindowTitle(title)
+        self.setMinimumWidth(800)
+        self.setMinimumHeight(500)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """UIをセットアップ"""
+        layout = QVBoxLayout()
+
+        summary = QLabel(f"インポートできる行: {self.count}件　エラーの行: {len(self.errors)}件")
+        summary.setStyleSheet("font-size: 14px; font-weight: bold; padding: 10px;")
+        layout.addWidget(summary)
+
+        note = QLabel(
+            "まだデータは変更されていません。"
+            + ("エラーの行を除いてインポートできます。" if self.count else "正しい行がないためインポートできません。")
+        )
+        note.setStyleSheet("color: #d32f2f; padding: 0 10px;")
+        layout.addWidget(note)
+
+        table = QTableView()
+        table.setModel(self.model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Interactive)
+        table.setColumnWidth(0, 90)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(table)
+
+        button_layout = QHBoxLayout()
+
+        save_btn = QPushButton("💾 エラー一覧を保存")
+        save_btn.clicked.connect(self.save_errors)
+        button_layout.addWidget(save_btn)
+
+        button_layout.addStretch()
+
+        import_btn = QPushButton(f"エラーの行を除いてインポート（{self.count}件）")
+        import_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+            QPushButton:disabled {
+                background-color: #9E9E9E;
+            }
+        """)
+        import_btn.setEnabled(self.count > 0)
+        import_btn.clicked.connect(self.accept)
+        button_layout.addWidget(import_btn)
+
+        cancel_btn = QPushButton("キャンセル")
+        cancel_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 10px 20px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #da190b;
+            }
+        """)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def save_errors(self):
+        """エラー一覧をCSVに保存"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "エラー一覧を保存", "", "CSV Files (*.csv)"
+        )
+
+        if not file_path:
+            return
+
+        try:
+            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(ImportErrorModel.HEADERS)
+                for index, message in self.errors:
+                    writer.writerow([ImportErrorModel.line_number(index), message])
+            logger.info(f"インポートのエラー一覧を保存しました: {file_path}")
+
+        except Exception as e:
+            logger.error(f"エラー一覧の保存に失敗: {e}")
+            QMessageBox.critical(self, "エラー", f"エラー一覧の保存に失敗しました:\n{e}")
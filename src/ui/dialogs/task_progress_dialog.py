@@ -0,0 +1,99 @@
+"""
+処理の進捗ダイアログ
+インポート・エクスポートをバックグラウンドで実行し、進捗の表示とキャンセルを行う
+"""
+from typing import Callable
+
+from PySide6.QtWidgets import QProgressDialog, QMessageBox
+from PySide6.QtCore import Qt
+
+from ...utils.workers import Worker, run_in_background
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 進捗バーの目盛り数（バイト数・件数を割合で表示）
+PROGRESS_STEPS = 1000
+
+
+class TaskProgressDialog(QProgressDialog):
+    """
+    バックグラウンド処理の進捗ダイアログ
+
+    処理はワーカースレッドで行い、進捗はシグナルで受け取るため、実行中も画面は固まらない。
+    ダイアログはウィンドウモーダルのため、実行中に同じ画面から別の処理は始められない。
+    キャンセルすると処理が次に確認した時点で中断し、その旨を表示する。
+    """
+
+    def __init__(self, title: str, unchanged_note: str, parent=None):
+        """
+        初期化
+
+        Args:
+            title: 処理名（ダイアログ・メッセージに表示）
+            unchanged_note: 中断・失敗した時に添える説明（例: データは変更されていません）
+        """
+        super().__init__(f"{title}中...", "キャンセル", 0, PROGRESS_STEPS, parent)
+        self.title = title
+        self.unchanged_note = unchanged_note
+        self.worker = None
+        self.setWindowModality(Qt.WindowModal)
+        self.setWindowTitle(f"{title}中")
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setValue(0)
+
+    def start(self, fn: Callable, *args, on_result: Callable, count_rows: bool = False) -> Worker:
+        """
+        処理を開始
+
+        Args:
+            fn: ワーカースレッドで実行する関数（progress, should_cancel を受け取る。
+                count_rows の場合は rows_read も受け取る）
+            on_result: 結果を受け取る関数（GUIスレッドで呼ばれる）
+            count_rows: 進捗をバイト数で受け取り、読み込んだ行数を別に表示する場合True
+                （Falseの場合は進捗を件数として表示する）
+        """
+        def on_progress(done: int, total: int):
+            self.setValue(done * PROGRESS_STEPS // total if total else PROGRESS_STEPS)
+            if not count_rows:
+                self.setLabelText(f"{self.title}中... {done} / {total}件")
+
+        def on_rows_read(count: int):
+            self.setLabelText(f"{self.title}中... {count}行")
+
+        def on_success(result):
+            self.close()
+            try:
+                on_result(result)
+            except Exception as e:
+                # 結果の表示・画面の更新の失敗（処理自体は完了している）
+                logger.error(f"{self.title}の結果の処理に失敗: {e}", exc_info=True)
+                QMessageBox.critical(self.parentWidget(), "エラー",
+                    f"{self.title}は完了しましたが、結果の表示に失敗しました:\n{e}")
+
+        def on_error(message: str):
+            # close() で canceled が通知されるため、閉じる前に中断が要求されていたか確認する
+            cancelled = self.worker.is_cancelled()
+            self.close()
+            if cancelled:
+                logger.info(f"{self.title}を中断しました")
+                QMessageBox.information(self.parentWidget(), "中断",
+                    f"{self.title}を中断しました（{self.unchanged_note}）")
+                return
+            logger.error(f"{self.title}に失敗: {message}")
+            QMessageBox.critical(self.parentWidget(), "エラー",
+                f"{self.title}に失敗しました（{self.unchanged_note}）:\n{message}")
+
+        self.worker = run_in_background(
+            fn, *args,
+            on_result=on_success,
+            on_error=on_error,
+            on_finished=self.deleteLater,
+            on_progress=on_progress,
+            on_rows_read=on_rows_read if count_rows else None,
+            cancellable=True
+        )
+        self.canceled.connect(self.worker.cancel)
+        return self.worker
@@ -1,6 +1,7 @@
 """
 表示/編集ダイアログ
 訂正依頼の詳細表示と編集（ロック済みは編集不可）
+一度だけ作成し、bind() で表示する訂正依頼を差し替えて再利用する
 """
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
@@ -10,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 
 from ...config import ATTENDANCE_TYPES, GRADE_TYPES, SEMESTER_TYPES, PERIOD_TYPES
+from ..models.master_list_model import StudentListModel, CourseListModel
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,16 +20,41 @@ logger = get_logger(__name__)
 class ViewDialog(QDialog):
     """表示/編集ダイアログ"""
     
-    def __init__(self, correction, students, courses, parent=None):
+    def __init__(self, student_model, course_model, parent=None):
         super().__init__(parent)
-        self.correction = correction
-        self.students = students
-        self.courses = courses
-        self.is_locked = correction.get('is_locked', False)
+        self.correction = {}
+        self.student_model = student_model
+        self.course_model = course_model
+        # 現在の年度にない生徒・講座を表示する時だけ使う、このダイアログ専用のモデル
+        # （入力フォームと共有している student_model/course_model は変更しない）
+        self.other_student_model = StudentListModel(self)
+        self.other_course_model = CourseListModel(self)
+        self.is_locked = False
         
         self.setWindowTitle("訂正依頼詳細")
         self.resize(600, 700)
         self.setup_ui()
+    
+    def bind(self, correction):
+        """
+        表示する訂正依頼を設定
+        
+        Args:
+            correction: 訂正依頼データ（生徒名・講座名を結合済み）
+        """
+        self.correction = correction
+        self.is_locked = bool(correction.get('is_locked', False))
+        
+        # ロック状態を反映
+        self.lock_label.setText(f"🔒 ロック済み（{correction.get('locked_by') or ''}）")
+        self.lock_label.setVisible(self.is_locked)
+        self.save_btn.setVisible(not self.is_locked)
+        for widget in [self.student_combo, self.course_combo, self.date_edit,
+                       self.semester_combo, self.before_combo, self.after_combo,
+                       *self.period_checkboxes]:
+            widget.setEnabled(not self.is_locked)
+        self.reason_edit.setReadOnly(self.is_locked)
+        
         self.load_data()
     
     def setup_ui(self):
@@ -35,10 +62,10 @@ class ViewDialog(QDialog):
         layout = QVBoxLayout()
         
         # ロック状態表示
-        if self.is_locked:
-            lock_label = QLabel(f"🔒 ロック済み（{self.correction.get('locked_by', '')}）")
-            lock_label.setStyleSheet("background-color: #FFE4E1; padding: 10px; font-weight: bold;")
-            layout.addWidget(lock_label)
+        self.lock_label = QLabel()
+        self.lock_label.setStyleSheet("background-color: #FFE4E1; padding: 10px; font-weight: bold;")
+        self.lock_label.hide()
+        layout.addWidget(self.lock_label)
         
         # フォーム
         form_layout = QFormLayout()
@@ -49,23 +76,17 @@ class ViewDialog(QDialog):
         
         # 生徒選択
         self.student_combo = QComboBox()
-        self.student_combo.setEnabled(not self.is_locked)
-        for student in self.students:
-            display_text = f"{student['class_number']} {student['name']}"
-            self.student_combo.addItem(display_text, student['student_id'])
+        self.student_combo.setModel(self.student_model)
         form_layout.addRow("生徒:", self.student_combo)
         
         # 講座選択
         self.course_combo = QComboBox()
-        self.course_combo.setEnabled(not self.is_locked)
-        for course in self.courses:
-            self.course_combo.addItem(course['course_name'], course['course_id'])
+        self.course_combo.setModel(self.course_model)
         form_layout.addRow("講座:", self.course_combo)
         
         # 対象日付（出欠訂正の場合）
         self.date_edit = QDateEdit()
         self.date_edit.setCalendarPopup(True)
-        self.date_edit.setEnabled(not self.is_locked)
         self.date_widget = QGroupBox("対象日付")
         date_layout = QVBoxLayout()
         date_layout.addWidget(self.date_edit)
@@ -75,7 +96,6 @@ class ViewDialog(QDialog):
         # 学期（出欠訂正の場合）
         self.semester_combo = QComboBox()
         self.semester_combo.addItems(SEMESTER_TYPES)
-        self.semester_combo.setEnabled(not self.is_locked)
         self.semester_widget = QGroupBox("学期")
         semester_layout = QVBoxLayout()
         semester_layout.addWidget(self.semester_combo)
@@ -88,7 +108,6 @@ class ViewDialog(QDialog):
         period_layout = QHBoxLayout()
         for period in PERIOD_TYPES:
             cb = QCheckBox(period)
-            cb.setEnabled(not self.is_locked)
             self.period_checkboxes.append(cb)
             period_layout.addWidget(cb)
         period_widget.setLayout(period_layout)
@@ -97,17 +116,14 @@ class ViewDialog(QDialog):
         
         # 訂正前
         self.before_combo = QComboBox()
-        self.before_combo.setEnabled(not self.is_locked)
         form_layout.addRow("訂正前:", self.before_combo)
         
         # 訂正後
         self.after_combo = QComboBox()
-        self.after_combo.setEnabled(not self.is_locked)
         form_layout.addRow("訂正後:", self.after_combo)
         
         # 理由
         self.reason_edit = QTextEdit()
-        self.reason_edit.setReadOnly(self.is_locked)
         form_layout.addRow("理由:", self.reason_edit)
         
         # 依頼者
@@ -123,10 +139,9 @@ class ViewDialog(QDialog):
         # ボタン
         button_layout = QHBoxLayout()
         
-        if not self.is_locked:
-            save_btn = QPushButton("編集")
-            save_btn.clicked.connect(self.accept)
-            button_layout.addWidget(save_btn)
+        self.save_btn = QPushButton("編集")
+        self.save_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.save_btn)
         
         close_btn = QPushButton("閉じる")
         close_btn.clicked.connect(self.reject)
@@ -142,19 +157,28 @@ class ViewDialog(QDialog):
         request_type = self.correction['request_type']
         self.request_type_label.setText(request_type)
         
-        # 生徒
-        student_id = self.correction['student_id']
-        for i in range(self.student_combo.count()):
-            if self.student_combo.itemData(i) == student_id:
-                self.student_combo.setCurrentIndex(i)
-                break
+        # 生徒（現在の年度にない場合は訂正依頼の結合データから選択肢を作る）
+        self._select_record(self.student_combo, self.student_model, self.other_student_model, {
+            'student_id': self.correction['student_id'],
+            'class_number': self.correction.get('class_number') or '',
+            'name': self.correction.get('student_name') or self.correction['student_id'],
+            'name_kana': self.correction.get('name_kana')
+        })
         
         # 講座
-        course_id = self.correction['course_id']
-        for i in range(self.course_combo.count()):
-            if self.course_combo.itemData(i) == course_id:
-                self.course_combo.setCurrentIndex(i)
-                break
+        self._select_record(self.course_combo, self.course_model, self.other_course_model, {
+            'course_id': self.correction['course_id'],
+            'course_name': self.correction.get('course_name') or self.correction['course_id'],
+            'teacher_name': self.correction.get('teacher_name')
+        })
+        
+        # 前回表示した内容をリセット
+        self.before_combo.clear()
+        self.after_combo.clear()
+        self.date_edit.setDate(QDate.currentDate())
+        self.semester_combo.setCurrentIndex(0)
+        for cb in self.period_checkboxes:
+            cb.setChecked(False)
         
         # 出欠訂正の場合
         if request_type == "出欠訂正":
@@ -205,13 +229,30 @@ class ViewDialog(QDialog):
                 self.after_combo.setCurrentIndex(index)
         
         # 理由
-        self.reason_edit.setPlainText(self.correction.get('reason', ''))
+        self.reason_edit.setPlainText(self.correction.get('reason') or '')
         
         # 依頼者
-        self.requester_label.setText(self.correction.get('requester_name', ''))
+        self.requester_label.setText(self.correction.get('requester_name') or '')
         
         # 依頼日時
-        self.request_datetime_label.setText(self.correction.get('request_datetime', '')[:19])
+        self.request_datetime_label.setText((self.correction.get('request_datetime') or '')[:19])
+    
+    def _select_record(self, combo: QComboBox, shared_model, other_model, record):
+        """
+        コンボボックスで生徒・講座を選択
+        
+        共有のモデル（現在の年度）にあればそれを表示し、ない場合（他年度の訂正依頼）は
+        このダイアログ専用のモデルに1件だけ入れて表示する。
+        """
+        row = shared_model.row_for_id(record[shared_model.id_key])
+        if row < 0:
+            other_model.set_records([record])
+            model, row = other_model, 1
+        else:
+            model = shared_model
+        if combo.model() is not model:
+            combo.setModel(model)
+        combo.setCurrentIndex(row)
     
     def get_data(self):
         """入力データを取得"""
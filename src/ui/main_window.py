@@ -2,29 +2,35 @@
 メインウィンドウ v1.5.0
 """
 from PySide6.QtWidgets import (
-    QMainWindow, QTabWidget, QMessageBox, QStatusBar
+    QMainWindow, QTabWidget, QMessageBox, QStatusBar,
+    QWidget, QVBoxLayout, QLabel, QProgressBar
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QCloseEvent
 
 from .correction_tab import CorrectionTab
 from .notice_tab import NoticeTab
-from .admin_tab import AdminTab
-from .settings_tab import SettingsTab
 from .dialogs.password_dialog import PasswordDialog
 from ..database.db_manager import DatabaseManager
-from ..database.init_db import initialize_database
+from ..database.init_db import initialize_database, upgrade_database
 from ..controllers.correction_controller import CorrectionController
 from ..controllers.log_controller import LogController
 from ..controllers.auth_controller import AuthController
 from ..controllers.master_controller import MasterController
 from ..utils.backup_manager import BackupManager
+from ..utils.change_watcher import ChangeWatcher
+from ..utils.startup_profiler import startup_profiler
+from ..utils.stall_watchdog import StallWatchdog
+from ..utils.workers import run_in_background
 from ..config import APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, DB_PATH
 from ..utils.logger import get_logger
 from ..utils.system_info import get_user_identifier
 
 logger = get_logger(__name__)
 
+ADMIN_TAB_INDEX = 2
+ADMIN_TAB_LABEL = "🔧 システム部管理"
+
 
 class MainWindow(QMainWindow):
     """メインウィンドウ"""
@@ -33,19 +39,39 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         self.is_authenticated = False
+        self.backup_worker = None
+        
+        # 起動の段階ごとに所要時間を計測（最初の一覧の表示まで）
+        profiler = startup_profiler
         
-        self.init_database()
-        self.init_controllers()
-        self.load_app_title()
+        with profiler.phase('init_database'):
+            self.init_database()
+        with profiler.phase('init_controllers'):
+            self.init_controllers()
+        with profiler.phase('load_app_title'):
+            self.load_app_title()
         
         # 起動時に最大化
-        self.showMaximized()
+        with profiler.phase('show_window'):
+            self.showMaximized()
         
-        self.setup_ui()
-        self.setup_statusbar()
+        with profiler.phase('setup_ui'):
+            self.setup_ui()
+        with profiler.phase('setup_statusbar'):
+            self.setup_statusbar()
         
         # バックアップチェック
-        self.check_backup()
+        with profiler.phase('check_backup'):
+            self.check_backup()
+        
+        # 他PCの変更を監視
+        with profiler.phase('start_watcher'):
+            self.change_watcher.changed.connect(self.on_data_changed)
+            self.change_watcher.start()
+        
+        # 画面が応答しなくなった時にスタックを記録
+        self.stall_watchdog = StallWatchdog(self.db, parent=self)
+        self.stall_watchdog.start()
         
         logger.info(f"アプリケーション起動: {get_user_identifier()}")
     
@@ -55,6 +81,8 @@ class MainWindow(QMainWindow):
             if not DB_PATH.exists():
                 logger.info("データベースを新規作成します")
                 initialize_database(DB_PATH)
+            else:
+                upgrade_database(DB_PATH)
             
             self.db = DatabaseManager(DB_PATH)
             logger.info(f"データベース接続: {DB_PATH}")
@@ -79,6 +107,7 @@ class MainWindow(QMainWindow):
             self.db, self.log_controller
         )
         self.backup_manager = BackupManager()
+        self.change_watcher = ChangeWatcher(DB_PATH, parent=self)
     
     def load_app_title(self):
         """アプリタイトルを読み込み"""
@@ -97,22 +126,41 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.tabs.currentChanged.connect(self.on_tab_changed)
         
-        self.correction_tab = CorrectionTab(self.correction_controller)
+        self.active_year = self.auth_controller.get_active_year()
+        
+        self.correction_tab = CorrectionTab(
+            self.correction_controller,
+            self.master_controller,
+            self.change_watcher,
+            self.active_year
+        )
+        self.correction_tab.initial_data_loaded.connect(self.on_initial_data_loaded)
         self.tabs.addTab(self.correction_tab, "📝 訂正入力")
         
         self.notice_tab = NoticeTab(self.auth_controller)
         self.tabs.addTab(self.notice_tab, "📢 お知らせ")
         
-        self.admin_tab = AdminTab(
-            self.correction_controller,
-            self.log_controller,
-            self.master_controller,
-            self.backup_manager
-        )
-        self.tabs.addTab(self.admin_tab, "🔧 システム部管理")
+        # システム部管理タブは認証に成功した時に作成する（起動時は仮のタブ）
+        self.admin_tab = None
+        self.tabs.addTab(self._create_admin_placeholder(), ADMIN_TAB_LABEL)
         
         self.setCentralWidget(self.tabs)
     
+    def on_initial_data_loaded(self, elapsed_ms: float):
+        """最初の訂正依頼一覧が表示された時（起動時間の計測を終了）"""
+        startup_profiler.record('initial_data', elapsed_ms)
+        startup_profiler.finish(self.db)
+    
+    def _create_admin_placeholder(self) -> QWidget:
+        """認証前に表示する仮のシステム部管理タブ"""
+        widget = QWidget()
+        layout = QVBoxLayout()
+        label = QLabel("🔒 システム部管理を表示するにはパスワードが必要です")
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+        widget.setLayout(layout)
+        return widget
+    
     def setup_statusbar(self):
         """ステータスバーをセットアップ"""
         self.statusbar = QStatusBar()
@@ -120,9 +168,19 @@ class MainWindow(QMainWindow):
         
         user_info = get_user_identifier()
         self.statusbar.showMessage(f"ログイン: {user_info}")
+        
+        # バックアップの進捗（実行中のみ表示）
+        self.backup_label = QLabel("💾 バックアップ中")
+        self.backup_progress = QProgressBar()
+        self.backup_progress.setMaximumWidth(200)
+        self.backup_progress.setTextVisible(True)
+        self.statusbar.addPermanentWidget(self.backup_label)
+        self.statusbar.addPermanentWidget(self.backup_progress)
+        self.backup_label.setVisible(False)
+        self.backup_progress.setVisible(False)
     
     def check_backup(self):
-        """バックアップをチェック"""
+        """バックアップをチェック（作成はバックグラウンドで行い、起動を待たせない）"""
         try:
             # 起動回数を取得
             launch_count = int(self.auth_controller.get_setting('launch_count') or '0')
@@ -137,30 +195,62 @@ class MainWindow(QMainWindow):
             # バックアップ実行
             if launch_count % backup_interval == 0:
                 logger.info(f"バックアップを実行します（起動{launch_count}回目）")
-                backup_path = self.backup_manager.create_backup()
-                
-                if backup_path:
-                    self.statusbar.showMessage(f"バックアップを作成しました: {backup_path.name}", 5000)
-                    
-                    # 古いバックアップを削除
-                    self.backup_manager.cleanup_old_backups(keep_count=10)
-                else:
-                    logger.warning("バックアップの作成に失敗しました")
+                self.start_backup()
         
         except Exception as e:
             logger.error(f"バックアップチェックに失敗: {e}")
     
+    def _run_backup(self, progress=None, should_cancel=None):
+        """バックアップを作成し、古いバックアップを削除（ワーカースレッド）"""
+        backup_path = self.backup_manager.create_backup(progress=progress, should_cancel=should_cancel)
+        if backup_path:
+            self.backup_manager.cleanup_old_backups(keep_count=10)
+        return backup_path
+    
+    def start_backup(self):
+        """バックアップをバックグラウンドで開始"""
+        if self.backup_worker is not None and not self.backup_worker.is_done():
+            return
+        
+        self.backup_progress.setRange(0, 0)  # 全体の大きさが分かるまでは不定表示
+        self.backup_label.setVisible(True)
+        self.backup_progress.setVisible(True)
+        
+        self.backup_worker = run_in_background(
+            self._run_backup,
+            on_result=self.on_backup_finished,
+            on_finished=self.on_backup_done,
+            on_progress=self.on_backup_progress,
+            cancellable=True
+        )
+    
+    def on_backup_progress(self, done: int, total: int):
+        """バックアップの進捗（ページ数）"""
+        self.backup_progress.setRange(0, total)
+        self.backup_progress.setValue(done)
+    
+    def on_backup_finished(self, backup_path):
+        """バックアップが終了した（中断・失敗時はNone）"""
+        if backup_path:
+            self.statusbar.showMessage(f"バックアップを作成しました: {backup_path.name}", 5000)
+        elif not self.backup_worker.is_cancelled():
+            logger.warning("バックアップの作成に失敗しました")
+    
+    def on_backup_done(self):
+        """バックアップの進捗表示を閉じる"""
+        self.backup_label.setVisible(False)
+        self.backup_progress.setVisible(False)
+    
     def on_tab_changed(self, index: int):
         """タブが変更された時"""
-        if index == 2:  # システム部管理タブ
+        if index == ADMIN_TAB_INDEX:
             if not self.is_authenticated:
                 self.tabs.blockSignals(True)
                 self.tabs.setCurrentIndex(0)
                 self.tabs.blockSignals(False)
                 
                 if self.authenticate_admin():
-                    self.tabs.setCurrentIndex(2)
-                    self.setup_settings_tab()
+                    self.tabs.setCurrentIndex(ADMIN_TAB_INDEX)
     
     def authenticate_admin(self) -> bool:
         """管理者認証"""
@@ -175,6 +265,7 @@ class MainWindow(QMainWindow):
                 self.is_authenticated = True
                 self.statusbar.showMessage("管理者モード", 3000)
                 
+                self.create_admin_tab()
                 self.admin_tab.load_data()
                 
                 return True
@@ -188,15 +279,45 @@ class MainWindow(QMainWindow):
         
         return False
     
-    def setup_settings_tab(self):
-        """設定タブをセットアップ"""
-        if not hasattr(self.admin_tab, 'settings_tab_added'):
-            settings_tab = SettingsTab(self.auth_controller, self.backup_manager)
-            settings_tab.title_changed.connect(self.on_title_changed)
-            settings_tab.notice_changed.connect(self.on_notice_changed)
-            
-            self.admin_tab.tabs.addTab(settings_tab, "⚙️ 設定")
-            self.admin_tab.settings_tab_added = True
+    def create_admin_tab(self):
+        """
+        システム部管理タブと設定タブを作成し、仮のタブと置き換える（初回のみ）
+        
+        管理画面は大半の利用者が開かないため、モジュールの読み込みも含めてここで行う
+        """
+        if self.admin_tab is not None:
+            return
+        
+        from .admin_tab import AdminTab
+        from .settings_tab import SettingsTab
+        
+        self.admin_tab = AdminTab(
+            self.correction_controller,
+            self.log_controller,
+            self.master_controller,
+            self.backup_manager,
+            self.active_year
+        )
+        
+        settings_tab = SettingsTab(self.auth_controller, self.backup_manager)
+        settings_tab.title_changed.connect(self.on_title_changed)
+        settings_tab.notice_changed.connect(self.on_notice_changed)
+        settings_tab.active_year_changed.connect(self.on_active_year_changed)
+        self.admin_tab.tabs.addTab(settings_tab, "⚙️ 設定")
+        
+        placeholder = self.tabs.widget(ADMIN_TAB_INDEX)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(ADMIN_TAB_INDEX)
+        self.tabs.insertTab(ADMIN_TAB_INDEX, self.admin_tab, ADMIN_TAB_LABEL)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        
+        logger.info("システム部管理タブを作成しました")
+    
+    def on_data_changed(self):
+        """他PCでデータが変更された時"""
+        if self.admin_tab is not None:
+            self.admin_tab.refresh_correction_list()
     
     def on_title_changed(self, new_title: str):
         """タイトル変更時"""
@@ -206,6 +327,23 @@ class MainWindow(QMainWindow):
         """お知らせ変更時"""
         self.notice_tab.load_notice()
     
+    def on_active_year_changed(self, year: int):
+        """年度変更時"""
+        self.active_year = year
+        self.correction_tab.set_active_year(year)
+        if self.admin_tab is not None:
+            self.admin_tab.set_active_year(year)
+    
+    def cancel_backup(self):
+        """実行中のバックアップを中断し、作成途中のファイルが削除されるまで待つ"""
+        if self.backup_worker is None or self.backup_worker.is_done():
+            return
+        
+        logger.info("終了のため実行中のバックアップを中断します")
+        self.backup_worker.cancel()
+        if not self.backup_worker.wait(10):
+            logger.warning("バックアップの中断を待てませんでした")
+    
     def closeEvent(self, event: QCloseEvent):
         """ウィンドウを閉じる時"""
         reply = QMessageBox.question(
@@ -217,6 +355,9 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             logger.info("アプリケーション終了")
+            self.change_watcher.stop()
+            self.cancel_backup()
+            self.stall_watchdog.stop()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,123 @@
+"""
+一括確認モデル
+登録前の訂正依頼を1件1行で表示し、行ごとに登録する・しないを選べるモデル
+"""
+from typing import List, Dict, Any
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QColor
+
+from ...config import REQUEST_TYPES, COLOR_ATTENDANCE, COLOR_GRADE
+
+
+class BatchReviewModel(QAbstractTableModel):
+    """登録前の訂正依頼の確認用テーブルモデル（先頭列がチェックボックス）"""
+
+    HEADERS = ["登録", "種別", "生徒", "講座", "日付・学期", "校時", "訂正内容", "理由"]
+
+    included_changed = Signal(int)
+
+    def __init__(self, corrections: List[Dict[str, Any]], parent=None):
+        super().__init__(parent)
+        self._corrections = corrections
+        self._included = [True] * len(corrections)
+        self._attendance_color = QColor(COLOR_ATTENDANCE)
+        self._grade_color = QColor(COLOR_GRADE)
+
+    def included_count(self) -> int:
+        """登録する件数"""
+        return sum(self._included)
+
+    def included_corrections(self) -> List[Dict[str, Any]]:
+        """登録する訂正依頼（表示順）"""
+        return [c for c, included in zip(self._corrections, self._included) if included]
+
+    def set_all_included(self, included: bool):
+        """全ての行を登録する・しないに変更"""
+        self._included = [included] * len(self._corrections)
+        if self._corrections:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._corrections) - 1, 0))
+        self.included_changed.emit(self.included_count())
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._corrections)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.HEADERS[section]
+            return str(section + 1)
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        correction = self._corrections[index.row()]
+        column = index.column()
+
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._included[index.row()] else Qt.Unchecked
+            return None
+
+        if role == Qt.DisplayRole:
+            return self._display_text(correction, column)
+
+        if role == Qt.ToolTipRole and column == 7:
+            return correction.get('reason')
+
+        if role == Qt.BackgroundRole and column == 1:
+            if correction['request_type'] == REQUEST_TYPES['ATTENDANCE']:
+                return self._attendance_color
+            return self._grade_color
+
+        if role == Qt.ForegroundRole and not self._included[index.row()]:
+            return QColor(Qt.gray)
+
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        row = index.row()
+        self._included[row] = Qt.CheckState(value) == Qt.Checked
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        self.included_changed.emit(self.included_count())
+        return True
+
+    def _display_text(self, correction: Dict[str, Any], column: int) -> str:
+        """列の表示文字列"""
+        if column == 1:
+            return correction['request_type']
+        if column == 2:
+            class_number = correction.get('class_number')
+            name = correction.get('student_name') or '不明'
+            return f"{class_number}：{name}" if class_number else name
+        if column == 3:
+            return correction.get('course_name') or '不明'
+        if column == 4:
+            parts = [correction.get('target_date'), correction.get('semester')]
+            return " / ".join(p for p in parts if p)
+        if column == 5:
+            periods = correction.get('periods')
+            return ','.join(f"{p}限" for p in periods.split(',')) if periods else ''
+        if column == 6:
+            if correction.get('before_value'):
+                return f"{correction['before_value']} → {correction['after_value']}"
+            return correction['after_value']
+        if column == 7:
+            # 改行を含む理由は1行にまとめて表示（全文はツールチップ）
+            return " ".join((correction.get('reason') or '').split())
+        return ""
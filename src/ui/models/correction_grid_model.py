@@ -0,0 +1,419 @@
+"""
+訂正一括入力モデル
+表形式で訂正を入力するための編集可能なテーブルモデル（1行が1件の訂正）
+"""
+import csv
+import io
+import re
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from ...config import (
+    REQUEST_TYPES, ATTENDANCE_TYPES, SEMESTER_TYPES, PERIOD_TYPES,
+    COLOR_ATTENDANCE, COLOR_GRADE
+)
+from .master_list_model import StudentListModel, CourseListModel
+
+COLOR_ERROR = "#FFCDD2"
+COLOR_DISABLED = "#EEEEEE"
+
+# 種別として受け付ける省略形（それ以外は種別の名前と完全に一致する場合だけ受け付ける）
+REQUEST_TYPE_ALIASES = {
+    "出欠": REQUEST_TYPES['ATTENDANCE'],
+    "評価": REQUEST_TYPES['GRADE'],
+}
+
+# 日付として受け付ける形式（2024-05-01, 2024/5/1, 2024.5.1, 2024年5月1日）
+DATE_PATTERN = re.compile(r'^(\d{4})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})\s*日?$')
+
+
+class CorrectionGridModel(QAbstractTableModel):
+    """
+    訂正一括入力のテーブルモデル
+
+    行は入力フォームの get_data() と同じキーを持つ辞書で保持し、
+    生徒・講座はIDで持って表示時に共有モデルから表示用文字列を引く。
+    ウィジェットはビューが表示中のセルと編集中のエディタだけなので、
+    行数が増えても画面のコストは変わらない。
+    """
+
+    HEADERS = ["種別", "生徒", "講座", "対象日付", "学期", "校時", "訂正前", "訂正後", "理由"]
+    KEYS = [
+        'request_type', 'student_id', 'course_id', 'target_date', 'semester',
+        'periods', 'before_value', 'after_value', 'reason'
+    ]
+    (TYPE, STUDENT, COURSE, DATE, SEMESTER,
+     PERIODS, BEFORE, AFTER, REASON) = range(len(HEADERS))
+
+    # 出欠訂正でのみ使う列
+    ATTENDANCE_ONLY = (DATE, PERIODS)
+
+    def __init__(self, student_model: StudentListModel, course_model: CourseListModel, parent=None):
+        super().__init__(parent)
+        self.student_model = student_model
+        self.course_model = course_model
+        self._rows: List[Dict[str, Any]] = []
+        self._errors: Dict[int, int] = {}
+        self._attendance_color = QColor(COLOR_ATTENDANCE)
+        self._grade_color = QColor(COLOR_GRADE)
+        self._error_color = QColor(COLOR_ERROR)
+        self._disabled_color = QColor(COLOR_DISABLED)
+
+        # 年度の切り替えで選択肢が変わったら生徒・講座の列を再描画
+        student_model.modelReset.connect(lambda: self._column_changed(self.STUDENT))
+        course_model.modelReset.connect(lambda: self._column_changed(self.COURSE))
+
+    def new_row(self, base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        新しい行（入力フォームの初期値と同じ）
+
+        Args:
+            base: 値を引き継ぐ行（複製用）
+        """
+        if base is not None:
+            return dict(base)
+        return {
+            'request_type': REQUEST_TYPES['ATTENDANCE'],
+            'student_id': None,
+            'course_id': None,
+            'target_date': date.today().isoformat(),
+            'semester': SEMESTER_TYPES[0],
+            'periods': None,
+            'before_value': ATTENDANCE_TYPES[0],
+            'after_value': ATTENDANCE_TYPES[0],
+            'reason': ''
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """保持している行"""
+        return self._rows
+
+    def is_attendance(self, row: int) -> bool:
+        """出欠訂正の行か"""
+        return self._rows[row]['request_type'] == REQUEST_TYPES['ATTENDANCE']
+
+    def is_blank(self, row: int) -> bool:
+        """生徒・講座・理由のどれも入力されていない行か（登録時に無視する）"""
+        values = self._rows[row]
+        return not values['student_id'] and not values['course_id'] and not values['reason']
+
+    # ---- 行の追加・削除 ----
+
+    def append_rows(self, count: int = 1, base: Optional[Dict[str, Any]] = None):
+        """
+        末尾に行を追加
+
+        Args:
+            count: 追加する行数
+            base: 値を引き継ぐ行（Noneの場合は初期値）
+        """
+        if count <= 0:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self._rows.extend(self.new_row(base) for _ in range(count))
+        self.endInsertRows()
+
+    def remove_rows(self, rows: List[int]):
+        """
+        行を削除
+
+        Args:
+            rows: 削除する行番号
+        """
+        # 連続した範囲ごとに後ろから削除する（行ごとに通知しない）
+        remaining = sorted(set(rows), reverse=True)
+        while remaining:
+            last = first = remaining.pop(0)
+            while remaining and remaining[0] == first - 1:
+                first = remaining.pop(0)
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+        self._errors = {}
+
+    def clear(self, count: int = 1):
+        """
+        全ての行を初期値の行に置き換え
+
+        Args:
+            count: 残す行数
+        """
+        self.beginResetModel()
+        self._rows = [self.new_row() for _ in range(count)]
+        self._errors = {}
+        self.endResetModel()
+
+    # ---- 値の変換 ----
+
+    def parse_value(self, column: int, value: Any) -> Tuple[bool, Any]:
+        """
+        入力・貼り付けされた値を行に保持する値に変換
+
+        Args:
+            column: 列番号
+            value: 入力値（生徒・講座はIDまたは文字列、それ以外は文字列）
+
+        Returns:
+            (変換できたか, 変換後の値)
+        """
+        text = '' if value is None else str(value).strip()
+
+        if column == self.TYPE:
+            if text in REQUEST_TYPES.values():
+                return True, text
+            request_type = REQUEST_TYPE_ALIASES.get(text)
+            return request_type is not None, request_type
+
+        if column in (self.STUDENT, self.COURSE):
+            if not text:
+                return True, None
+            master = self.student_model if column == self.STUDENT else self.course_model
+            if master.row_for_id(value) >= 0:
+                return True, value
+            record_id = master.find_id(text)
+            return record_id is not None, record_id
+
+        if column == self.DATE:
+            match = DATE_PATTERN.match(text)
+            if not match:
+                return False, None
+            try:
+                return True, date(*(int(g) for g in match.groups())).isoformat()
+            except ValueError:
+                return False, None
+
+        if column == self.SEMESTER:
+            return text in SEMESTER_TYPES, text
+
+        if column == self.PERIODS:
+            # 「1,2」「1限 2限」「１・２」などから校時の番号を取り出す
+            numbers = re.findall(r'\d+', text)
+            periods = sorted({int(n) for n in numbers})
+            if any(p < 1 or p > len(PERIOD_TYPES) for p in periods):
+                return False, None
+            return True, ','.join(str(p) for p in periods) or None
+
+        return True, text
+
+    def display_text(self, row: int, column: int) -> str:
+        """セルの表示文字列"""
+        values = self._rows[row]
+        value = values[self.KEYS[column]]
+
+        if column in self.ATTENDANCE_ONLY and not self.is_attendance(row):
+            return ''
+
+        if column in (self.STUDENT, self.COURSE):
+            if not value:
+                return ''
+            master = self.student_model if column == self.STUDENT else self.course_model
+            record = master.record_for_id(value)
+            return master.display_text(record) if record else f"（{value}）"
+
+        if column == self.PERIODS and value:
+            return ','.join(f"{p}限" for p in value.split(','))
+
+        return '' if value is None else str(value)
+
+    # ---- QAbstractTableModel ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.HEADERS[section]
+            return str(section + 1)
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in self.ATTENDANCE_ONLY and not self.is_attendance(index.row()):
+            return flags
+        return flags | Qt.ItemIsEditable
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            return self.display_text(row, column)
+
+        if role == Qt.EditRole:
+            return self._rows[row][self.KEYS[column]]
+
+        if role == Qt.BackgroundRole:
+            if self._errors.get(row) == column:
+                return self._error_color
+            if column in self.ATTENDANCE_ONLY and not self.is_attendance(row):
+                return self._disabled_color
+            if column == self.TYPE:
+                return self._attendance_color if self.is_attendance(row) else self._grade_color
+
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+
+        ok, parsed = self.parse_value(index.column(), value)
+        if not ok:
+            return False
+
+        row = index.row()
+        if self._set_value(row, index.column(), parsed):
+            self._errors.pop(row, None)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        return True
+
+    def _set_value(self, row: int, column: int, value: Any) -> bool:
+        """
+        行の値を変更（通知はしない）
+
+        種別を変更した場合は訂正前/後を新しい種別の初期値に戻す。
+
+        Returns:
+            値が変わったか
+        """
+        values = self._rows[row]
+        key = self.KEYS[column]
+        if values[key] == value:
+            return False
+
+        values[key] = value
+        if column == self.TYPE:
+            initial = ATTENDANCE_TYPES[0] if value == REQUEST_TYPES['ATTENDANCE'] else ''
+            values['before_value'] = initial
+            values['after_value'] = initial
+        return True
+
+    def _column_changed(self, column: int):
+        """列全体の再描画を通知"""
+        if self._rows:
+            self.dataChanged.emit(self.index(0, column), self.index(len(self._rows) - 1, column))
+
+    # ---- 貼り付け ----
+
+    def paste_text(self, text: str, top: int, left: int) -> List[str]:
+        """
+        Excelなどからコピーしたタブ区切りの表を貼り付け
+
+        足りない行は末尾に追加し、変更の通知は最後に1度だけ行う。
+        変換できないセル・必須の値が空のセルは元の値のままにする。
+
+        Args:
+            text: タブ区切りの文字列（改行を含むセルは "" で囲まれた形式）
+            top: 貼り付け先の先頭行
+            left: 貼り付け先の先頭列
+
+        Returns:
+            変換できなかったセルの説明のリスト
+        """
+        table = self.parse_tsv(text)
+        if not table:
+            return []
+
+        needed = top + len(table) - len(self._rows)
+        if needed > 0:
+            self.append_rows(needed)
+
+        errors = []
+        for r, cells in enumerate(table):
+            row = top + r
+            for c, cell in enumerate(cells):
+                column = left + c
+                if column >= len(self.HEADERS):
+                    break
+                ok, parsed = self.parse_value(column, cell)
+                if not ok:
+                    # 空のセル（評価評定変更の対象日付など）は元の値のままにする
+                    if not cell.strip():
+                        continue
+                    errors.append(f"{row + 1}行目 {self.HEADERS[column]}: 「{cell}」")
+                    continue
+                self._set_value(row, column, parsed)
+            self._errors.pop(row, None)
+
+        self.dataChanged.emit(
+            self.index(top, 0),
+            self.index(top + len(table) - 1, len(self.HEADERS) - 1)
+        )
+        return errors
+
+    @staticmethod
+    def parse_tsv(text: str) -> List[List[str]]:
+        """タブ区切りの文字列を表に変換（末尾の空行は除く）"""
+        table = list(csv.reader(io.StringIO(text), delimiter='\t'))
+        while table and not any(cell.strip() for cell in table[-1]):
+            table.pop()
+        return table
+
+    # ---- 検証 ----
+
+    def validate_row(self, row: int) -> Tuple[bool, str, int]:
+        """
+        行の入力内容を検証（入力フォームの validate() と同じ規則）
+
+        Returns:
+            (正しいか, エラーメッセージ, エラーの列)
+        """
+        values = self._rows[row]
+
+        if not values['student_id']:
+            return False, "生徒を選択してください", self.STUDENT
+
+        if not values['course_id']:
+            return False, "講座を選択してください", self.COURSE
+
+        if not values['reason']:
+            return False, "理由を入力してください", self.REASON
+
+        if self.is_attendance(row):
+            if values['periods'] and len(values['periods'].split(',')) > 2:
+                return False, "校時は最大2つまで選択できます", self.PERIODS
+            for column in (self.BEFORE, self.AFTER):
+                if values[self.KEYS[column]] not in ATTENDANCE_TYPES:
+                    return False, f"{self.HEADERS[column]}の値を選択してください", column
+        else:
+            if not values['after_value']:
+                return False, "訂正後の値を入力してください", self.AFTER
+
+        return True, "", -1
+
+    def mark_error(self, row: int, column: int):
+        """エラーのセルを強調表示（その行を編集すると解除）"""
+        self._errors[row] = column
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+
+    def correction_data(self, row: int, requester: str) -> Dict[str, Any]:
+        """行を入力フォームの get_data() と同じ形式の辞書に変換"""
+        values = self._rows[row]
+        data = {
+            'request_type': values['request_type'],
+            'requester': requester,
+            'student_id': values['student_id'],
+            'course_id': values['course_id'],
+            'reason': values['reason'],
+            'semester': values['semester'],
+            'before_value': values['before_value'],
+            'after_value': values['after_value']
+        }
+        if self.is_attendance(row):
+            data.update({
+                'target_date': values['target_date'],
+                'periods': values['periods']
+            })
+        return data
@@ -0,0 +1,188 @@
+"""
+訂正依頼一覧モデル
+QTableViewが表示中の行だけを問い合わせるため、件数が増えても描画コストは一定
+"""
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor
+
+from ...config import COLOR_ATTENDANCE, COLOR_GRADE
+
+
+class CorrectionTableModel(QAbstractTableModel):
+    """訂正依頼一覧のテーブルモデル"""
+
+    HEADERS = ["ID", "種別", "生徒名", "講座名", "日時・学期", "訂正内容", "ロック"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._corrections: List[Dict[str, Any]] = []
+        self._search_keys: List[str] = []
+        self._rows: Dict[int, int] = {}
+        self._attendance_color = QColor(COLOR_ATTENDANCE)
+        self._grade_color = QColor(COLOR_GRADE)
+
+    def set_corrections(self, corrections: List[Dict[str, Any]]):
+        """
+        訂正依頼を差し替え
+
+        Args:
+            corrections: 訂正依頼のリスト
+        """
+        self.beginResetModel()
+        self._corrections = corrections
+        # 検索フィルタ用（生徒名・ふりがな・講座名）を小文字化して1度だけ作る
+        self._search_keys = [
+            f"{c.get('student_name') or ''}\n{c.get('name_kana') or ''}\n"
+            f"{c.get('course_name') or ''}".lower()
+            for c in corrections
+        ]
+        self._rows = {c['correction_id']: i for i, c in enumerate(corrections)}
+        self.endResetModel()
+
+    def corrections(self) -> List[Dict[str, Any]]:
+        """保持している訂正依頼"""
+        return self._corrections
+
+    def correction_at(self, row: int) -> Dict[str, Any]:
+        """行の訂正依頼"""
+        return self._corrections[row]
+
+    def search_keys(self) -> List[str]:
+        """全行の検索用文字列（小文字化済み、再読み込み時は別のリストに差し替わる）"""
+        return self._search_keys
+
+    def row_for_id(self, correction_id: int) -> Optional[int]:
+        """訂正依頼IDに対応する行番号"""
+        return self._rows.get(correction_id)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._corrections)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        correction = self._corrections[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            return self._display_text(correction, column)
+
+        if role == Qt.BackgroundRole and column == 1:
+            if correction['request_type'] == '出欠訂正':
+                return self._attendance_color
+            return self._grade_color
+
+        if role == Qt.UserRole:
+            return correction['correction_id']
+
+        return None
+
+    def _display_text(self, correction: Dict[str, Any], column: int) -> str:
+        """列の表示文字列"""
+        if column == 0:
+            return str(correction['correction_id'])
+        if column == 1:
+            return correction['request_type']
+        if column == 2:
+            return correction.get('student_name') or ''
+        if column == 3:
+            return correction.get('course_name') or ''
+        if column == 4:
+            parts = [correction.get('target_date'), correction.get('semester')]
+            return " / ".join(p for p in parts if p)
+        if column == 5:
+            if correction.get('before_value'):
+                return f"{correction['before_value']} → {correction['after_value']}"
+            return correction['after_value']
+        if column == 6:
+            return "🔒" if correction['is_locked'] else ""
+        return ""
+
+
+def match_search_keys(
+    corrections: List[Dict[str, Any]],
+    search_keys: List[str],
+    search_text: str,
+    candidates: Optional[Sequence[int]] = None
+) -> Tuple[List[int], Set[int]]:
+    """
+    検索文字列を含む行を求める（GUIスレッド以外から呼んでよい）
+    
+    Args:
+        corrections: 訂正依頼のリスト
+        search_keys: 各行の検索用文字列（小文字化済み）
+        search_text: 検索文字列
+        candidates: 調べる行番号（前回の検索結果を絞り込む場合）
+    
+    Returns:
+        (一致した行番号のリスト, 一致した訂正依頼IDの集合)
+    """
+    text = search_text.lower()
+    if candidates is None:
+        candidates = range(len(search_keys))
+    rows = [r for r in candidates if text in search_keys[r]]
+    return rows, {corrections[r]['correction_id'] for r in rows}
+
+
+class CorrectionFilterProxyModel(QSortFilterProxyModel):
+    """種別・ロック状態・検索結果で絞り込むプロキシ"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matched_ids: Optional[Set[int]] = None
+        self._request_type = None
+        self._is_locked = None
+
+    def set_filters(self, request_type: Optional[str] = None, is_locked: Optional[bool] = None):
+        """
+        フィルタ条件を設定
+
+        Args:
+            request_type: 種別（Noneの場合は全て）
+            is_locked: ロック状態（Noneの場合は全て）
+        """
+        # invalidateFilter()は飛び飛びの行ごとに行削除・挿入を通知するため
+        # 件数が多いと非常に遅い。リセットして対応表を作り直す方が速い
+        self.beginResetModel()
+        self._request_type = request_type
+        self._is_locked = is_locked
+        self.endResetModel()
+
+    def set_matched_ids(self, matched_ids: Optional[Set[int]]):
+        """
+        検索結果を設定
+
+        行番号ではなくIDで持つため、再読み込みの後も新しい検索結果が届くまで
+        直前の結果で絞り込んだ表示を続けられる
+
+        Args:
+            matched_ids: 検索に一致した訂正依頼ID（Noneの場合は絞り込まない）
+        """
+        self.beginResetModel()
+        self._matched_ids = matched_ids
+        self.endResetModel()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        correction = self.sourceModel().correction_at(source_row)
+
+        if self._request_type and correction['request_type'] != self._request_type:
+            return False
+
+        if self._is_locked is not None and bool(correction['is_locked']) != self._is_locked:
+            return False
+
+        if self._matched_ids is not None and correction['correction_id'] not in self._matched_ids:
+            return False
+
+        return True
@@ -0,0 +1,84 @@
+"""
+インポート差分モデル
+差分インポートで追加・変更・削除される行と、削除せずに残す行・除外されるエラー行を一覧表示するモデル
+"""
+from typing import List, Dict, Any
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+COLOR_INSERT = "#E8F5E9"
+COLOR_UPDATE = "#FFF8E1"
+COLOR_DELETE = "#FFEBEE"
+COLOR_KEPT = "#E3F2FD"
+COLOR_ERROR = "#EEEEEE"
+
+
+class ImportDiffModel(QAbstractTableModel):
+    """差分インポートの確認用テーブルモデル（1行が1件の変更）"""
+
+    HEADERS = ["操作", "ID", "内容"]
+
+    def __init__(self, diff: Dict[str, Any], labels: Dict[str, str], parent=None):
+        """
+        初期化
+
+        Args:
+            diff: MasterController.diff_students/diff_courses の結果
+            labels: 列名 → 表示名
+        """
+        super().__init__(parent)
+        self._colors = {
+            "追加": QColor(COLOR_INSERT),
+            "変更": QColor(COLOR_UPDATE),
+            "削除": QColor(COLOR_DELETE),
+            "残す": QColor(COLOR_KEPT),
+            "エラー": QColor(COLOR_ERROR),
+        }
+        # 表示文字列は行ごとに1度だけ作る
+        self._rows: List[tuple] = []
+        columns = diff['columns']
+        names = [labels.get(c, c) for c in columns]
+
+        def describe(params: tuple) -> str:
+            return " / ".join(f"{name}: {value}" for name, value in zip(names[1:], params[1:]))
+
+        for params in diff['inserts']:
+            self._rows.append(("追加", str(params[0]), describe(params)))
+        for before, after in diff['updates']:
+            changes = [
+                f"{name}: {old} → {new}"
+                for name, old, new in zip(names[1:], before[1:], after[1:])
+                if old != new
+            ]
+            self._rows.append(("変更", str(after[0]), " / ".join(changes)))
+        for params in diff['deletes']:
+            self._rows.append(("削除", str(params[0]), describe(params)))
+        for params, references in diff['kept']:
+            self._rows.append(
+                ("残す", str(params[0]), f"訂正依頼{references}件が参照しているため削除しません / {describe(params)}")
+            )
+        for index, error in diff['errors']:
+            # CSVの行番号（1行目はタイトル行）で表示する
+            self._rows.append(("エラー", f"{index + 2}行目", f"{error}（インポートしません）"))
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return row[index.column()]
+        if role == Qt.BackgroundRole and index.column() == 0:
+            return self._colors[row[0]]
+        return None
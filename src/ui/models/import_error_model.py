@@ -0,0 +1,47 @@
+"""
+インポートエラーモデル
+インポート前の検証でエラーになった行を一覧表示するモデル
+"""
+from typing import List, Tuple
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class ImportErrorModel(QAbstractTableModel):
+    """インポートのエラー一覧のテーブルモデル（1行が1件のエラー）"""
+
+    HEADERS = ["行", "エラー内容"]
+
+    def __init__(self, errors: List[Tuple[int, str]], parent=None):
+        """
+        初期化
+
+        Args:
+            errors: [(データの位置(0始まり), エラーメッセージ), ...]
+        """
+        super().__init__(parent)
+        self._errors = errors
+
+    @staticmethod
+    def line_number(index: int) -> int:
+        """データの位置をCSVの行番号に変換（1行目はタイトル行）"""
+        return index + 2
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._errors)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        position, message = self._errors[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return f"{self.line_number(position)}行目" if index.column() == 0 else message
+        return None
@@ -0,0 +1,178 @@
+"""
+マスタデータ選択肢モデル
+生徒・講座のコンボボックスとオートコンプリートで共有するモデル
+"""
+from typing import List, Dict, Any, Optional
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtWidgets import QCompleter
+
+
+class MasterListModel(QAbstractListModel):
+    """
+    マスタデータの選択肢モデル（全コンボボックスで1つを共有する）
+    
+    先頭行は未選択を表す空行。Qt.UserRole でID、SearchRole で検索用文字列を返す。
+    """
+    
+    SearchRole = Qt.UserRole + 1
+    id_key = ''
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records: List[Dict[str, Any]] = []
+        self._display: List[str] = []
+        self._search: List[str] = []
+        self._rows: Dict[Any, int] = {}
+        self._lookup: Dict[str, Any] = {}
+    
+    def display_text(self, record: Dict[str, Any]) -> str:
+        """表示用文字列（既定はID。生徒・講座のモデルで上書きする）"""
+        return str(record.get(self.id_key, ''))
+    
+    def search_text(self, record: Dict[str, Any]) -> str:
+        """検索用文字列"""
+        return self.display_text(record)
+    
+    def lookup_texts(self, record: Dict[str, Any]) -> List[str]:
+        """貼り付けた文字列からIDを引くための文字列（表示用文字列とID）"""
+        return [self.display_text(record), str(record[self.id_key])]
+    
+    def _add_lookup(self, record: Dict[str, Any]):
+        """逆引き表に追加（同じ文字列が複数のIDに当たる場合はNoneにして曖昧とする）"""
+        record_id = record[self.id_key]
+        for text in self.lookup_texts(record):
+            text = str(text).strip()
+            if not text:
+                continue
+            if text in self._lookup and self._lookup[text] != record_id:
+                self._lookup[text] = None
+            else:
+                self._lookup[text] = record_id
+    
+    def find_id(self, text: str) -> Any:
+        """
+        文字列に対応するID（Excelから貼り付けた値の変換用）
+        
+        Args:
+            text: 表示用文字列・ID・組番号・氏名など
+            
+        Returns:
+            ID（見つからない場合・複数に当たる場合はNone）
+        """
+        return self._lookup.get(str(text).strip())
+    
+    def set_records(self, records: List[Dict[str, Any]]):
+        """
+        選択肢を差し替え
+        
+        Args:
+            records: マスタデータのリスト
+        """
+        self.beginResetModel()
+        self._records = list(records)
+        self._display = [self.display_text(r) for r in self._records]
+        self._search = [self.search_text(r) for r in self._records]
+        self._rows = {r[self.id_key]: i + 1 for i, r in enumerate(self._records)}
+        self._lookup = {}
+        for record in self._records:
+            self._add_lookup(record)
+        self.endResetModel()
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """保持しているマスタデータ"""
+        return self._records
+    
+    def row_for_id(self, record_id: Any) -> int:
+        """IDに対応する行番号（見つからない場合は-1）"""
+        return self._rows.get(record_id, -1)
+    
+    def record_for_id(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """IDに対応するマスタデータ"""
+        row = self._rows.get(record_id)
+        return self._records[row - 1] if row else None
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._records) + 1
+    
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        if row == 0:
+            return "" if role in (Qt.DisplayRole, Qt.EditRole) else None
+        
+        i = row - 1
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._display[i]
+        if role == Qt.UserRole:
+            return self._records[i][self.id_key]
+        if role == self.SearchRole:
+            return self._search[i]
+        return None
+
+
+class StudentListModel(MasterListModel):
+    """生徒の選択肢モデル"""
+    
+    id_key = 'student_id'
+    
+    def display_text(self, record: Dict[str, Any]) -> str:
+        # 表示形式: 組番号：氏名
+        return f"{record['class_number']}：{record['name']}"
+    
+    def search_text(self, record: Dict[str, Any]) -> str:
+        # 組番号、氏名、ふりがなで検索できるようにする
+        return f"{self.display_text(record)} {record.get('name_kana') or ''}"
+    
+    def lookup_texts(self, record: Dict[str, Any]) -> List[str]:
+        # 組番号・学籍番号・氏名だけでも貼り付けられるようにする
+        return super().lookup_texts(record) + [
+            record['class_number'], record.get('student_number') or '', record['name']
+        ]
+
+
+class CourseListModel(MasterListModel):
+    """講座の選択肢モデル"""
+    
+    id_key = 'course_id'
+    
+    def display_text(self, record: Dict[str, Any]) -> str:
+        return record['course_name']
+
+
+class MasterFilterProxyModel(QSortFilterProxyModel):
+    """ウィジェットごとの絞り込み用プロキシ（空行を除外し、検索用文字列で部分一致）"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterRole(MasterListModel.SearchRole)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+    
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if source_row == 0:
+            return False
+        return super().filterAcceptsRow(source_row, source_parent)
+
+
+class MasterCompleter(QCompleter):
+    """
+    共有モデルを参照するオートコンプリート
+    
+    入力文字列での絞り込みはウィジェットごとのプロキシで行い、
+    候補の選択時は表示用文字列を入力欄に反映する。
+    """
+    
+    def __init__(self, model: MasterListModel, parent=None):
+        self.proxy = MasterFilterProxyModel(parent)
+        self.proxy.setSourceModel(model)
+        super().__init__(self.proxy, parent)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+    
+    def splitPath(self, path: str) -> list:
+        # 絞り込みはプロキシに任せ、QCompleter自身は全候補を表示する
+        self.proxy.setFilterFixedString(path)
+        return [""]
@@ -0,0 +1,249 @@
+"""
+SQLテーブルモデル
+キーセットページャーからスクロールに合わせて行を読み込む汎用テーブルモデル
+"""
+from typing import List, Dict, Any, Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+
+from ...config import ADMIN_PAGE_SIZE, ADMIN_MAX_ROWS
+from ...database.keyset_pager import KeysetPager
+from ...utils.workers import TaskRunner
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SqlTableModel(QAbstractTableModel):
+    """
+    キーセットページャーを元にした読み取り専用テーブルモデル
+
+    最初のページだけを読み込み、ビューが末尾までスクロールした時に
+    canFetchMore/fetchMore で次のページを読み込む。
+    並べ替えはSQLのORDER BYで行い、先頭のページから読み直す。
+    task_runner を指定するとすべてのページをバックグラウンドで読み込み、
+    失敗は load_failed で通知する。
+    読み込んだ行は破棄しないため、max_rows 件に達したらそれ以上は読み込まず
+    limit_reached で通知する（それより先は並べ替え・絞り込みで表示する）。
+
+    columns の各要素は辞書:
+        - header: 見出し
+        - key: 行の辞書のキー
+        - sort: 並べ替えに使うSQL式（省略時はその列で並べ替えない）
+        - format: 表示文字列を返す関数 row -> str（省略時は key の値）
+    """
+
+    load_failed = Signal(str)
+    # 保持する件数の上限に達した（上限の件数）
+    limit_reached = Signal(int)
+
+    def __init__(self, columns: List[Dict[str, Any]], id_key: str,
+                 page_size: int = ADMIN_PAGE_SIZE, max_rows: int = ADMIN_MAX_ROWS,
+                 task_runner: Optional[TaskRunner] = None, task_key: str = None, parent=None):
+        """
+        初期化
+
+        Args:
+            columns: 列の定義
+            id_key: 行を特定する値のキー（選択行の取得に使用）
+            page_size: 1ページの件数
+            max_rows: 保持する最大件数
+            task_runner: ページをバックグラウンドで読み込む場合のTaskRunner
+            task_key: TaskRunnerに渡すキー
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self.id_key = id_key
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.task_runner = task_runner
+        self.task_key = task_key or id_key
+        self.pager: Optional[KeysetPager] = None
+
+        # 表示文字列のタプルとIDだけを保持する（行の辞書は保持しない）
+        self._rows: List[tuple] = []
+        self._ids: List[Any] = []
+        self._position = None
+        self._at_end = True
+        self._loading = False
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def set_pager(self, pager: KeysetPager):
+        """
+        ページャーを差し替えて先頭から読み込み
+
+        Args:
+            pager: キーセットページャー
+        """
+        self.pager = pager
+        self._apply_sort()
+        self.refresh()
+
+    def refresh(self):
+        """
+        先頭のページから読み直す
+
+        task_runner がない場合はその場で読み込む（例外は呼び出し元に送る）。
+        ある場合は読み込みが終わるまで前回の内容を表示し続ける。
+        """
+        if self.pager is None:
+            self._reset()
+            return
+
+        if self.task_runner is None:
+            self._reset()
+            self._fetch_page()
+            return
+
+        # 読み込み中は前回の内容の続きを読み込まない（並び順・条件が変わっている場合がある）
+        self._loading = True
+        self.task_runner.submit(
+            self.task_key, self.pager.fetch_page, None, self.page_size,
+            on_result=self._apply_first_page,
+            on_error=self._on_load_failed
+        )
+
+    def _reset(self):
+        """読み込み済みの行を破棄"""
+        self.beginResetModel()
+        self._rows = []
+        self._ids = []
+        self._position = None
+        self._at_end = True
+        self.endResetModel()
+
+    def _apply_first_page(self, result: tuple):
+        """バックグラウンドで読み込んだ先頭のページを反映"""
+        records, position = result
+        self._loading = False
+        self._reset()
+        self._at_end = False
+        self._append(records, position)
+        logger.info(f"{len(records)}件を読み込みました: {self.task_key}")
+
+    def _on_load_failed(self, message: str):
+        """先頭のページの読み込みに失敗"""
+        self._loading = False
+        self._reset()
+        self.load_failed.emit(message)
+
+    def _apply_next_page(self, result: tuple):
+        """バックグラウンドで読み込んだ次のページを末尾に追加"""
+        records, position = result
+        self._loading = False
+        self._append(records, position)
+
+    def _on_fetch_more_failed(self, message: str):
+        """次のページの読み込みに失敗（読み込み済みの行は残し、これ以上読み込まない）"""
+        self._loading = False
+        self._at_end = True
+        self.load_failed.emit(message)
+
+    def loaded_count(self) -> int:
+        """読み込み済みの行数"""
+        return len(self._rows)
+
+    def id_at(self, row: int) -> Any:
+        """行のID"""
+        return self._ids[row]
+
+    def _format(self, column: Dict[str, Any], record: Dict[str, Any]) -> str:
+        """セルの表示文字列"""
+        if 'format' in column:
+            return column['format'](record)
+        value = record.get(column['key'])
+        return '' if value is None else str(value)
+
+    def _fetch_page(self):
+        """次のページを読み込んで末尾に追加"""
+        self._at_end = False
+        records, position = self.pager.fetch_page(self._position, self.page_size)
+        self._append(records, position)
+
+    def _append(self, records: List[Dict[str, Any]], position):
+        """読み込んだページを末尾に追加"""
+        self._position = position
+        if len(records) < self.page_size:
+            self._at_end = True
+        if not records:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        for record in records:
+            self._rows.append(tuple(self._format(c, record) for c in self.columns))
+            self._ids.append(record[self.id_key])
+        self.endInsertRows()
+
+        if not self._at_end and len(self._rows) >= self.max_rows:
+            self._at_end = True
+            logger.info(f"保持する件数の上限（{self.max_rows}件）に達しました: {self.task_key}")
+            self.limit_reached.emit(self.max_rows)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid() or self._loading:
+            return False
+        return not self._at_end
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._at_end or self._loading:
+            return
+        if self.task_runner is not None:
+            # 先頭からの読み直しと同じキーで依頼し、読み直した時は古い続きの結果を捨てる
+            self._loading = True
+            self.task_runner.submit(
+                self.task_key, self.pager.fetch_page, self._position, self.page_size,
+                on_result=self._apply_next_page,
+                on_error=self._on_fetch_more_failed
+            )
+            return
+        try:
+            self._fetch_page()
+        except Exception as e:
+            # ビューから呼ばれるため例外は送らず、これ以上読み込まない
+            self._at_end = True
+            logger.error(f"次のページの読み込みに失敗: {e}")
+
+    def _apply_sort(self):
+        """現在の並べ替え列をページャーに反映"""
+        if self.pager is None:
+            return
+        if 0 <= self._sort_column < len(self.columns) and self.columns[self._sort_column].get('sort'):
+            descending = self._sort_order == Qt.DescendingOrder
+            self.pager.set_order([(self.columns[self._sort_column]['sort'], descending)])
+        else:
+            self.pager.set_order(None)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """SQLのORDER BYで並べ替え（並べ替えできない列は既定の並び順）"""
+        self._sort_column = column
+        self._sort_order = order
+        if self.pager is None:
+            return
+        self._apply_sort()
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"並べ替えに失敗: {e}")
+            self.load_failed.emit(str(e))
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]['header']
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.UserRole:
+            return self._ids[index.row()]
+        return None
@@ -21,6 +21,7 @@ class SettingsTab(QWidget):
     
     title_changed = Signal(str)
     notice_changed = Signal()
+    active_year_changed = Signal(int)
     
     def __init__(self, auth_controller: AuthController, backup_manager: BackupManager, parent=None):
         super().__init__(parent)
@@ -80,6 +81,25 @@ class SettingsTab(QWidget):
         title_group.setLayout(title_layout)
         layout.addWidget(title_group)
         
+        # 年度設定グループ
+        year_group = QGroupBox("年度設定")
+        year_layout = QHBoxLayout()
+        
+        year_layout.addWidget(QLabel("現在の年度:"))
+        self.active_year_spin = QSpinBox()
+        self.active_year_spin.setMinimum(2000)
+        self.active_year_spin.setMaximum(2100)
+        year_layout.addWidget(self.active_year_spin)
+        year_layout.addWidget(QLabel("年度（生徒・講座の選択肢と一覧の初期表示に使用）"))
+        year_layout.addStretch()
+        
+        save_year_btn = QPushButton("保存")
+        save_year_btn.clicked.connect(self.save_active_year)
+        year_layout.addWidget(save_year_btn)
+        
+        year_group.setLayout(year_layout)
+        layout.addWidget(year_group)
+        
         # バックアップ設定グループ
         backup_group = QGroupBox("バックアップ設定")
         backup_layout = QVBoxLayout()
@@ -139,6 +159,8 @@ class SettingsTab(QWidget):
             if notice_message:
                 self.notice_edit.setPlainText(notice_message)
             
+            self.active_year_spin.setValue(self.auth_controller.get_active_year())
+            
             backup_interval = self.auth_controller.get_setting('backup_interval')
             if backup_interval:
                 self.backup_interval_spin.setValue(int(backup_interval))
@@ -199,6 +221,20 @@ class SettingsTab(QWidget):
             logger.error(f"タイトル変更に失敗: {e}")
             QMessageBox.critical(self, "エラー", f"タイトル変更に失敗しました:\n{e}")
     
+    def save_active_year(self):
+        """現在の年度を保存"""
+        year = self.active_year_spin.value()
+        
+        try:
+            self.auth_controller.set_setting('active_year', str(year))
+            QMessageBox.information(self, "完了", f"現在の年度を{year}年度に設定しました")
+            self.active_year_changed.emit(year)
+            logger.info(f"現在の年度を変更: {year}")
+        
+        except Exception as e:
+            logger.error(f"年度の変更に失敗: {e}")
+            QMessageBox.critical(self, "エラー", f"年度の変更に失敗しました:\n{e}")
+    
     def save_backup_interval(self):
         """バックアップ間隔を保存"""
         interval = self.backup_interval_spin.value()
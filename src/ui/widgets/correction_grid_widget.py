@@ -0,0 +1,322 @@
+"""
+訂正一括入力ウィジェット
+表形式で多数の訂正をまとめて入力する（Excelからの貼り付けに対応）
+"""
+from typing import List, Dict, Any, Optional
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QComboBox, QDateEdit, QLineEdit, QTableView, QHeaderView,
+    QAbstractItemView, QStyledItemDelegate, QMessageBox, QApplication
+)
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtGui import QKeySequence, QShortcut
+
+from ...config import REQUEST_TYPES, ATTENDANCE_TYPES, GRADE_TYPES, SEMESTER_TYPES
+from ..models.correction_grid_model import CorrectionGridModel
+from ..models.master_list_model import (
+    MasterListModel, StudentListModel, CourseListModel, MasterCompleter
+)
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 各列の初期幅（内容を測らない）
+COLUMN_WIDTHS = [100, 160, 180, 100, 90, 80, 90, 90, 0]
+
+# 貼り付けエラーを一度に表示する件数
+MAX_PASTE_ERRORS = 10
+
+
+class ChoiceDelegate(QStyledItemDelegate):
+    """選択肢から選ぶ列のエディタ"""
+
+    def __init__(self, items: List[str], editable: bool = False, parent=None):
+        super().__init__(parent)
+        self.items = items
+        self.editable = editable
+
+    def items_for(self, index) -> List[str]:
+        """セルの選択肢"""
+        return self.items
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.items_for(index))
+        editor.setEditable(self.editable or self.is_editable(index))
+        return editor
+
+    def is_editable(self, index) -> bool:
+        """自由入力できるセルか"""
+        return False
+
+    def setEditorData(self, editor: QComboBox, index):
+        value = index.data(Qt.EditRole) or ''
+        row = editor.findText(value)
+        if row >= 0:
+            editor.setCurrentIndex(row)
+        else:
+            editor.setCurrentText(value)
+
+    def setModelData(self, editor: QComboBox, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+
+class ValueDelegate(ChoiceDelegate):
+    """訂正前/後の列のエディタ（出欠訂正は選択、評価評定変更は自由入力）"""
+
+    def __init__(self, parent=None):
+        super().__init__(ATTENDANCE_TYPES, parent=parent)
+
+    def items_for(self, index) -> List[str]:
+        if index.model().is_attendance(index.row()):
+            return ATTENDANCE_TYPES
+        return GRADE_TYPES
+
+    def is_editable(self, index) -> bool:
+        return not index.model().is_attendance(index.row())
+
+
+class MasterDelegate(QStyledItemDelegate):
+    """生徒・講座の列のエディタ（共有モデルとオートコンプリートを使用）"""
+
+    def __init__(self, master_model: MasterListModel, parent=None):
+        super().__init__(parent)
+        self.master_model = master_model
+
+    def createEditor(self, parent, option, index):
+        # 編集中のセルにだけ作るため、行数が増えてもコンボボックスは1つ
+        editor = QComboBox(parent)
+        editor.setEditable(True)
+        editor.setInsertPolicy(QComboBox.NoInsert)
+        editor.setModel(self.master_model)
+        editor.setCompleter(MasterCompleter(self.master_model, editor))
+        return editor
+
+    def setEditorData(self, editor: QComboBox, index):
+        row = self.master_model.row_for_id(index.data(Qt.EditRole))
+        editor.setCurrentIndex(max(row, 0))
+
+    def setModelData(self, editor: QComboBox, model, index):
+        # 候補を選ばずに入力した文字列は組番号・氏名などとして引く
+        text = editor.currentText().strip()
+        row = editor.currentIndex()
+        if row > 0 and editor.itemText(row) == text:
+            model.setData(index, editor.currentData(), Qt.EditRole)
+        else:
+            model.setData(index, text, Qt.EditRole)
+
+
+class DateDelegate(QStyledItemDelegate):
+    """対象日付の列のエディタ"""
+
+    def createEditor(self, parent, option, index):
+        editor = QDateEdit(parent)
+        editor.setCalendarPopup(True)
+        editor.setDisplayFormat('yyyy-MM-dd')
+        return editor
+
+    def setEditorData(self, editor: QDateEdit, index):
+        value = index.data(Qt.EditRole)
+        date = QDate.fromString(value, 'yyyy-MM-dd') if value else QDate.currentDate()
+        editor.setDate(date if date.isValid() else QDate.currentDate())
+
+    def setModelData(self, editor: QDateEdit, model, index):
+        model.setData(index, editor.date().toString('yyyy-MM-dd'), Qt.EditRole)
+
+
+class PeriodsDelegate(QStyledItemDelegate):
+    """校時の列のエディタ（「1,2」のように番号を入力）"""
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setPlaceholderText("例: 1,2")
+        return editor
+
+    def setEditorData(self, editor: QLineEdit, index):
+        editor.setText(index.data(Qt.EditRole) or '')
+
+    def setModelData(self, editor: QLineEdit, model, index):
+        if not model.setData(index, editor.text(), Qt.EditRole):
+            QMessageBox.warning(editor.window(), "入力エラー", "校時は1〜12の番号で入力してください")
+
+
+class CorrectionGridWidget(QWidget):
+    """
+    訂正一括入力ウィジェット
+
+    1行が1件の訂正。依頼者は全行で共通。
+    Excelなどからコピーした表をCtrl+Vで貼り付けでき、足りない行は自動で追加する。
+    """
+
+    def __init__(self, student_model: StudentListModel, course_model: CourseListModel, parent=None):
+        super().__init__(parent)
+        self.student_model = student_model
+        self.course_model = course_model
+        self.model = CorrectionGridModel(student_model, course_model, self)
+        self.setup_ui()
+        self.model.append_rows(1)
+
+    def setup_ui(self):
+        """UIをセットアップ"""
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # 依頼者（全行で共通）と行の操作
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("依頼者:"))
+        self.requester_input = QComboBox()
+        self.requester_input.setEditable(True)
+        self.requester_input.setMinimumWidth(150)
+        top_layout.addWidget(self.requester_input)
+        top_layout.addStretch()
+
+        remove_btn = QPushButton("➖ 選択行を削除")
+        remove_btn.clicked.connect(self.remove_selected_rows)
+        top_layout.addWidget(remove_btn)
+        layout.addLayout(top_layout)
+
+        hint = QLabel(
+            "Excelからコピーした表をCtrl+Vで貼り付けできます（列の順: "
+            + "、".join(CorrectionGridModel.HEADERS) + "）"
+        )
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: gray;")
+        layout.addWidget(hint)
+
+        # 表（ウィジェットは表示中のセルと編集中のエディタだけ）
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+            | QAbstractItemView.AnyKeyPressed | QAbstractItemView.SelectedClicked
+        )
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        header = self.table.horizontalHeader()
+        for column, width in enumerate(COLUMN_WIDTHS):
+            if width:
+                header.setSectionResizeMode(column, QHeaderView.Interactive)
+                self.table.setColumnWidth(column, width)
+        header.setSectionResizeMode(CorrectionGridModel.REASON, QHeaderView.Stretch)
+
+        # デリゲートはビューが保持する必要があるため属性に残す
+        self.delegates = {
+            CorrectionGridModel.TYPE: ChoiceDelegate(list(REQUEST_TYPES.values()), parent=self),
+            CorrectionGridModel.STUDENT: MasterDelegate(self.student_model, self),
+            CorrectionGridModel.COURSE: MasterDelegate(self.course_model, self),
+            CorrectionGridModel.DATE: DateDelegate(self),
+            CorrectionGridModel.SEMESTER: ChoiceDelegate(SEMESTER_TYPES, parent=self),
+            CorrectionGridModel.PERIODS: PeriodsDelegate(self),
+            CorrectionGridModel.BEFORE: ValueDelegate(self),
+            CorrectionGridModel.AFTER: ValueDelegate(self),
+        }
+        for column, delegate in self.delegates.items():
+            self.table.setItemDelegateForColumn(column, delegate)
+
+        paste_shortcut = QShortcut(QKeySequence.Paste, self.table)
+        paste_shortcut.setContext(Qt.WidgetShortcut)
+        paste_shortcut.activated.connect(self.paste)
+
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def row_count(self) -> int:
+        """行数"""
+        return self.model.rowCount()
+
+    def add_row(self):
+        """最後の行を複製して追加"""
+        rows = self.model.rows()
+        self.model.append_rows(1, rows[-1] if rows else None)
+        self.table.scrollToBottom()
+
+    def remove_selected_rows(self):
+        """選択中のセルを含む行を削除（最後の1行は初期値に戻す）"""
+        rows = {index.row() for index in self.table.selectionModel().selectedIndexes()}
+        if not rows:
+            return
+        if len(rows) >= self.model.rowCount():
+            self.model.clear()
+        else:
+            self.model.remove_rows(list(rows))
+
+    def paste(self, text: Optional[str] = None):
+        """
+        クリップボードの表を現在のセルから貼り付け
+
+        1つの値だけをコピーした場合は選択中の全セルに貼り付ける。
+
+        Args:
+            text: 貼り付ける文字列（Noneの場合はクリップボード）
+        """
+        if text is None:
+            text = QApplication.clipboard().text()
+        if not text:
+            return
+
+        current = self.table.currentIndex()
+        top = current.row() if current.isValid() else self.model.rowCount()
+        left = current.column() if current.isValid() else 0
+
+        table = CorrectionGridModel.parse_tsv(text)
+        selected = self.table.selectionModel().selectedIndexes()
+        if len(table) == 1 and len(table[0]) == 1 and len(selected) > 1:
+            errors = []
+            for index in selected:
+                if not self.model.setData(index, table[0][0], Qt.EditRole):
+                    errors.append(
+                        f"{index.row() + 1}行目 {CorrectionGridModel.HEADERS[index.column()]}: 「{table[0][0]}」"
+                    )
+        else:
+            errors = self.model.paste_text(text, top, left)
+
+        logger.info(f"一括入力に貼り付けました: {len(table)}行")
+
+        if errors:
+            message = "\n".join(errors[:MAX_PASTE_ERRORS])
+            if len(errors) > MAX_PASTE_ERRORS:
+                message += f"\n…ほか{len(errors) - MAX_PASTE_ERRORS}件"
+            QMessageBox.warning(
+                self, "貼り付けエラー",
+                f"次のセルは値を変換できなかったため貼り付けていません:\n\n{message}"
+            )
+
+    def collect(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        入力内容を検証して登録用のデータを取得
+
+        空の行は無視する。エラーがあればメッセージを表示してそのセルを選択する。
+
+        Returns:
+            入力フォームの get_data() と同じ形式の辞書のリスト（エラー時はNone）
+        """
+        requester = self.requester_input.currentText().strip()
+        if not requester:
+            QMessageBox.warning(self, "入力エラー", "依頼者を入力してください")
+            return None
+
+        corrections = []
+        for row in range(self.model.rowCount()):
+            if self.model.is_blank(row):
+                continue
+
+            valid, error, column = self.model.validate_row(row)
+            if not valid:
+                self.model.mark_error(row, column)
+                self.table.setCurrentIndex(self.model.index(row, column))
+                QMessageBox.warning(self, "入力エラー", f"{row + 1}行目: {error}")
+                return None
+
+            corrections.append(self.model.correction_data(row, requester))
+
+        if not corrections:
+            QMessageBox.warning(self, "入力エラー", "入力された行がありません")
+            return None
+
+        return corrections
+
+    def clear(self):
+        """全ての行をクリア"""
+        self.model.clear()
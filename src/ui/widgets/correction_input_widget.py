@@ -6,15 +6,19 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QScrollArea, QMessageBox, QLabel, QRadioButton,
     QButtonGroup, QComboBox, QTextEdit, QDateEdit,
-    QGroupBox, QCheckBox, QCompleter
+    QGroupBox, QCheckBox, QStackedWidget
 )
-from PySide6.QtCore import Qt, Signal, QDate, QSortFilterProxyModel, QStringListModel
+from PySide6.QtCore import Qt, Signal, QDate
 from typing import List, Dict, Any
 
 from ...config import (
     REQUEST_TYPES, ATTENDANCE_TYPES, SEMESTER_TYPES, PERIOD_TYPES,
     COLOR_ATTENDANCE, COLOR_GRADE
 )
+from ..models.master_list_model import (
+    StudentListModel, CourseListModel, MasterCompleter
+)
+from .correction_grid_widget import CorrectionGridWidget
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,10 +29,10 @@ class CorrectionFormWidget(QWidget):
     
     remove_requested = Signal(object)
     
-    def __init__(self, parent=None):
+    def __init__(self, student_model: StudentListModel, course_model: CourseListModel, parent=None):
         super().__init__(parent)
-        self.students = []
-        self.courses = []
+        self.student_model = student_model
+        self.course_model = course_model
         self.setup_ui()
     
     def setup_ui(self):
@@ -76,10 +80,9 @@ class CorrectionFormWidget(QWidget):
         self.student_combo = QComboBox()
         self.student_combo.setEditable(True)
         self.student_combo.setInsertPolicy(QComboBox.NoInsert)
-        # オートコンプリート設定
-        self.student_completer = QCompleter()
-        self.student_completer.setCaseSensitivity(Qt.CaseInsensitive)
-        self.student_completer.setFilterMode(Qt.MatchContains)
+        self.student_combo.setModel(self.student_model)
+        # オートコンプリート設定（共有モデルをフォームごとのプロキシで絞り込む）
+        self.student_completer = MasterCompleter(self.student_model, self)
         self.student_combo.setCompleter(self.student_completer)
         student_layout.addWidget(self.student_combo)
         layout.addLayout(student_layout)
@@ -90,10 +93,9 @@ class CorrectionFormWidget(QWidget):
         self.course_combo = QComboBox()
         self.course_combo.setEditable(True)
         self.course_combo.setInsertPolicy(QComboBox.NoInsert)
-        # オートコンプリート設定
-        self.course_completer = QCompleter()
-        self.course_completer.setCaseSensitivity(Qt.CaseInsensitive)
-        self.course_completer.setFilterMode(Qt.MatchContains)
+        self.course_combo.setModel(self.course_model)
+        # オートコンプリート設定（共有モデルをフォームごとのプロキシで絞り込む）
+        self.course_completer = MasterCompleter(self.course_model, self)
         self.course_combo.setCompleter(self.course_completer)
         course_layout.addWidget(self.course_combo)
         layout.addLayout(course_layout)
@@ -202,47 +204,6 @@ class CorrectionFormWidget(QWidget):
         self.attendance_group.setVisible(is_attendance)
         self.grade_group.setVisible(not is_attendance)
     
-    def set_students(self, students: List[Dict[str, Any]]):
-        """生徒リストを設定"""
-        self.students = students
-        self.student_combo.clear()
-        self.student_combo.addItem("", None)
-        
-        # 検索用のリストを作成
-        student_list = []
-        
-        for student in students:
-            # 表示形式: 組番号：氏名
-            display_text = f"{student['class_number']}：{student['name']}"
-            self.student_combo.addItem(display_text, student['student_id'])
-            
-            # 検索用: 組番号、氏名、ふりがなを含む
-            student_list.append(display_text)
-            if student.get('name_kana'):
-                # ふりがなでも検索できるように追加
-                student_list.append(f"{student['class_number']}：{student.get('name_kana', '')}")
-        
-        # コンプリーターに設定
-        model = QStringListModel(student_list)
-        self.student_completer.setModel(model)
-    
-    def set_courses(self, courses: List[Dict[str, Any]]):
-        """講座リストを設定"""
-        self.courses = courses
-        self.course_combo.clear()
-        self.course_combo.addItem("", None)
-        
-        # 検索用のリストを作成
-        course_list = []
-        
-        for course in courses:
-            self.course_combo.addItem(course['course_name'], course['course_id'])
-            course_list.append(course['course_name'])
-        
-        # コンプリーターに設定
-        model = QStringListModel(course_list)
-        self.course_completer.setModel(model)
-    
     def get_data(self) -> Dict[str, Any]:
         """入力データを取得"""
         is_attendance = self.attendance_radio.isChecked()
@@ -293,13 +254,13 @@ class CorrectionFormWidget(QWidget):
         
         # 生徒
         if data.get('student_id'):
-            index = self.student_combo.findData(data['student_id'])
+            index = self.student_model.row_for_id(data['student_id'])
             if index >= 0:
                 self.student_combo.setCurrentIndex(index)
         
         # 講座
         if data.get('course_id'):
-            index = self.course_combo.findData(data['course_id'])
+            index = self.course_model.row_for_id(data['course_id'])
             if index >= 0:
                 self.course_combo.setCurrentIndex(index)
         
@@ -393,13 +354,24 @@ class CorrectionFormWidget(QWidget):
 
 
 class CorrectionInputWidget(QWidget):
-    """訂正入力ウィジェット（複数フォーム管理）"""
+    """
+    訂正入力ウィジェット（複数フォーム管理）
+    
+    フォーム入力と一覧入力（表形式の一括入力）を切り替えられる。
+    どちらの場合も submit_requested で同じ形式のデータを送る。
+    """
     
     submit_requested = Signal(list)
     
-    def __init__(self, parent=None):
+    FORM_PAGE = 0
+    GRID_PAGE = 1
+    
+    def __init__(self, student_model: StudentListModel, course_model: CourseListModel, parent=None):
         super().__init__(parent)
+        self.student_model = student_model
+        self.course_model = course_model
         self.forms: List[CorrectionFormWidget] = []
+        self.grid_widget = None
         self.setup_ui()
         self.add_form()
     
@@ -408,21 +380,30 @@ class CorrectionInputWidget(QWidget):
         layout = QVBoxLayout()
         
         # ボタンエリア
-        button_layout = QHBoxLayout()
+        self.button_layout = QHBoxLayout()
         
-        add_btn = QPushButton("➕ 入力フォームを複製")
-        add_btn.clicked.connect(self.duplicate_form)
-        button_layout.addWidget(add_btn)
+        self.mode_btn = QPushButton("📋 一覧入力")
+        self.mode_btn.setCheckable(True)
+        self.mode_btn.setToolTip("多数の訂正を表形式で入力します（Excelからの貼り付けに対応）")
+        self.mode_btn.toggled.connect(self.set_grid_mode)
+        self.button_layout.addWidget(self.mode_btn)
+        
+        self.add_btn = QPushButton("➕ 入力フォームを複製")
+        self.add_btn.clicked.connect(self.on_add)
+        self.button_layout.addWidget(self.add_btn)
         
         submit_btn = QPushButton("✅ 確認して登録")
         submit_btn.clicked.connect(self.on_submit)
-        button_layout.addWidget(submit_btn)
+        self.button_layout.addWidget(submit_btn)
         
         clear_btn = QPushButton("🗑️ 全てクリア")
         clear_btn.clicked.connect(self.clear_all)
-        button_layout.addWidget(clear_btn)
+        self.button_layout.addWidget(clear_btn)
+        
+        layout.addLayout(self.button_layout)
         
-        layout.addLayout(button_layout)
+        # フォーム入力と一覧入力を切り替える
+        self.stack = QStackedWidget()
         
         # スクロールエリア
         scroll = QScrollArea()
@@ -435,20 +416,43 @@ class CorrectionInputWidget(QWidget):
         self.forms_container.setLayout(self.forms_layout)
         
         scroll.setWidget(self.forms_container)
-        layout.addWidget(scroll)
+        self.stack.addWidget(scroll)
+        layout.addWidget(self.stack)
         
         self.setLayout(layout)
     
+    def is_grid_mode(self) -> bool:
+        """一覧入力中か"""
+        return self.stack.currentIndex() == self.GRID_PAGE
+    
+    def set_grid_mode(self, enabled: bool):
+        """
+        一覧入力とフォーム入力を切り替え（一覧入力は初めて使う時に作成）
+        
+        Args:
+            enabled: 一覧入力にする場合True
+        """
+        if enabled and self.grid_widget is None:
+            self.grid_widget = CorrectionGridWidget(self.student_model, self.course_model)
+            self.stack.addWidget(self.grid_widget)
+        
+        self.stack.setCurrentIndex(self.GRID_PAGE if enabled else self.FORM_PAGE)
+        self.add_btn.setText("➕ 行を追加" if enabled else "➕ 入力フォームを複製")
+        if self.mode_btn.isChecked() != enabled:
+            self.mode_btn.setChecked(enabled)
+    
+    def on_add(self):
+        """追加ボタンがクリックされた時"""
+        if self.is_grid_mode():
+            self.grid_widget.add_row()
+        else:
+            self.duplicate_form()
+    
     def add_form(self):
         """新しいフォームを追加"""
-        form = CorrectionFormWidget()
+        form = CorrectionFormWidget(self.student_model, self.course_model)
         form.remove_requested.connect(self.remove_form)
         
-        # 既存のデータを引き継ぐ
-        if self.forms:
-            form.set_students(self.forms[0].students)
-            form.set_courses(self.forms[0].courses)
-        
         self.forms.append(form)
         self.forms_layout.insertWidget(len(self.forms) - 1, form)
     
@@ -463,10 +467,8 @@ class CorrectionInputWidget(QWidget):
         data = last_form.get_data()
         
         # 新しいフォームを追加
-        form = CorrectionFormWidget()
+        form = CorrectionFormWidget(self.student_model, self.course_model)
         form.remove_requested.connect(self.remove_form)
-        form.set_students(last_form.students)
-        form.set_courses(last_form.courses)
         
         # データを設定
         form.set_data(data)
@@ -487,17 +489,21 @@ class CorrectionInputWidget(QWidget):
         form.deleteLater()
     
     def set_students(self, students: List[Dict[str, Any]]):
-        """全フォームに生徒リストを設定"""
-        for form in self.forms:
-            form.set_students(students)
+        """生徒リストを設定（全フォームが共有モデルを参照する）"""
+        self.student_model.set_records(students)
     
     def set_courses(self, courses: List[Dict[str, Any]]):
-        """全フォームに講座リストを設定"""
-        for form in self.forms:
-            form.set_courses(courses)
+        """講座リストを設定（全フォームが共有モデルを参照する）"""
+        self.course_model.set_records(courses)
     
     def on_submit(self):
         """登録ボタンがクリックされた時"""
+        if self.is_grid_mode():
+            corrections = self.grid_widget.collect()
+            if corrections:
+                self.submit_requested.emit(corrections)
+            return
+        
         corrections = []
         
         for i, form in enumerate(self.forms):
@@ -512,7 +518,7 @@ class CorrectionInputWidget(QWidget):
         self.submit_requested.emit(corrections)
     
     def clear_all(self):
-        """全フォームをクリア"""
+        """全フォーム（一覧入力中は全ての行）をクリア"""
         reply = QMessageBox.question(
             self, "確認", 
             "全ての入力内容をクリアしますか？",
@@ -520,6 +526,10 @@ class CorrectionInputWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
+            if self.is_grid_mode():
+                self.grid_widget.clear()
+                return
+            
             # 最初のフォーム以外を削除
             while len(self.forms) > 1:
                 form = self.forms.pop()
@@ -3,13 +3,16 @@
 """
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView,
+    QTableView, QHeaderView,
     QAbstractItemView, QLineEdit, QComboBox, QLabel
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, Signal, QTimer
 
-from ...config import COLOR_ATTENDANCE, COLOR_GRADE
+from ...config import CORRECTION_PREFETCH_ADJACENT, SEARCH_DEBOUNCE_MS
+from ...utils.workers import run_in_background
+from ..models.correction_table_model import (
+    CorrectionTableModel, CorrectionFilterProxyModel, match_search_keys
+)
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,10 +25,27 @@ class CorrectionListWidget(QWidget):
     view_requested = Signal(int)
     delete_requested = Signal(int)
     export_requested = Signal()
+    prefetch_requested = Signal(list)
+    
+    # 列の初期幅（0は伸縮列）
+    COLUMN_WIDTHS = [60, 100, 140, 200, 160, 0, 50]
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.corrections = []
+        
+        # インクリメンタル検索の状態
+        # 前回の検索文字列と一致行（同じ一覧に対する結果のみ絞り込みに再利用）
+        self._search_generation = 0
+        self._applied_generation = 0
+        self._last_search_text = ""
+        self._last_search_rows = None
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.start_search)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -38,7 +58,7 @@ class CorrectionListWidget(QWidget):
         filter_layout.addWidget(QLabel("検索:"))
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("生徒名（ひらがな可）・講座名で検索...")
-        self.search_edit.textChanged.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         filter_layout.addWidget(self.search_edit)
         
         filter_layout.addWidget(QLabel("種別:"))
@@ -55,22 +75,29 @@ class CorrectionListWidget(QWidget):
         
         layout.addLayout(filter_layout)
         
-        # テーブル
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "種別", "生徒名", "講座名", "日時・学期", "訂正内容", "ロック"
-        ])
+        # テーブル（表示中の行だけを描画するモデル/ビュー構成）
+        self.model = CorrectionTableModel(self)
+        self.proxy_model = CorrectionFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        
+        # 行の高さは固定、列幅は内容を測らず初期幅を指定する
+        # （ResizeToContentsは全セルを測るため件数に比例して遅くなる）
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setVisible(False)
         
         header = self.table.horizontalHeader()
-        header.setStretchLastSection(True)
-        for i in range(7):
-            if i == 5:
-                header.setSectionResizeMode(i, QHeaderView.Stretch)
-            else:
-                header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for column, width in enumerate(self.COLUMN_WIDTHS):
+            if width:
+                header.resizeSection(column, width)
+        header.setSectionResizeMode(5, QHeaderView.Stretch)
         
         layout.addWidget(self.table)
         
@@ -89,105 +116,168 @@ class CorrectionListWidget(QWidget):
         delete_btn.clicked.connect(self.on_delete_clicked)
         button_layout.addWidget(delete_btn)
         
-        export_btn = QPushButton("📤 CSV出力")
+        export_btn = QPushButton("📤 CSV/Excel出力")
         export_btn.clicked.connect(self.export_requested.emit)
         button_layout.addWidget(export_btn)
         
         button_layout.addStretch()
+        
+        self.loading_label = QLabel("⏳ 読み込み中...")
+        self.loading_label.setVisible(False)
+        button_layout.addWidget(self.loading_label)
+        
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
     
+    def set_loading(self, loading: bool):
+        """読み込み中の表示を切り替え（一覧は読み込み完了まで前回の内容のまま）"""
+        self.loading_label.setVisible(loading)
+    
     def load_corrections(self, corrections: list):
-        """訂正依頼をロード"""
+        """訂正依頼をロード（選択中の訂正依頼は再ロード後も選択を維持）"""
+        selected_id = self.selected_correction_id()
         self.corrections = corrections
-        self.apply_filters()
+        self.model.set_corrections(corrections)
+        
+        # 行番号が変わるので前回の一致行は使えない（表示は新しい結果が届くまでIDで絞り込む）
+        self._last_search_rows = None
+        if self.search_edit.text():
+            self.start_search()
+        
+        if selected_id is not None:
+            self.select_correction(selected_id)
+    
+    def start_search(self):
+        """
+        検索を開始（入力が止まってから呼ばれる）
+        
+        一致判定はワーカースレッドで行う。検索文字列が前回の文字列を含む場合は
+        前回一致した行だけを調べる（入力を続けるほど調べる行が減る）。
+        """
+        self.search_timer.stop()
+        self._search_generation += 1
+        generation = self._search_generation
+        text = self.search_edit.text().lower()
+        
+        if not text:
+            self._last_search_text = ""
+            self._last_search_rows = None
+            self._apply_search_result(generation, text, None, None)
+            return
+        
+        candidates = None
+        if self._last_search_rows is not None and self._last_search_text in text:
+            candidates = self._last_search_rows
+        
+        corrections = self.model.corrections()
+        search_keys = self.model.search_keys()
+        run_in_background(
+            match_search_keys, corrections, search_keys, text, candidates,
+            on_result=lambda result: self._on_search_finished(generation, text, result),
+            on_error=lambda message: self._on_search_failed(generation)
+        )
+    
+    def _on_search_finished(self, generation: int, text: str, result: tuple):
+        """
+        検索結果を受け取る
+        
+        新しい検索が始まっていれば捨てる（再読み込み時も検索し直すため、
+        古い一覧に対する結果が反映されることはない）
+        """
+        if generation != self._search_generation:
+            return
+        rows, matched_ids = result
+        self._apply_search_result(generation, text, rows, matched_ids)
+    
+    def _on_search_failed(self, generation: int):
+        """検索に失敗した（表示は直前の結果のまま）"""
+        if generation == self._search_generation:
+            self._applied_generation = generation
+    
+    def _apply_search_result(self, generation: int, text: str, rows, matched_ids):
+        """検索結果を一覧に反映"""
+        self._last_search_text = text
+        self._last_search_rows = rows
+        self._applied_generation = generation
+        
+        selected_id = self.selected_correction_id()
+        self.proxy_model.set_matched_ids(matched_ids)
+        if selected_id is not None:
+            self.select_correction(selected_id)
+    
+    def is_searching(self) -> bool:
+        """検索の実行待ち・実行中か"""
+        return self.search_timer.isActive() or self._applied_generation != self._search_generation
     
     def apply_filters(self):
-        """フィルタを適用"""
-        search_text = self.search_edit.text().lower()
+        """種別・ロック状態のフィルタを適用"""
         type_filter = self.type_combo.currentText()
         lock_filter = self.lock_combo.currentText()
         
-        filtered = []
-        for correction in self.corrections:
-            # 種別フィルタ
-            if type_filter != "全て" and correction['request_type'] != type_filter:
-                continue
-            
-            # ロックフィルタ
-            if lock_filter == "ロック済み" and not correction['is_locked']:
-                continue
-            if lock_filter == "未ロック" and correction['is_locked']:
-                continue
-            
-            # 検索フィルタ（生徒名・ふりがな・講座名）
-            if search_text:
-                student_name = correction.get('student_name', '').lower()
-                student_kana = correction.get('name_kana', '').lower()
-                course_name = correction.get('course_name', '').lower()
-                
-                if (search_text not in student_name and 
-                    search_text not in student_kana and 
-                    search_text not in course_name):
-                    continue
-            
-            filtered.append(correction)
-        
-        self.display_corrections(filtered)
-    
-    def display_corrections(self, corrections: list):
-        """訂正依頼を表示"""
-        self.table.setRowCount(0)
-        
-        for correction in corrections:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            self.table.setItem(row, 0, QTableWidgetItem(str(correction['correction_id'])))
-            
-            type_item = QTableWidgetItem(correction['request_type'])
-            if correction['request_type'] == '出欠訂正':
-                type_item.setBackground(QColor(COLOR_ATTENDANCE))
-            else:
-                type_item.setBackground(QColor(COLOR_GRADE))
-            self.table.setItem(row, 1, type_item)
-            
-            self.table.setItem(row, 2, QTableWidgetItem(correction.get('student_name', '')))
-            self.table.setItem(row, 3, QTableWidgetItem(correction.get('course_name', '')))
-            
-            date_semester = ""
-            if correction.get('target_date'):
-                date_semester = correction['target_date']
-            if correction.get('semester'):
-                if date_semester:
-                    date_semester += f" / {correction['semester']}"
-                else:
-                    date_semester = correction['semester']
-            self.table.setItem(row, 4, QTableWidgetItem(date_semester))
-            
-            content = ""
-            if correction.get('before_value'):
-                content = f"{correction['before_value']} → {correction['after_value']}"
-            else:
-                content = correction['after_value']
-            self.table.setItem(row, 5, QTableWidgetItem(content))
-            
-            lock_text = "🔒" if correction['is_locked'] else ""
-            self.table.setItem(row, 6, QTableWidgetItem(lock_text))
+        is_locked = None
+        if lock_filter == "ロック済み":
+            is_locked = True
+        elif lock_filter == "未ロック":
+            is_locked = False
+        
+        selected_id = self.selected_correction_id()
+        self.proxy_model.set_filters(
+            request_type=None if type_filter == "全て" else type_filter,
+            is_locked=is_locked
+        )
+        
+        if selected_id is not None:
+            self.select_correction(selected_id)
+    
+    def selected_row(self) -> int:
+        """選択中の行（プロキシ上の行番号、未選択は-1）"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return -1
+        return rows[0].row()
+    
+    def correction_id_at(self, row: int) -> int:
+        """プロキシ上の行番号から訂正依頼IDを取得"""
+        return self.proxy_model.index(row, 0).data(Qt.UserRole)
+    
+    def selected_correction_id(self):
+        """選択中の訂正依頼ID（未選択はNone）"""
+        row = self.selected_row()
+        if row < 0:
+            return None
+        return self.correction_id_at(row)
+    
+    def select_correction(self, correction_id: int):
+        """訂正依頼IDの行を選択（フィルタで非表示の場合は何もしない）"""
+        source_row = self.model.row_for_id(correction_id)
+        if source_row is None:
+            return
+        
+        index = self.proxy_model.mapFromSource(self.model.index(source_row, 0))
+        if index.isValid():
+            self.table.selectRow(index.row())
+    
+    def on_selection_changed(self):
+        """選択行とその前後の訂正依頼の先読みを要求"""
+        row = self.selected_row()
+        if row < 0:
+            return
+        
+        first = max(0, row - CORRECTION_PREFETCH_ADJACENT)
+        last = min(self.proxy_model.rowCount() - 1, row + CORRECTION_PREFETCH_ADJACENT)
+        
+        correction_ids = [self.correction_id_at(r) for r in range(first, last + 1)]
+        self.prefetch_requested.emit(correction_ids)
     
     def on_view_clicked(self):
         """表示ボタンがクリックされた"""
-        selected_items = self.table.selectedItems()
-        if selected_items:
-            row = selected_items[0].row()
-            correction_id = int(self.table.item(row, 0).text())
+        correction_id = self.selected_correction_id()
+        if correction_id is not None:
             self.view_requested.emit(correction_id)
     
     def on_delete_clicked(self):
         """削除ボタンがクリックされた"""
-        selected_items = self.table.selectedItems()
-        if selected_items:
-            row = selected_items[0].row()
-            correction_id = int(self.table.item(row, 0).text())
+        correction_id = self.selected_correction_id()
+        if correction_id is not None:
             self.delete_requested.emit(correction_id)
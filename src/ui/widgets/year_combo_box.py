@@ -0,0 +1,79 @@
+"""
+年度選択コンボボックス
+起動時は現在の年度のみを持ち、他の年度はプルダウンを開いた時に読み込む
+"""
+from typing import Callable, List, Optional
+
+from PySide6.QtWidgets import QComboBox
+from PySide6.QtCore import Signal
+
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class YearComboBox(QComboBox):
+    """年度選択コンボボックス"""
+    
+    year_selected = Signal(object)  # 年度（全年度の場合はNone）
+    
+    def __init__(self, active_year: int, years_loader: Callable[[], List[int]],
+                 allow_all: bool = False, parent=None):
+        """
+        初期化
+        
+        Args:
+            active_year: 現在の年度（初期選択）
+            years_loader: 登録済みの年度一覧を返す関数
+            allow_all: 「全年度」を選択肢に含めるか
+        """
+        super().__init__(parent)
+        self.years_loader = years_loader
+        self.allow_all = allow_all
+        self.years_loaded = False
+        
+        self.addItem(f"{active_year}年度", active_year)
+        self.currentIndexChanged.connect(
+            lambda index: self.year_selected.emit(self.itemData(index))
+        )
+    
+    def current_year(self) -> Optional[int]:
+        """選択中の年度（全年度の場合はNone）"""
+        return self.currentData()
+    
+    def set_active_year(self, year: int):
+        """現在の年度を変更して選択"""
+        index = self.findData(year)
+        if index < 0:
+            self.blockSignals(True)
+            self.insertItem(0, f"{year}年度", year)
+            self.blockSignals(False)
+            index = 0
+        self.setCurrentIndex(index)
+    
+    def showPopup(self):
+        """初めて開いた時に年度一覧を読み込む"""
+        if not self.years_loaded:
+            self.load_years()
+        super().showPopup()
+    
+    def load_years(self):
+        """登録済みの年度を選択肢に追加"""
+        try:
+            years = self.years_loader()
+        except Exception as e:
+            logger.error(f"年度一覧の取得に失敗: {e}")
+            return
+        
+        current = self.currentData()
+        known = {self.itemData(i) for i in range(self.count())} - {None}
+        
+        self.blockSignals(True)
+        self.clear()
+        for year in sorted(known.union(years), reverse=True):
+            self.addItem(f"{year}年度", year)
+        if self.allow_all:
+            self.addItem("全年度", None)
+        self.setCurrentIndex(self.findData(current))
+        self.blockSignals(False)
+        self.years_loaded = True
@@ -3,16 +3,21 @@
 データベースの定期バックアップを管理
 """
 import shutil
+import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
-from ..config import DB_PATH, BACKUP_DIR
+from ..config import DB_PATH, BACKUP_DIR, DB_TIMEOUT, BACKUP_PAGES_PER_STEP
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class BackupCancelled(Exception):
+    """バックアップが中断された"""
+
+
 class BackupManager:
     """データベースバックアップを管理"""
     
@@ -21,30 +26,73 @@ class BackupManager:
         self.backup_dir = backup_dir
         self.backup_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_backup(self) -> Optional[Path]:
+    def create_backup(
+        self,
+        progress: Optional[Callable[[int, int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Optional[Path]:
         """
         バックアップを作成
         
+        SQLiteのバックアップAPIで数ページずつコピーする。
+        コピー中も他の接続の読み書きをブロックせず、WALの内容も含めた整合した状態を保存する。
+        作成中は .part ファイルに書き込み、完了後に名前を変更する（中断・失敗時は削除）。
+        
+        Args:
+            progress: 進捗 (コピー済みページ数, 全ページ数) を受け取る関数
+            should_cancel: Trueを返すと中断する関数（数ページごとに確認）
+        
         Returns:
-            バックアップファイルのパス
+            バックアップファイルのパス（失敗・中断時はNone）
         """
+        if not self.db_path.exists():
+            logger.warning("データベースファイルが存在しません")
+            return None
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_filename = f"corrections_backup_{timestamp}.db"
+        backup_path = self.backup_dir / backup_filename
+        part_path = backup_path.with_name(backup_filename + ".part")
+        
+        def on_progress(status, remaining, total):
+            if should_cancel and should_cancel():
+                raise BackupCancelled()
+            if progress:
+                progress(total - remaining, total)
+        
+        source = None
+        target = None
         try:
-            if not self.db_path.exists():
-                logger.warning("データベースファイルが存在しません")
-                return None
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"corrections_backup_{timestamp}.db"
-            backup_path = self.backup_dir / backup_filename
-            
-            shutil.copy2(self.db_path, backup_path)
+            source = sqlite3.connect(str(self.db_path), timeout=DB_TIMEOUT)
+            target = sqlite3.connect(str(part_path))
+            source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=on_progress)
+            # 1ファイルで完結するように（コピー元のWALモードを引き継がない）
+            target.execute("PRAGMA journal_mode=DELETE")
+            target.close()
+            target = None
+            part_path.replace(backup_path)
             
             logger.info(f"バックアップを作成しました: {backup_path}")
             return backup_path
+        
+        except BackupCancelled:
+            logger.info("バックアップを中断しました")
+            return None
             
         except Exception as e:
             logger.error(f"バックアップ作成に失敗: {e}")
             return None
+        
+        finally:
+            if target:
+                target.close()
+            if source:
+                source.close()
+            if part_path.exists():
+                try:
+                    part_path.unlink()
+                except OSError as e:
+                    logger.warning(f"作成途中のバックアップを削除できません: {e}")
     
     def get_backup_list(self) -> list:
         """
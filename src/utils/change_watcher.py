@@ -0,0 +1,126 @@
+"""
+データ変更監視ユーティリティ
+他のPCによるデータベースの変更を検出して通知する
+"""
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ..config import DB_PATH, CHANGE_POLL_INTERVAL_MS, CHANGE_POLL_TIMEOUT
+from ..utils.logger import get_logger
+from ..utils.workers import run_in_background
+
+logger = get_logger(__name__)
+
+
+class ChangeWatcher(QObject):
+    """
+    PRAGMA data_version を定期的に確認し、変更があった時だけ通知するクラス
+
+    data_version は同じ接続から見て「他の接続がコミットした」時にのみ値が変わる。
+    そのため専用の接続を開いたまま保持し、タイマーで値を比較する。
+    確認処理はファイルヘッダ（WAL時は共有メモリ）を読むだけなので、
+    共有フォルダ上でもテーブルを読む処理に比べて負荷はごくわずか。
+    ただし共有フォルダの応答が遅い時に画面を止めないよう、確認はバックグラウンドで行い、
+    最後に確認した値を last_version に保持する（画面側はこの値を使い、クリック時に問い合わせない）。
+    """
+
+    changed = Signal()
+
+    def __init__(self, db_path: Path = DB_PATH, interval_ms: int = CHANGE_POLL_INTERVAL_MS, parent=None):
+        """
+        初期化
+
+        Args:
+            db_path: データベースファイルのパス
+            interval_ms: 確認間隔（ミリ秒）
+        """
+        super().__init__(parent)
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_version: Optional[int] = None
+        self._polling = False
+        self._stopped = False
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    @property
+    def last_version(self) -> Optional[int]:
+        """最後に確認したdata_version（まだ確認していない・取得できない場合はNone）"""
+        return self._last_version
+
+    def start(self):
+        """監視を開始（最初の確認の値を基準にする）"""
+        self._stopped = False
+        self.timer.start()
+        self.poll()
+        logger.info(f"データ変更監視を開始しました（{self.timer.interval()}ms間隔）")
+
+    def stop(self):
+        """監視を停止して接続を閉じる（確認中の場合は確認が終わった時に閉じる）"""
+        self.timer.stop()
+        self._stopped = True
+        if not self._polling:
+            self._close()
+
+    def _close(self):
+        """接続を閉じる"""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def current_version(self) -> Optional[int]:
+        """
+        現在のdata_versionを取得（ワーカースレッドで呼ばれる。同時に複数の確認は行わない）
+
+        Returns:
+            data_version（取得できない場合はNone）
+        """
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    str(self.db_path),
+                    timeout=CHANGE_POLL_TIMEOUT,
+                    check_same_thread=False
+                )
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+        except sqlite3.Error as e:
+            logger.warning(f"data_versionの取得に失敗: {e}")
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+            return None
+
+    def poll(self):
+        """変更の確認をバックグラウンドで開始（前回の確認が終わっていない場合は何もしない）"""
+        if self._polling or self._stopped:
+            return
+        self._polling = True
+        run_in_background(
+            self.current_version,
+            on_result=self._on_version,
+            on_finished=self._on_poll_finished
+        )
+
+    def _on_poll_finished(self):
+        """確認が終わった（停止済みなら接続を閉じる）"""
+        self._polling = False
+        if self._stopped:
+            self._close()
+
+    def _on_version(self, version: Optional[int]):
+        """確認した値を比較し、変わっていればchangedを発行（最初の確認は基準にするだけ）"""
+        if version is None or version == self._last_version or self._stopped:
+            return
+
+        first = self._last_version is None
+        self._last_version = version
+        if first:
+            return
+        logger.info(f"データベースの変更を検出しました: data_version={version}")
+        self.changed.emit()
@@ -0,0 +1,59 @@
+"""
+CSV読み込みユーティリティ
+CSVファイルを1行ずつ読み込み、読み込んだバイト数・行数を通知する（ファイル全体をメモリに載せない）
+"""
+import csv
+import io
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Union
+
+from ..config import IMPORT_CHUNK_SIZE
+
+
+class ImportCancelled(Exception):
+    """インポートが中断された"""
+
+
+def iter_csv_rows(
+    file_path: Union[str, Path],
+    progress: Optional[Callable[[int, int], None]] = None,
+    rows_read: Optional[Callable[[int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    every: int = IMPORT_CHUNK_SIZE
+) -> Iterator[Dict[str, str]]:
+    """
+    CSVファイル（UTF-8、BOM付きも可）を1行ずつ辞書で返す
+
+    every 行ごとと最後に進捗を通知し、中断を確認する。
+
+    Args:
+        file_path: CSVファイルのパス
+        progress: 進捗 (読み込んだバイト数, ファイルのバイト数) を受け取る関数
+        rows_read: 読み込んだ行数（タイトル行を除く）を受け取る関数
+        should_cancel: Trueを返すと中断する関数
+        every: 進捗を通知する行数
+
+    Raises:
+        ImportCancelled: 中断された場合
+    """
+    total = os.path.getsize(file_path)
+
+    def notify(count: int, position: int):
+        if should_cancel is not None and should_cancel():
+            raise ImportCancelled("インポートが中断されました")
+        if progress is not None:
+            progress(position, total)
+        if rows_read is not None:
+            rows_read(count)
+
+    with open(file_path, 'rb') as raw:
+        # バイト数は下位のファイルの位置で数える（テキストの読み込みは先読みの分だけ先に進む）
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        count = 0
+        for row in csv.DictReader(text):
+            yield row
+            count += 1
+            if count % every == 0:
+                notify(count, raw.tell())
+        notify(count, total)
@@ -0,0 +1,73 @@
+"""
+LRUキャッシュ
+件数上限付きのスレッドセーフなキャッシュ
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """最近使われていない項目から破棄するキャッシュ"""
+    
+    def __init__(self, maxsize: int = 128):
+        """
+        初期化
+        
+        Args:
+            maxsize: 保持する最大件数
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        値を取得（取得した項目は最新として扱う）
+        
+        Args:
+            key: キー
+            default: 存在しない場合の値
+        """
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        値を保存（上限を超えた分は古い順に破棄）
+        
+        Args:
+            key: キー
+            value: 値
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        """
+        項目を無効化
+        
+        Args:
+            key: キー
+        """
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """全項目を無効化"""
+        with self._lock:
+            self._data.clear()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
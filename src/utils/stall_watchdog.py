@@ -0,0 +1,188 @@
+"""
+画面停止の監視ユーティリティ
+イベントループが一定時間応答しない時に、全スレッドのスタックと実行中のSQLをログに記録する
+"""
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from ..config import STALL_THRESHOLD_MS, STALL_HEARTBEAT_MS
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 画面の処理とみなすソースのディレクトリ
+UI_DIR = str(Path(__file__).resolve().parent.parent / "ui")
+
+
+class StallWatchdog(QObject):
+    """
+    GUIスレッドの停止を検出するクラス
+
+    GUIスレッドのタイマーが一定間隔で時刻を更新し、監視スレッドが
+    その時刻が STALL_THRESHOLD_MS 以上更新されていないことを検出したら、
+    全スレッドのスタック・その時の画面の処理・実行中のSQLをログに記録する。
+    停止が終わった時に所要時間を記録し、画面の処理ごとに回数と時間を集計する。
+
+    画面の処理はGUIスレッドのスタックのうち最も外側の src/ui の関数
+    （イベントループから呼ばれたスロット）とする。
+    C拡張がGILを保持したまま止まっている間は監視スレッドも動けないため、
+    その場合は停止が終わった後に所要時間だけを記録する。
+    """
+
+    def __init__(self, db=None, threshold_ms: int = STALL_THRESHOLD_MS,
+                 heartbeat_ms: int = STALL_HEARTBEAT_MS, parent=None):
+        """
+        初期化
+
+        Args:
+            db: 実行中のSQLを調べるDatabaseManager（Noneの場合は記録しない）
+            threshold_ms: 停止とみなす時間（ミリ秒）
+            heartbeat_ms: GUIスレッドが時刻を更新する間隔（ミリ秒）
+        """
+        super().__init__(parent)
+        self.db = db
+        self.threshold = threshold_ms / 1000
+        self._gui_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_tick = time.monotonic()
+        self._stall_started: Optional[float] = None
+        self._stall_action: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 画面の処理 → {'count', 'total_ms', 'max_ms'}
+        self._summary: Dict[str, Dict[str, float]] = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(heartbeat_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        """監視を開始（GUIスレッドから呼ぶ）"""
+        self._gui_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop_event.clear()
+        self.timer.start()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"画面停止の監視を開始しました（{self.threshold * 1000:.0f}ms以上の停止を記録）")
+
+    def stop(self):
+        """監視を停止し、集計をログに出力"""
+        self.timer.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.log_summary()
+
+    def tick(self):
+        """GUIスレッドのタイマーから呼ばれる（停止中だった場合は終了を記録）"""
+        now = time.monotonic()
+        with self._lock:
+            last_tick = self._last_tick
+            self._last_tick = now
+            started = self._stall_started
+            action = self._stall_action
+            self._stall_started = None
+            self._stall_action = None
+
+        if started is not None:
+            self._record(action, (now - last_tick) * 1000)
+        elif now - last_tick > self.threshold:
+            # 監視スレッドが動けなかった停止（GILを保持したままの処理など）
+            self._record("（不明）", (now - last_tick) * 1000)
+
+    def _watch(self):
+        """監視スレッドの処理"""
+        interval = self.threshold / 4
+        while not self._stop_event.wait(interval):
+            with self._lock:
+                stalled_for = time.monotonic() - self._last_tick
+                if stalled_for < self.threshold or self._stall_started is not None:
+                    continue
+                self._stall_started = self._last_tick
+
+            # スタックの取得とログ出力はロックの外で行う
+            action = self.current_action()
+            with self._lock:
+                if self._stall_started is not None:
+                    self._stall_action = action
+            self._report(action, stalled_for * 1000)
+
+    def current_action(self) -> str:
+        """GUIスレッドが実行中の画面の処理（Class.method）"""
+        frame = sys._current_frames().get(self._gui_thread_id)
+        action = None
+        while frame is not None:
+            # 内側から外側へたどり、最も外側の src/ui の関数を残す
+            if frame.f_code.co_filename.startswith(UI_DIR):
+                owner = frame.f_locals.get('self')
+                name = frame.f_code.co_name
+                action = f"{type(owner).__name__}.{name}" if owner is not None else name
+            frame = frame.f_back
+        return action or "（Qt内部）"
+
+    def _report(self, action: str, stalled_ms: float):
+        """停止を検出した時に全スレッドのスタックと実行中のSQLをログに記録"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        lines = [f"画面が{stalled_ms:.0f}ms応答していません: {action}"]
+
+        if self.db is not None:
+            queries = self.db.in_flight_queries()
+            for query in queries:
+                thread_name = names.get(query['thread_id'], query['thread_id'])
+                line = f"  SQL [{thread_name}] {query['state']} {query['elapsed_ms']:.0f}ms"
+                if query['sql']:
+                    line += ": " + " ".join(query['sql'].split())
+                lines.append(line)
+            if not queries:
+                lines.append("  SQL: 実行中のSQLはありません")
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == threading.get_ident():
+                continue
+            marker = "（GUIスレッド）" if thread_id == self._gui_thread_id else ""
+            lines.append(f"--- スレッド {names.get(thread_id, thread_id)}{marker} ---")
+            lines.extend(line.rstrip() for line in traceback.format_stack(frame))
+
+        logger.warning("\n".join(lines))
+
+    def _record(self, action: str, duration_ms: float):
+        """停止の終了を記録し、画面の処理ごとに集計"""
+        with self._lock:
+            entry = self._summary.setdefault(action, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        logger.warning(f"画面の停止が終わりました: {action} {duration_ms:.0f}ms")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        画面の処理ごとの停止の集計（合計時間の長い順）
+
+        Returns:
+            [{'action', 'count', 'total_ms', 'max_ms'}, ...]
+        """
+        with self._lock:
+            items = [dict(entry, action=action) for action, entry in self._summary.items()]
+        return sorted(items, key=lambda e: e['total_ms'], reverse=True)
+
+    def log_summary(self):
+        """集計をログに出力（停止がなければ何もしない）"""
+        items = self.summary()
+        if not items:
+            return
+        lines = ["画面停止の集計:"]
+        for item in items:
+            lines.append(
+                f"  {item['action']}: {item['count']}回 合計{item['total_ms']:.0f}ms "
+                f"最大{item['max_ms']:.0f}ms"
+            )
+        logger.info("\n".join(lines))
@@ -0,0 +1,138 @@
+"""
+起動時間計測ユーティリティ
+起動の各段階の所要時間をログに記録し、データベースに保存する
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from ..config import APP_VERSION, STARTUP_BUDGET_MS
+from ..utils.system_info import get_username, get_pc_name
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupProfiler:
+    """
+    起動の段階ごとの所要時間を記録するクラス
+
+    段階は記録した順に保持し、finish() でまとめてログ出力・保存する。
+    予算（STARTUP_BUDGET_MS）を超えた段階は警告としてログに残す。
+    """
+
+    def __init__(self):
+        self.launch_id = uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        with文の範囲を1つの段階として計測
+
+        Args:
+            name: 段階の名前
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, duration_ms: float):
+        """
+        段階の所要時間を記録
+
+        Args:
+            name: 段階の名前
+            duration_ms: 所要時間（ミリ秒）
+        """
+        self.phases.append((name, duration_ms))
+        budget = STARTUP_BUDGET_MS.get(name)
+        if budget is not None and duration_ms > budget:
+            logger.warning(f"起動段階 {name} が予算を超えました: {duration_ms:.0f}ms（予算{budget}ms）")
+
+    def durations(self) -> Dict[str, float]:
+        """段階ごとの所要時間（同じ名前は合計）"""
+        result: Dict[str, float] = {}
+        for name, duration_ms in self.phases:
+            result[name] = result.get(name, 0.0) + duration_ms
+        return result
+
+    def over_budget(self) -> Dict[str, Tuple[float, int]]:
+        """予算を超えた段階 → (所要時間, 予算)"""
+        return {
+            name: (duration_ms, STARTUP_BUDGET_MS[name])
+            for name, duration_ms in self.durations().items()
+            if name in STARTUP_BUDGET_MS and duration_ms > STARTUP_BUDGET_MS[name]
+        }
+
+    def finish(self, db=None):
+        """
+        計測を終了し、ログ出力とデータベースへの保存を行う（2回目以降は何もしない）
+
+        Args:
+            db: 保存先のDatabaseManager（Noneの場合はログのみ）
+        """
+        if self.finished:
+            return
+        self.finished = True
+
+        total_ms = (time.perf_counter() - self.started) * 1000
+        self.phases.append(('total', total_ms))
+        summary = ", ".join(f"{name}={duration_ms:.0f}ms" for name, duration_ms in self.phases)
+        logger.info(f"起動時間: {summary}")
+
+        if db is None:
+            return
+        try:
+            username, pc_name = get_username(), get_pc_name()
+            db.execute_many(
+                """
+                INSERT INTO startup_metrics
+                (launch_id, username, pc_name, app_version, phase, duration_ms)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(self.launch_id, username, pc_name, APP_VERSION, name, duration_ms)
+                 for name, duration_ms in self.phases]
+            )
+        except Exception as e:
+            # 計測の保存に失敗しても起動は続ける
+            logger.warning(f"起動時間の保存に失敗: {e}")
+
+
+def get_startup_summary(db, launches: int = 20, pc_name: Optional[str] = None) -> List[Dict]:
+    """
+    直近の起動の段階ごとの平均・最大時間を取得
+
+    Args:
+        db: DatabaseManager
+        launches: 集計する起動回数
+        pc_name: PC名で絞り込む（Noneの場合は全PC）
+
+    Returns:
+        [{'phase', 'launches', 'avg_ms', 'max_ms'}, ...]
+    """
+    where = "WHERE pc_name = ?" if pc_name else ""
+    params = [pc_name] if pc_name else []
+    rows = db.execute_query(
+        f"""
+        SELECT phase, COUNT(*) AS launches, AVG(duration_ms) AS avg_ms, MAX(duration_ms) AS max_ms
+        FROM startup_metrics
+        WHERE launch_id IN (
+            SELECT launch_id FROM startup_metrics {where}
+            GROUP BY launch_id ORDER BY MAX(recorded_at) DESC LIMIT ?
+        )
+        GROUP BY phase
+        ORDER BY MIN(metric_id)
+        """,
+        tuple(params + [launches])
+    )
+    return db.rows_to_dicts(rows)
+
+
+# アプリケーション全体で1つの計測を共有する
+startup_profiler = StartupProfiler()
@@ -0,0 +1,215 @@
+"""
+バックグラウンド処理ユーティリティ
+時間のかかる処理をQThreadPoolで実行し、結果をシグナルで受け取る
+"""
+import threading
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 実行中のWorkerへの参照（完了前にGCされないように保持）
+_active_workers = set()
+
+
+class WorkerSignals(QObject):
+    """Workerの実行結果を通知するシグナル"""
+    
+    result = Signal(object)
+    error = Signal(str)
+    finished = Signal()
+    progress = Signal('qint64', 'qint64')  # 完了数, 全体数（バイト数も扱えるように64ビット）
+    rows_read = Signal('qint64')  # 処理した行数（全体数が分からない処理）
+
+
+class Worker(QRunnable):
+    """関数をスレッドプールで実行するRunnable"""
+    
+    def __init__(self, fn: Callable, *args, **kwargs):
+        """
+        初期化
+        
+        Args:
+            fn: 実行する関数
+            args: 関数の位置引数
+            kwargs: 関数のキーワード引数
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        # 参照は _active_workers で管理するため、Qt側では削除しない
+        self.setAutoDelete(False)
+    
+    def run(self):
+        """関数を実行（ワーカースレッド）"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"バックグラウンド処理に失敗: {e}", exc_info=True)
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self._done_event.set()
+            self.signals.finished.emit()
+    
+    def cancel(self):
+        """中断を要求（関数が should_cancel を確認した時点で中断される）"""
+        self._cancel_event.set()
+    
+    def is_cancelled(self) -> bool:
+        """中断が要求されているか"""
+        return self._cancel_event.is_set()
+    
+    def is_done(self) -> bool:
+        """関数の実行が終わったか"""
+        return self._done_event.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        関数の実行が終わるまで待つ
+        
+        Args:
+            timeout: 最大待ち時間（秒）
+            
+        Returns:
+            時間内に終わったらTrue
+        """
+        return self._done_event.wait(timeout)
+
+
+def run_in_background(
+    fn: Callable,
+    *args,
+    on_result: Optional[Callable] = None,
+    on_error: Optional[Callable] = None,
+    on_finished: Optional[Callable] = None,
+    on_progress: Optional[Callable] = None,
+    on_rows_read: Optional[Callable] = None,
+    cancellable: bool = False,
+    **kwargs
+) -> Worker:
+    """
+    関数をバックグラウンドで実行
+    
+    Args:
+        fn: 実行する関数
+        on_result: 結果を受け取る関数（GUIスレッドで呼ばれる）
+        on_error: エラーメッセージを受け取る関数（GUIスレッドで呼ばれる）
+        on_progress: 進捗 (完了数, 全体数) を受け取る関数（関数に progress= を渡す）
+        on_rows_read: 処理した行数を受け取る関数（関数に rows_read= を渡す）
+        cancellable: 関数に should_cancel= を渡し、Worker.cancel() で中断できるようにする
+        
+    Returns:
+        実行したWorker
+    """
+    worker = Worker(fn, *args, **kwargs)
+    if on_progress:
+        worker.kwargs['progress'] = worker.signals.progress.emit
+        worker.signals.progress.connect(on_progress)
+    if on_rows_read:
+        worker.kwargs['rows_read'] = worker.signals.rows_read.emit
+        worker.signals.rows_read.connect(on_rows_read)
+    if cancellable:
+        worker.kwargs['should_cancel'] = worker.is_cancelled
+    if on_result:
+        worker.signals.result.connect(on_result)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    
+    _active_workers.add(worker)
+    worker.signals.finished.connect(lambda: _active_workers.discard(worker))
+    
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class TaskRunner(QObject):
+    """
+    キーごとに世代番号を付けてバックグラウンド処理を実行するクラス
+    
+    同じキーで新しい処理を依頼すると世代番号が進み、それより前の処理の結果は
+    完了しても捨てられる（再読み込みを連打しても最後の結果だけが反映される）。
+    実行中の処理自体は中断しない。
+    """
+    
+    # キー, 実行中か（最新の処理の開始・完了時に通知）
+    running_changed = Signal(str, bool)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generations = {}
+        self._running = set()
+    
+    def submit(
+        self,
+        key: str,
+        fn: Callable,
+        *args,
+        on_result: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        **kwargs
+    ) -> int:
+        """
+        処理を依頼
+        
+        Args:
+            key: 処理の種類（同じキーの古い処理の結果は捨てる）
+            fn: 実行する関数
+            on_result: 結果を受け取る関数（最新の処理の場合のみGUIスレッドで呼ばれる）
+            on_error: エラーメッセージを受け取る関数（同上）
+            
+        Returns:
+            世代番号
+        """
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        
+        if key not in self._running:
+            self._running.add(key)
+            self.running_changed.emit(key, True)
+        
+        def deliver(callback, value):
+            if not self.is_current(key, generation):
+                logger.debug(f"古い処理の結果を破棄しました: {key} (世代{generation})")
+                return
+            if callback:
+                callback(value)
+        
+        def finish():
+            if self.is_current(key, generation):
+                self._running.discard(key)
+                self.running_changed.emit(key, False)
+        
+        run_in_background(
+            fn, *args,
+            on_result=lambda result: deliver(on_result, result),
+            on_error=lambda message: deliver(on_error, message),
+            on_finished=finish,
+            **kwargs
+        )
+        return generation
+    
+    def discard(self, key: str):
+        """キーの実行中の処理の結果を捨てる（結果を待たずに画面を更新する場合）"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if key in self._running:
+            self._running.discard(key)
+            self.running_changed.emit(key, False)
+    
+    def is_current(self, key: str, generation: int) -> bool:
+        """世代番号がキーの最新の処理か"""
+        return self._generations.get(key) == generation
+    
+    def is_running(self, key: str) -> bool:
+        """キーの最新の処理が実行中か"""
+        return key in self._running
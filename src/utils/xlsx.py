@@ -0,0 +1,520 @@
+"""
+XLSX読み書きユーティリティ
+Excel形式（.xlsx）のファイルを1行ずつ書き込み・読み込む（標準ライブラリのみ、ファイル全体をメモリに載せない）
+
+書き込みは文字列をセルに直接埋め込む（共有文字列表を作らない）ため、行数によらずメモリ使用量は一定。
+文字列はすべて文字列のセルとして書くため、0142Z01 のようなコードや先頭の0が変換されない。
+読み込みはExcelで保存したファイル（共有文字列・日付の書式）にも対応する。
+"""
+import codecs
+import functools
+import html
+import re
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from xml.parsers import expat
+from xml.sax.saxutils import escape, quoteattr
+
+from ..config import IMPORT_CHUNK_SIZE
+from ..utils.csv_stream import ImportCancelled, iter_csv_rows
+
+# ファイル選択ダイアログの種類の選択肢
+FILE_FILTER = "CSV Files (*.csv);;Excel Files (*.xlsx)"
+
+# 読み込み・書き込みの単位（バイト）
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# XMLに書けない制御文字（タブ・改行を除く）
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# シート名に使えない文字
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+# 日付の組み込み書式ID
+_DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# シートのXMLの読み込み
+_SHEET_DATA = re.compile(r'<(\w+:)?sheetData\b')
+_ROW_NUMBER = re.compile(r'\br="(\d+)"')
+_VALUE = re.compile(r'<(?:\w+:)?v>(.*?)</(?:\w+:)?v>', re.S)
+_TEXT = re.compile(r'<(?:\w+:)?t(?:\s[^>]*)?>(.*?)</(?:\w+:)?t>', re.S)
+_PHONETIC = re.compile(r'<(?:\w+:)?rPh\b.*?</(?:\w+:)?rPh>', re.S)
+_SHARED_STRING = re.compile(r'<(?:\w+:)?si\b[^>]*?(?:/>|>(.*?)</(?:\w+:)?si>)', re.S)
+_EXCEL_ESCAPE = re.compile(r'_x([0-9A-Fa-f]{4})_')
+_EXCEL_ESCAPE_LITERAL = re.compile(r'(_x[0-9A-Fa-f]{4}_)')
+
+# 列名（A, B, ...）と列の位置の対応（読み込み時に使った列名を覚えておく）
+_COLUMNS: Dict[str, int] = {}
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="{main}" xmlns:r="{rel}">
+<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+# 書式0: 標準, 書式1: 見出し（太字）
+_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="{main}">
+<fonts count="2"><font><sz val="11"/><name val="Yu Gothic"/></font><font><b/><sz val="11"/><name val="Yu Gothic"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>
+</styleSheet>""".format(main=_NS_MAIN)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<worksheet xmlns="{_NS_MAIN}">'
+    # 見出し行を固定
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def is_xlsx(file_path: Union[str, Path]) -> bool:
+    """XLSXファイルの場合True（拡張子で判定）"""
+    return str(file_path).lower().endswith('.xlsx')
+
+
+def with_selected_extension(file_path: str, selected_filter: str) -> str:
+    """保存ダイアログで選んだ種類の拡張子がなければ付ける"""
+    if 'xlsx' in selected_filter and not is_xlsx(file_path):
+        return f"{file_path}.xlsx"
+    return file_path
+
+
+def column_letter(index: int) -> str:
+    """列の位置（0始まり）を列名（A, B, ..., AA）に変換"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(reference: str) -> int:
+    """セル参照（例: AB12）の列の位置（0始まり）"""
+    index = 0
+    for char in reference:
+        if 'A' <= char <= 'Z':
+            index = index * 26 + ord(char) - 64
+        else:
+            break
+    return index - 1
+
+
+class XlsxWriter:
+    """
+    1シートのXLSXファイルを1行ずつ書き込むクラス（csv.writer と同じ使い方）
+
+    1行目は見出しとして太字にし、スクロールしても表示されるように固定する。
+    数値は数値のセル、それ以外は文字列のセル、Noneは空のセルとして書く。
+    """
+
+    def __init__(self, file_path: Union[str, Path], sheet_name: str = "Sheet1"):
+        """
+        初期化
+
+        Args:
+            file_path: 書き込むファイルのパス
+            sheet_name: シート名
+        """
+        self._zip = zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1)
+        self._zip.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        self._zip.writestr('_rels/.rels', _ROOT_RELS)
+        # シート名に使えない文字は _ に置き換える（31文字まで）
+        sheet_name = _INVALID_SHEET_CHARS.sub('_', sheet_name)[:31] or "Sheet1"
+        self._zip.writestr('xl/workbook.xml', _WORKBOOK.format(
+            main=_NS_MAIN, rel=_NS_REL, name=quoteattr(sheet_name)
+        ))
+        self._zip.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        self._zip.writestr('xl/styles.xml', _STYLES)
+        self._sheet = self._zip.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self._buffer: List[str] = [_SHEET_START]
+        self._buffered = 0
+        self._row = 0
+        self._columns: List[str] = []
+
+    def writerow(self, values: Iterable[Any]):
+        """1行を書き込む"""
+        self._row += 1
+        row = self._row
+        style = ' s="1"' if row == 1 else ''
+        columns = self._columns
+        cells = []
+        for index, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            if index >= len(columns):
+                columns.extend(column_letter(i) for i in range(len(columns), index + 1))
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f'<c r="{columns[index]}{row}"{style}><v>{value}</v></c>')
+            else:
+                text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+                if '_x' in text:
+                    # _xHHHH_ の形の文字列は読み込み時に文字に戻されるため、先頭の _ を書き換える
+                    text = _EXCEL_ESCAPE_LITERAL.sub(r'_x005F\1', text)
+                # 前後の空白・改行は指定しないと読み込み時に除かれる
+                space = ' xml:space="preserve"' if text != text.strip() or '\n' in text else ''
+                cells.append(
+                    f'<c r="{columns[index]}{row}"{style} t="inlineStr">'
+                    f'<is><t{space}>{text}</t></is></c>'
+                )
+        line = f'<row r="{row}">{"".join(cells)}</row>'
+        self._buffer.append(line)
+        self._buffered += len(line)
+        if self._buffered >= STREAM_BLOCK_SIZE:
+            self._flush()
+
+    def writerows(self, rows: Iterable[Iterable[Any]]):
+        """複数行を書き込む"""
+        for values in rows:
+            self.writerow(values)
+
+    def _flush(self):
+        self._sheet.write(''.join(self._buffer).encode('utf-8'))
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self):
+        """シートを閉じてファイルを完成させる"""
+        if self._sheet is None:
+            return
+        self._buffer.append(_SHEET_END)
+        self._flush()
+        self._sheet.close()
+        self._sheet = None
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 書きかけのファイルは呼び出し側で削除する
+            self._sheet.close()
+            self._zip.close()
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    """ブックの最初のシートのファイル名"""
+    rel_id = None
+    relations = {}
+
+    def on_workbook(name, attrs):
+        nonlocal rel_id
+        if name.endswith('sheet') and rel_id is None:
+            rel_id = attrs.get(f'{_NS_REL} id')
+
+    def on_rels(name, attrs):
+        if name.endswith('Relationship'):
+            relations[attrs.get('Id')] = attrs.get('Target')
+
+    for part, handler in (('xl/workbook.xml', on_workbook), ('xl/_rels/workbook.xml.rels', on_rels)):
+        parser = expat.ParserCreate(namespace_separator=' ')
+        parser.StartElementHandler = handler
+        parser.Parse(archive.read(part), True)
+
+    target = relations.get(rel_id, 'worksheets/sheet1.xml')
+    return target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """共有文字列表（Excelで保存したファイルの文字列のセルが参照する）"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    xml = archive.read('xl/sharedStrings.xml').decode('utf-8')
+    return [_string_text(content) for content in _SHARED_STRING.findall(xml)]
+
+
+def _date_styles(archive: zipfile.ZipFile) -> set:
+    """日付の書式を使っているセルの書式番号"""
+    if 'xl/styles.xml' not in archive.namelist():
+        return set()
+    custom_dates = set()
+    styles = []
+    state = {'cell_xfs': False}
+
+    def start(name, attrs):
+        if name == 'numFmt':
+            # 経過時間・文字列の書式を除き、年月日を含む独自書式を日付とみなす
+            code = re.sub(r'"[^"]*"|\[[^\]]*\]', '', attrs.get('formatCode', '')).lower()
+            if any(c in code for c in 'ymd'):
+                custom_dates.add(int(attrs['numFmtId']))
+        elif name == 'cellXfs':
+            state['cell_xfs'] = True
+        elif name == 'xf' and state['cell_xfs']:
+            styles.append(int(attrs.get('numFmtId', 0)))
+
+    def end(name):
+        if name == 'cellXfs':
+            state['cell_xfs'] = False
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.Parse(archive.read('xl/styles.xml'), True)
+    return {
+        index for index, format_id in enumerate(styles)
+        if format_id in _DATE_FORMAT_IDS or format_id in custom_dates
+    }
+
+
+def _number_text(value: str) -> str:
+    """数値のセルの値を文字列に（整数は小数点なし）"""
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    if number.is_integer() and abs(number) < 1e15:
+        return str(int(number))
+    return value
+
+
+def _date_text(value: str) -> str:
+    """日付のセルの値（1900年からの日数）を YYYY-MM-DD（時刻がある場合は日時）に"""
+    try:
+        moment = _EXCEL_EPOCH + timedelta(days=float(value))
+    except (ValueError, OverflowError):
+        return value
+    if moment.hour == moment.minute == moment.second == 0:
+        return moment.strftime('%Y-%m-%d')
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_patterns(prefix: str):
+    """
+    セルの正規表現（よくある形, すべての形）
+
+    どちらも (列名, 書式番号, 種類, 文字列, 値, それ以外の中身) を返す。
+    よくある形（属性が r, s, t の順、中身が <is><t>文字列</t></is> か <v>値</v>）は
+    1回の照合で値まで取り出す。それ以外の形のセルがある行は、すべての形の方で読み直す。
+
+    Args:
+        prefix: 要素名の名前空間の接頭辞（例: 'x:'、なしは空文字）
+    """
+    p = re.escape(prefix)
+    common = re.compile(
+        rf'<{p}c r="([A-Z]+)\d+"(?: s="(\d+)")?(?: t="(\w+)")?(?: (?![st]=)[\w:]+="[^"]*")*\s*'
+        rf'(?:/>|>(?:<{p}is><{p}t(?: [^>]*)?>([^<]*)</{p}t></{p}is>|<{p}v>([^<]*)</{p}v>)?</{p}c>)()'
+    )
+    generic = re.compile(
+        rf'<{p}c\b'
+        r'(?:(?=[^>]*?\br="([A-Z]+)))?'
+        r'(?:(?=[^>]*?\bs="(\d+)"))?'
+        r'(?:(?=[^>]*?\bt="(\w+)"))?'
+        rf'[^>]*?(?:/>|>()()(.*?)</{p}c>)',
+        re.S
+    )
+    return common, generic
+
+
+class XlsxReader:
+    """
+    XLSXファイルの最初のシートを1行ずつ読み込むクラス
+
+    値はすべて文字列で返す（空のセルは空文字、日付の書式のセルは YYYY-MM-DD）。
+    position と total でシートのXMLを読み込んだバイト数と全体のバイト数が分かる。
+    シートは行・セルの単位で文字列の分割と正規表現で読む（XMLパーサーで要素ごとに処理するより速い）。
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = file_path
+        self.position = 0
+        self.total = 0
+
+    def __iter__(self) -> Iterator[List[str]]:
+        with zipfile.ZipFile(self.file_path) as archive:
+            sheet_path = _first_sheet_path(archive)
+            strings = _shared_strings(archive)
+            date_styles = _date_styles(archive)
+            self.total = archive.getinfo(sheet_path).file_size
+
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            pending = ''
+            prefix = None
+            row_number = 0
+            with archive.open(sheet_path) as sheet:
+                while True:
+                    block = sheet.read(STREAM_BLOCK_SIZE)
+                    pending += decoder.decode(block, not block)
+                    self.position = sheet.tell()
+
+                    if prefix is None:
+                        found = _SHEET_DATA.search(pending)
+                        if found is None and block:
+                            continue
+                        prefix = (found.group(1) or '') if found else ''
+                        patterns = _cell_patterns(prefix)
+                        row_open, row_close = f'<{prefix}row', f'</{prefix}row>'
+
+                    # 最後の行は途中で切れている場合があるため、次のブロックとつなげる
+                    pieces = pending.split(row_close)
+                    pending = pieces.pop()
+                    for piece in pieces:
+                        start = piece.rfind(row_open)
+                        if start == -1:
+                            continue
+                        tag_end = piece.find('>', start)
+                        number = _ROW_NUMBER.search(piece, start, tag_end)
+                        number = int(number.group(1)) if number else row_number + 1
+                        # 空の行が省略されている場合は空の行を補う
+                        for _ in range(row_number + 1, number):
+                            yield []
+                        row_number = number
+                        yield _row_values(piece[tag_end + 1:], prefix, patterns, strings, date_styles)
+                    if not block:
+                        break
+
+
+def _row_values(content: str, prefix: str, patterns, strings: List[str],
+                date_styles: set) -> List[str]:
+    """行のXMLからセルの値のリストを作る"""
+    common, generic = patterns
+    cells = common.findall(content)
+    if len(cells) != content.count(f'<{prefix}c ') + content.count(f'<{prefix}c>'):
+        cells = generic.findall(content)
+
+    row: List[str] = []
+    for letters, style, cell_type, inline, value, other in cells:
+        if cell_type == 'inlineStr':
+            if other:
+                text = _string_text(other)
+            else:
+                text = _decode_escapes(_unescape(inline))
+        else:
+            if other:
+                found = _VALUE.search(other)
+                value = found.group(1) if found else ''
+            value = _unescape(value)
+            if not value:
+                text = ''
+            elif cell_type == 's':
+                text = strings[int(value)]
+            elif cell_type == 'b':
+                text = 'TRUE' if value == '1' else 'FALSE'
+            elif cell_type in ('str', 'e'):
+                text = _decode_escapes(value)
+            elif style and int(style) in date_styles:
+                text = _date_text(value)
+            else:
+                text = _number_text(value)
+
+        column = _COLUMNS.get(letters) if letters else len(row)
+        if column is None:
+            column = _COLUMNS.setdefault(letters, column_index(letters))
+        if column == len(row):
+            row.append(text)
+        elif column > len(row):
+            row.extend([''] * (column - len(row)))
+            row.append(text)
+        else:
+            row[column] = text
+    return row
+
+
+def _string_text(xml: str) -> str:
+    """文字列（<si>・<is> の中身）のXMLから文字列を取り出す（ふりがなの部分は除く）"""
+    if 'rPh' in xml:
+        xml = _PHONETIC.sub('', xml)
+    return _decode_escapes(_unescape(''.join(_TEXT.findall(xml))))
+
+
+def _unescape(text: str) -> str:
+    return html.unescape(text) if '&' in text else text
+
+
+def _decode_escapes(text: str) -> str:
+    """Excelが制御文字などを書き換えた _xHHHH_ を元の文字に戻す"""
+    if '_x' not in text:
+        return text
+    return _EXCEL_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), text)
+
+
+def iter_xlsx_rows(
+    file_path: Union[str, Path],
+    progress: Optional[Callable[[int, int], None]] = None,
+    rows_read: Optional[Callable[[int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    every: int = IMPORT_CHUNK_SIZE
+) -> Iterator[Dict[str, str]]:
+    """
+    XLSXファイルの最初のシートを1行ずつ辞書で返す（1行目を見出しとする、iter_csv_rows と同じ使い方）
+
+    Args:
+        file_path: XLSXファイルのパス
+        progress: 進捗 (読み込んだバイト数, シートのバイト数) を受け取る関数
+        rows_read: 読み込んだ行数（見出しの行を除く）を受け取る関数
+        should_cancel: Trueを返すと中断する関数
+        every: 進捗を通知する行数
+
+    Raises:
+        ImportCancelled: 中断された場合
+    """
+    reader = XlsxReader(file_path)
+
+    def notify(count: int, position: int):
+        if should_cancel is not None and should_cancel():
+            raise ImportCancelled("インポートが中断されました")
+        if progress is not None:
+            progress(position, reader.total)
+        if rows_read is not None:
+            rows_read(count)
+
+    headers = None
+    count = 0
+    for values in reader:
+        if headers is None:
+            headers = values
+            continue
+        if not any(values):
+            continue
+        # 末尾の空のセルは省略されているため空文字で補う
+        values = values + [''] * (len(headers) - len(values))
+        yield dict(zip(headers, values))
+        count += 1
+        if count % every == 0:
+            notify(count, reader.position)
+    notify(count, reader.total)
+
+
+def iter_file_rows(
+    file_path: Union[str, Path],
+    progress: Optional[Callable[[int, int], None]] = None,
+    rows_read: Optional[Callable[[int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    every: int = IMPORT_CHUNK_SIZE
+) -> Iterator[Dict[str, str]]:
+    """CSV・XLSXファイルを1行ずつ辞書で返す（拡張子で読み方を選ぶ）"""
+    reader = iter_xlsx_rows if is_xlsx(file_path) else iter_csv_rows
+    return reader(file_path, progress, rows_read, should_cancel, every)